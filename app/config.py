@@ -7,8 +7,24 @@ class Settings(BaseSettings):
     auto_migrate: bool = Field(default=True, alias="AUTO_MIGRATE")
     tz: str = Field(default="Asia/Seoul", alias="TZ")
     database_url: str | None = Field(default=None, alias="DATABASE_URL")
+    sqlite_busy_timeout_ms: int = Field(default=5000, alias="SQLITE_BUSY_TIMEOUT_MS")
     slack_bot_token: str | None = Field(default=None, alias="SLACK_BOT_TOKEN")
+    slack_signing_secret: str | None = Field(default=None, alias="SLACK_SIGNING_SECRET")
+    slack_api_base_url: str | None = Field(default=None, alias="SLACK_API_BASE_URL")
     max_threads_poll_per_run: int = Field(default=300, alias="MAX_THREADS_POLL_PER_RUN")
+    thread_sweep_per_run: int = Field(default=30, alias="THREAD_SWEEP_PER_RUN")
+    history_lookback_days: int = Field(default=7, alias="HISTORY_LOOKBACK_DAYS")
+    ingest_workers: int = Field(default=4, alias="INGEST_WORKERS")
+    ingest_write_batch_size: int = Field(default=2000, alias="INGEST_WRITE_BATCH_SIZE")
+    user_directory_sync_threshold: int = Field(default=20, alias="USER_DIRECTORY_SYNC_THRESHOLD")
+    user_directory_sync_interval_minutes: int = Field(
+        default=360, alias="USER_DIRECTORY_SYNC_INTERVAL_MINUTES"
+    )
+    user_name_cache_ttl_seconds: int = Field(default=600, alias="USER_NAME_CACHE_TTL_SECONDS")
+    user_name_cache_max_size: int = Field(default=20000, alias="USER_NAME_CACHE_MAX_SIZE")
+    thread_poll_concurrency: int = Field(default=16, alias="THREAD_POLL_CONCURRENCY")
+    slack_rate_limit_enabled: bool = Field(default=True, alias="SLACK_RATE_LIMIT_ENABLED")
+    slack_rate_limit_scale: float = Field(default=1.0, alias="SLACK_RATE_LIMIT_SCALE")
     openai_api_key: str | None = Field(default=None, alias="OPENAI_API_KEY")
     openai_model: str = Field(default="gpt-4o-mini", alias="OPENAI_MODEL")
     max_messages_per_thread_for_summary: int = Field(
@@ -17,6 +33,20 @@ class Settings(BaseSettings):
     max_messages_per_thread_for_report: int = Field(
         default=200, alias="MAX_MESSAGES_PER_THREAD_FOR_REPORT"
     )
+    summary_full_refresh_every: int = Field(default=5, alias="SUMMARY_FULL_REFRESH_EVERY")
+    summary_input_token_budget: int = Field(default=6000, alias="SUMMARY_INPUT_TOKEN_BUDGET")
+    report_input_token_budget: int = Field(default=12000, alias="REPORT_INPUT_TOKEN_BUDGET")
+    thread_report_combined_call: bool = Field(default=True, alias="THREAD_REPORT_COMBINED_CALL")
+    job_max_attempts: int = Field(default=3, alias="JOB_MAX_ATTEMPTS")
+    job_lock_timeout_seconds: int = Field(default=900, alias="JOB_LOCK_TIMEOUT_SECONDS")
+    worker_poll_interval_seconds: float = Field(default=2.0, alias="WORKER_POLL_INTERVAL_SECONDS")
+    llm_concurrency: int = Field(default=4, alias="LLM_CONCURRENCY")
+    llm_requests_per_minute: int = Field(default=500, alias="LLM_REQUESTS_PER_MINUTE")
+    llm_tokens_per_minute: int = Field(default=200000, alias="LLM_TOKENS_PER_MINUTE")
+    response_cache_enabled: bool = Field(default=True, alias="RESPONSE_CACHE_ENABLED")
+    response_cache_max_entries: int = Field(default=512, alias="RESPONSE_CACHE_MAX_ENTRIES")
+    response_cache_ttl_seconds: int = Field(default=600, alias="RESPONSE_CACHE_TTL_SECONDS")
+    response_cache_dir: str | None = Field(default=None, alias="RESPONSE_CACHE_DIR")
     summary_language: str = Field(default="ko", alias="SUMMARY_LANGUAGE")
     max_threads_per_daily_report: int = Field(
         default=60, alias="MAX_THREADS_PER_DAILY_REPORT"
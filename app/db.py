@@ -3,7 +3,9 @@ from __future__ import annotations
 import logging
 from typing import Generator
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session, sessionmaker
 
 from app.config import settings
@@ -30,14 +32,49 @@ def get_engine():
         return None
 
     url = _normalize_database_url(settings.database_url)
-    _engine = create_engine(
-        url,
-        pool_pre_ping=True,
-        future=True,
-    )
+    if url.startswith("sqlite"):
+        # Sessions are handed across threads (ingest pools, job workers); the
+        # pool still gives each checkout its own connection.
+        _engine = create_engine(
+            url,
+            pool_pre_ping=True,
+            future=True,
+            connect_args={"check_same_thread": False},
+        )
+        event.listen(_engine, "connect", _apply_sqlite_pragmas)
+    else:
+        _engine = create_engine(
+            url,
+            pool_pre_ping=True,
+            future=True,
+        )
     return _engine
 
 
+def _apply_sqlite_pragmas(dbapi_conn, _record) -> None:
+    # WAL lets the web process read while ingest writes; synchronous=NORMAL is
+    # crash-safe under WAL and avoids an fsync per bulk-upsert commit.
+    cur = dbapi_conn.cursor()
+    try:
+        cur.execute("PRAGMA journal_mode=WAL")
+        cur.execute("PRAGMA synchronous=NORMAL")
+        cur.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}")
+        cur.execute("PRAGMA temp_store=MEMORY")
+        cur.execute("PRAGMA cache_size=-65536")
+    finally:
+        cur.close()
+
+
+def dialect_insert(db: Session, table):
+    """
+    INSERT construct for the session's dialect, so callers can use
+    on_conflict_do_update/on_conflict_do_nothing on both Postgres and SQLite.
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        return sqlite_insert(table)
+    return pg_insert(table)
+
+
 def get_session_factory():
     global _SessionLocal
     if _SessionLocal is not None:
@@ -67,6 +104,7 @@ def init_db() -> bool:
 
     if settings.auto_migrate:
         _ensure_schema_patches(engine)
+        _ensure_indexes(engine, Base.metadata)
 
     return True
 
@@ -96,71 +134,110 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+# Columns added after the first release: table -> column -> (postgres DDL, sqlite DDL).
+_COLUMN_PATCHES: dict[str, dict[str, tuple[str, str]]] = {
+    "channels": {
+        "ingest_status": ("VARCHAR(16) DEFAULT 'idle'", "TEXT"),
+        "ingest_started_at": ("TIMESTAMPTZ", "TIMESTAMP"),
+        "ingest_finished_at": ("TIMESTAMPTZ", "TIMESTAMP"),
+        "ingest_error_message": ("TEXT", "TEXT"),
+        "ingest_last_result_json": ("JSONB", "TEXT"),
+        # Existing channels predate the rollups; stats read raw messages until rebuilt.
+        "stats_rollup_ready": ("BOOLEAN NOT NULL DEFAULT FALSE", "BOOLEAN NOT NULL DEFAULT 0"),
+        "data_version": ("INTEGER NOT NULL DEFAULT 0", "INTEGER NOT NULL DEFAULT 0"),
+    },
+    "threads": {
+        "latest_reply_ts_epoch": ("DOUBLE PRECISION", "FLOAT"),
+        "polled_reply_ts_epoch": ("DOUBLE PRECISION", "FLOAT"),
+        "last_polled_at": ("TIMESTAMPTZ", "TIMESTAMP"),
+        "one_line": ("TEXT", "TEXT"),
+        "has_report": ("BOOLEAN NOT NULL DEFAULT FALSE", "BOOLEAN NOT NULL DEFAULT 0"),
+    },
+    "thread_summaries": {
+        "input_hash": ("TEXT", "TEXT"),
+        "incremental_count": ("INTEGER NOT NULL DEFAULT 0", "INTEGER NOT NULL DEFAULT 0"),
+    },
+    "daily_reports": {
+        "input_hash": ("TEXT", "TEXT"),
+    },
+}
+
+# Backfill statements run once, right after the column is added: (postgres, sqlite).
+_COLUMN_BACKFILLS: dict[tuple[str, str], tuple[str, str]] = {
+    ("channels", "ingest_status"): (
+        "UPDATE channels SET ingest_status='idle' WHERE ingest_status IS NULL",
+        "UPDATE channels SET ingest_status='idle' WHERE ingest_status IS NULL",
+    ),
+    ("threads", "one_line"): (
+        "UPDATE threads SET one_line = s.summary_json->>'one_line' FROM thread_summaries s "
+        "WHERE s.channel_id = threads.channel_id AND s.thread_ts = threads.thread_ts",
+        "UPDATE threads SET one_line = (SELECT json_extract(s.summary_json, '$.one_line') "
+        "FROM thread_summaries s WHERE s.channel_id = threads.channel_id "
+        "AND s.thread_ts = threads.thread_ts)",
+    ),
+    ("threads", "has_report"): (
+        "UPDATE threads SET has_report = TRUE WHERE EXISTS (SELECT 1 FROM thread_reports r "
+        "WHERE r.channel_id = threads.channel_id AND r.thread_ts = threads.thread_ts)",
+        "UPDATE threads SET has_report = 1 WHERE EXISTS (SELECT 1 FROM thread_reports r "
+        "WHERE r.channel_id = threads.channel_id AND r.thread_ts = threads.thread_ts)",
+    ),
+}
+
+
+def _existing_columns(conn, engine, table: str) -> set[str]:
+    if engine.dialect.name == "sqlite":
+        res = conn.execute(text(f"PRAGMA table_info('{table}')")).fetchall()
+        return {row[1] for row in res}
+    res = conn.execute(
+        text("SELECT column_name FROM information_schema.columns WHERE table_name = :t"),
+        {"t": table},
+    ).fetchall()
+    return {row[0] for row in res}
+
+
 def _ensure_schema_patches(engine) -> None:
     """
-    Minimal auto-migration for channels ingest_* columns to prevent runtime 500s.
+    Minimal auto-migration for columns added after create_all to prevent runtime 500s.
     """
-    missing = set()
-    try:
-        with engine.connect() as conn:
-            if engine.dialect.name == "sqlite":
-                res = conn.execute(text("PRAGMA table_info('channels')")).fetchall()
-                cols = {row[1] for row in res}
-            else:
-                res = conn.execute(
-                    text(
-                        "SELECT column_name FROM information_schema.columns "
-                        "WHERE table_name = 'channels'"
-                    )
-                ).fetchall()
-                cols = {row[0] for row in res}
-            expected = {
-                "ingest_status",
-                "ingest_started_at",
-                "ingest_finished_at",
-                "ingest_error_message",
-                "ingest_last_result_json",
-            }
-            missing = expected - cols
-            if not missing:
-                return
-
-            log.warning("Applying schema patch for channels columns: %s", ", ".join(sorted(missing)))
-            if engine.dialect.name == "postgresql":
-                clauses = []
-                if "ingest_status" in missing:
-                    clauses.append("ADD COLUMN IF NOT EXISTS ingest_status VARCHAR(16) DEFAULT 'idle'")
-                if "ingest_started_at" in missing:
-                    clauses.append("ADD COLUMN IF NOT EXISTS ingest_started_at TIMESTAMPTZ")
-                if "ingest_finished_at" in missing:
-                    clauses.append("ADD COLUMN IF NOT EXISTS ingest_finished_at TIMESTAMPTZ")
-                if "ingest_error_message" in missing:
-                    clauses.append("ADD COLUMN IF NOT EXISTS ingest_error_message TEXT")
-                if "ingest_last_result_json" in missing:
-                    clauses.append("ADD COLUMN IF NOT EXISTS ingest_last_result_json JSONB")
-                if clauses:
-                    conn.execute(text(f"ALTER TABLE channels {', '.join(clauses)}"))
-                    conn.execute(
-                        text(
-                            "UPDATE channels SET ingest_status='idle' WHERE ingest_status IS NULL"
+    for table, columns in _COLUMN_PATCHES.items():
+        missing = set()
+        try:
+            with engine.connect() as conn:
+                missing = set(columns) - _existing_columns(conn, engine, table)
+                if not missing:
+                    continue
+
+                log.warning(
+                    "Applying schema patch for %s columns: %s", table, ", ".join(sorted(missing))
+                )
+                for col in sorted(missing):
+                    pg_type, sqlite_type = columns[col]
+                    pg_backfill, sqlite_backfill = _COLUMN_BACKFILLS.get((table, col), (None, None))
+                    if engine.dialect.name == "postgresql":
+                        conn.execute(
+                            text(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {col} {pg_type}")
                         )
-                    )
-            elif engine.dialect.name == "sqlite":
-                if "ingest_status" in missing:
-                    conn.execute(text("ALTER TABLE channels ADD COLUMN ingest_status TEXT"))
-                    conn.execute(
-                        text("UPDATE channels SET ingest_status='idle' WHERE ingest_status IS NULL")
-                    )
-                if "ingest_started_at" in missing:
-                    conn.execute(text("ALTER TABLE channels ADD COLUMN ingest_started_at TIMESTAMP"))
-                if "ingest_finished_at" in missing:
-                    conn.execute(
-                        text("ALTER TABLE channels ADD COLUMN ingest_finished_at TIMESTAMP")
-                    )
-                if "ingest_error_message" in missing:
-                    conn.execute(text("ALTER TABLE channels ADD COLUMN ingest_error_message TEXT"))
-                if "ingest_last_result_json" in missing:
-                    conn.execute(text("ALTER TABLE channels ADD COLUMN ingest_last_result_json TEXT"))
-            conn.commit()
-    except Exception as e:
-        log.error("Schema patch failed (missing=%s): %s", missing, e)
+                        backfill = pg_backfill
+                    elif engine.dialect.name == "sqlite":
+                        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {col} {sqlite_type}"))
+                        backfill = sqlite_backfill
+                    else:
+                        continue
+                    if backfill:
+                        conn.execute(text(backfill))
+                conn.commit()
+        except Exception as e:
+            log.error("Schema patch failed (table=%s missing=%s): %s", table, missing, e)
+
+
+def _ensure_indexes(engine, metadata) -> None:
+    """
+    create_all skips indexes on tables that already exist; create any declared
+    index that is still missing.
+    """
+    for table in metadata.sorted_tables:
+        for index in table.indexes:
+            try:
+                index.create(bind=engine, checkfirst=True)
+            except Exception as e:
+                log.error("Index patch failed (index=%s): %s", index.name, e)
@@ -7,18 +7,22 @@ load_dotenv(find_dotenv(filename=".env", usecwd=True), override=False)
 import argparse
 import json
 import os
+from concurrent.futures import Executor, ThreadPoolExecutor
 from datetime import date, datetime, timedelta, timezone
 from zoneinfo import ZoneInfo
 
 from pydantic import BaseModel, Field
 from sqlalchemy import desc
-from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from app.config import settings
-from app.db import get_session_factory
+from app.db import dialect_insert, get_session_factory
 from app.llm_client import LLMClient
 from app.models import Channel, DailyReport, Message, Thread, ThreadSummary
-from app.services.summary_service import summarize_thread
+from app.services.summary_service import (
+    input_hash,
+    summarize_threads_concurrently,
+    summary_is_stale,
+)
 
 
 class DailyActionItem(BaseModel):
@@ -49,6 +53,12 @@ ALL_CHANNEL_SENTINEL = "__ALL__"
 def _parse_args() -> argparse.Namespace:
     p = argparse.ArgumentParser()
     p.add_argument("--date", type=str, default=None, help="KST date YYYY-MM-DD. Default: yesterday(KST)")
+    p.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help="Parallel LLM calls for summaries and channel reports (default: LLM_CONCURRENCY)",
+    )
     return p.parse_args()
 
 
@@ -71,7 +81,7 @@ def _kst_day_range_epoch(report_date_kst: date) -> tuple[float, float]:
 
 
 def _ensure_thread_summaries(
-    db, llm: LLMClient, channel_id: str, thread_ts_list: list[str]
+    db, llm: LLMClient, channel_id: str, thread_ts_list: list[str], summary_pool: Executor
 ) -> list[dict]:
     if not thread_ts_list:
         return []
@@ -92,33 +102,34 @@ def _ensure_thread_summaries(
     )
     sum_map = {s.thread_ts: s for s in sums}
 
-    out = []
+    stale: list[tuple[str, str]] = []
     for ts in thread_ts_list:
         t = th_map.get(ts)
         if not t:
             continue
+        if summary_is_stale(sum_map.get(ts), t):
+            stale.append((channel_id, ts))
+
+    if stale:
+        # Fan out to the shared summary pool; each task uses its own session.
+        results = summarize_threads_concurrently(llm, stale, executor=summary_pool)
+        failed = sum(1 for ok in results.values() if not ok)
+        if failed:
+            print(f"[daily_report] channel={channel_id} summaries failed: {failed}/{len(stale)}")
+        db.expire_all()
+        sums = (
+            db.query(ThreadSummary)
+            .filter(ThreadSummary.channel_id == channel_id)
+            .filter(ThreadSummary.thread_ts.in_(thread_ts_list))
+            .all()
+        )
+        sum_map = {s.thread_ts: s for s in sums}
 
-        need = False
+    out = []
+    for ts in thread_ts_list:
+        if ts not in th_map:
+            continue
         s = sum_map.get(ts)
-        latest_epoch = t.last_reply_ts_epoch or t.thread_ts_epoch
-
-        if (s is None) or (float(s.source_latest_ts_epoch or 0) < float(latest_epoch or 0)) or (
-            t.needs_summary is True
-        ):
-            need = True
-
-        if need:
-            try:
-                summarize_thread(db, llm, channel_id=channel_id, thread=t)
-                s = (
-                    db.query(ThreadSummary)
-                    .filter(ThreadSummary.channel_id == channel_id)
-                    .filter(ThreadSummary.thread_ts == ts)
-                    .first()
-                )
-            except Exception:
-                db.rollback()
-
         if not s:
             continue
 
@@ -136,6 +147,33 @@ def _ensure_thread_summaries(
     return out
 
 
+def _channel_report_instructions() -> str:
+    return f"""
+너는 사업부 슬랙 대화를 {settings.summary_language}로 '데일리 리포트'로 정리한다.
+- 출력은 반드시 주어진 스키마를 만족해야 한다(Structured Outputs).
+- 과장 없이 사실 기반으로 요약하되, 실행 가능한 액션아이템을 우선한다.
+- 비어있는 항목은 빈 배열([])을 사용한다.
+""".strip()
+
+
+def _overall_report_instructions() -> str:
+    return f"""
+너는 여러 채널의 데일리 리포트를 {settings.summary_language}로 종합한다.
+- 출력은 반드시 주어진 스키마를 만족해야 한다(Structured Outputs).
+- notable_threads / action_items의 context_thread_ts는 가능하면 \"channel_id|thread_ts\" 형태로 넣어라.
+- 비어있는 항목은 빈 배열([])을 사용한다.
+""".strip()
+
+
+def _empty_daily_report(report_date_kst: date) -> dict:
+    # Nothing to summarize: every list field is empty, so skip the LLM round-trip.
+    return DailyReportOut(date_kst=report_date_kst.isoformat()).model_dump()
+
+
+def _is_empty_report(payload: dict) -> bool:
+    return not any(v for k, v in payload.items() if k != "date_kst")
+
+
 def _build_daily_report(
     llm: LLMClient,
     *,
@@ -144,13 +182,6 @@ def _build_daily_report(
     channel_name: str | None,
     thread_summaries: list[dict],
 ) -> dict:
-    instructions = f"""
-너는 사업부 슬랙 대화를 {settings.summary_language}로 '데일리 리포트'로 정리한다.
-- 출력은 반드시 주어진 스키마를 만족해야 한다(Structured Outputs).
-- 과장 없이 사실 기반으로 요약하되, 실행 가능한 액션아이템을 우선한다.
-- 비어있는 항목은 빈 배열([])을 사용한다.
-"""
-
     user_input = json.dumps(
         {
             "date_kst": report_date_kst.isoformat(),
@@ -163,7 +194,7 @@ def _build_daily_report(
 
     parsed = llm.parse_structured(
         model=settings.openai_model,
-        instructions=instructions.strip(),
+        instructions=_channel_report_instructions(),
         user_input=user_input,
         text_format=DailyReportOut,
         max_output_tokens=1400,
@@ -172,14 +203,42 @@ def _build_daily_report(
     return parsed.model_dump() if hasattr(parsed, "model_dump") else parsed.dict()
 
 
+def _build_overall_report(
+    llm: LLMClient, *, report_date_kst: date, per_channel_payloads: list[dict]
+) -> dict:
+    overall_in = json.dumps(
+        {"date_kst": report_date_kst.isoformat(), "channels": per_channel_payloads},
+        ensure_ascii=False,
+    )
+    parsed = llm.parse_structured(
+        model=settings.openai_model,
+        instructions=_overall_report_instructions(),
+        user_input=overall_in,
+        text_format=DailyReportOut,
+        max_output_tokens=1600,
+        temperature=0.2,
+    )
+    return parsed.model_dump() if hasattr(parsed, "model_dump") else parsed.dict()
+
+
+def _existing_report(db, *, report_date_kst: date, channel_id: str) -> DailyReport | None:
+    return (
+        db.query(DailyReport)
+        .filter(DailyReport.report_date == report_date_kst)
+        .filter(DailyReport.channel_id == channel_id)
+        .first()
+    )
+
+
 def _upsert_daily_report(
-    db, *, report_date_kst: date, channel_id: str, payload: dict
+    db, *, report_date_kst: date, channel_id: str, payload: dict, content_hash: str | None = None
 ) -> None:
-    stmt = pg_insert(DailyReport.__table__).values(
+    stmt = dialect_insert(db, DailyReport.__table__).values(
         report_date=report_date_kst,
         channel_id=channel_id,
         payload_json=payload,
         model=settings.openai_model,
+        input_hash=content_hash,
         created_at=datetime.now(timezone.utc),
     )
     stmt = stmt.on_conflict_do_update(
@@ -187,6 +246,7 @@ def _upsert_daily_report(
         set_=dict(
             payload_json=payload,
             model=settings.openai_model,
+            input_hash=content_hash,
             created_at=datetime.now(timezone.utc),
         ),
     )
@@ -194,6 +254,101 @@ def _upsert_daily_report(
     db.commit()
 
 
+def _report_with_cache(db, *, report_date_kst: date, channel_id: str, content_hash: str, build):
+    """
+    Reuse the stored report when its input hash matches, otherwise call
+    `build()` (None means "empty", served without the LLM) and upsert.
+    Returns (payload, source) with source in {"cached", "empty", "llm"}.
+    """
+    existing = _existing_report(db, report_date_kst=report_date_kst, channel_id=channel_id)
+    if existing and existing.input_hash == content_hash:
+        return existing.payload_json, "cached"
+
+    payload = build()
+    source = "llm"
+    if payload is None:
+        payload = _empty_daily_report(report_date_kst)
+        source = "empty"
+
+    _upsert_daily_report(
+        db,
+        report_date_kst=report_date_kst,
+        channel_id=channel_id,
+        payload=payload,
+        content_hash=content_hash,
+    )
+    return payload, source
+
+
+def _channel_report_task(
+    SessionLocal,
+    llm: LLMClient,
+    summary_pool: Executor,
+    *,
+    report_date_kst: date,
+    channel_id: str,
+    channel_name: str | None,
+    start_epoch: float,
+    end_epoch: float,
+) -> tuple[dict, str]:
+    with SessionLocal() as db:
+        active_thread_ts = (
+            db.query(Message.thread_ts)
+            .filter(Message.channel_id == channel_id)
+            .filter(Message.ts_epoch >= start_epoch)
+            .filter(Message.ts_epoch < end_epoch)
+            .filter(Message.thread_ts.is_not(None))
+            .distinct()
+            .all()
+        )
+        thread_ts_list = [r[0] for r in active_thread_ts if r and r[0]]
+
+        summaries: list[dict] = []
+        if thread_ts_list:
+            top_threads = (
+                db.query(Thread.thread_ts)
+                .filter(Thread.channel_id == channel_id)
+                .filter(Thread.thread_ts.in_(thread_ts_list))
+                .order_by(Thread.reply_count.desc(), Thread.updated_at.desc())
+                .limit(settings.max_threads_per_daily_report)
+                .all()
+            )
+            selected = [r[0] for r in top_threads if r and r[0]]
+
+            summaries = _ensure_thread_summaries(db, llm, channel_id, selected, summary_pool)
+
+        content_hash = input_hash(
+            model=settings.openai_model,
+            instructions=_channel_report_instructions(),
+            payload={
+                "date_kst": report_date_kst.isoformat(),
+                "channel_id": channel_id,
+                "channel_name": channel_name,
+                "thread_summaries": summaries,
+            },
+        )
+
+        def build() -> dict | None:
+            if not summaries:
+                return None
+            return _build_daily_report(
+                llm,
+                report_date_kst=report_date_kst,
+                channel_id=channel_id,
+                channel_name=channel_name,
+                thread_summaries=summaries,
+            )
+
+        payload, source = _report_with_cache(
+            db,
+            report_date_kst=report_date_kst,
+            channel_id=channel_id,
+            content_hash=content_hash,
+            build=build,
+        )
+        return {"channel_id": channel_id, "channel_name": channel_name, "report": payload}, source
+
+
 def main() -> None:
     args = _parse_args()
     report_date_kst = _resolve_report_date_kst(args.date)
@@ -215,93 +370,71 @@ def main() -> None:
         raise RuntimeError("DATABASE_URL is not set; cannot run daily report job.")
 
     with SessionLocal() as db:
-        channels = db.query(Channel).filter(Channel.is_active.is_(True)).all()
-
-        per_channel_payloads = []
-        for ch in channels:
-            active_thread_ts = (
-                db.query(Message.thread_ts)
-                .filter(Message.channel_id == ch.channel_id)
-                .filter(Message.ts_epoch >= start_epoch)
-                .filter(Message.ts_epoch < end_epoch)
-                .filter(Message.thread_ts.is_not(None))
-                .distinct()
-                .all()
-            )
-            thread_ts_list = [r[0] for r in active_thread_ts if r and r[0]]
-
-            if not thread_ts_list:
-                payload = _build_daily_report(
-                    llm,
-                    report_date_kst=report_date_kst,
-                    channel_id=ch.channel_id,
-                    channel_name=ch.name,
-                    thread_summaries=[],
-                )
-                _upsert_daily_report(
-                    db, report_date_kst=report_date_kst, channel_id=ch.channel_id, payload=payload
-                )
-                per_channel_payloads.append(
-                    {"channel_id": ch.channel_id, "channel_name": ch.name, "report": payload}
-                )
-                continue
-
-            top_threads = (
-                db.query(Thread.thread_ts)
-                .filter(Thread.channel_id == ch.channel_id)
-                .filter(Thread.thread_ts.in_(thread_ts_list))
-                .order_by(Thread.reply_count.desc(), Thread.updated_at.desc())
-                .limit(settings.max_threads_per_daily_report)
-                .all()
-            )
-            selected = [r[0] for r in top_threads if r and r[0]]
-
-            summaries = _ensure_thread_summaries(db, llm, ch.channel_id, selected)
-
-            payload = _build_daily_report(
+        channels = [
+            (ch.channel_id, ch.name)
+            for ch in db.query(Channel).filter(Channel.is_active.is_(True)).all()
+        ]
+
+    # DAG: thread summaries (summary pool) -> per-channel report (channel pool,
+    # starts as soon as its own summaries are done) -> __ALL__ rollup.
+    # Separate pools so channel tasks waiting on summaries can never starve them.
+    workers = max(1, args.concurrency or settings.llm_concurrency)
+    with (
+        ThreadPoolExecutor(max_workers=workers, thread_name_prefix="summary") as summary_pool,
+        ThreadPoolExecutor(max_workers=workers, thread_name_prefix="channel") as channel_pool,
+    ):
+        futures = [
+            channel_pool.submit(
+                _channel_report_task,
+                SessionLocal,
                 llm,
+                summary_pool,
                 report_date_kst=report_date_kst,
-                channel_id=ch.channel_id,
-                channel_name=ch.name,
-                thread_summaries=summaries,
-            )
-            _upsert_daily_report(
-                db, report_date_kst=report_date_kst, channel_id=ch.channel_id, payload=payload
-            )
-            per_channel_payloads.append(
-                {"channel_id": ch.channel_id, "channel_name": ch.name, "report": payload}
+                channel_id=channel_id,
+                channel_name=channel_name,
+                start_epoch=start_epoch,
+                end_epoch=end_epoch,
             )
+            for channel_id, channel_name in channels
+        ]
+        per_channel_payloads = []
+        sources: dict[str, int] = {"cached": 0, "empty": 0, "llm": 0}
+        for (channel_id, _), fut in zip(channels, futures):
+            try:
+                entry, source = fut.result()
+            except Exception as e:
+                print(f"[daily_report] channel={channel_id} failed: {e}")
+                continue
+            per_channel_payloads.append(entry)
+            sources[source] += 1
 
-        overall_in = json.dumps(
-            {"date_kst": report_date_kst.isoformat(), "channels": per_channel_payloads},
-            ensure_ascii=False,
-        )
-        overall_instructions = f"""
-너는 여러 채널의 데일리 리포트를 {settings.summary_language}로 종합한다.
-- 출력은 반드시 주어진 스키마를 만족해야 한다(Structured Outputs).
-- notable_threads / action_items의 context_thread_ts는 가능하면 \"channel_id|thread_ts\" 형태로 넣어라.
-- 비어있는 항목은 빈 배열([])을 사용한다.
-"""
-        overall_parsed = llm.parse_structured(
+    with SessionLocal() as db:
+        content_hash = input_hash(
             model=settings.openai_model,
-            instructions=overall_instructions.strip(),
-            user_input=overall_in,
-            text_format=DailyReportOut,
-            max_output_tokens=1600,
-            temperature=0.2,
+            instructions=_overall_report_instructions(),
+            payload={"date_kst": report_date_kst.isoformat(), "channels": per_channel_payloads},
         )
-        overall_payload = (
-            overall_parsed.model_dump()
-            if hasattr(overall_parsed, "model_dump")
-            else overall_parsed.dict()
-        )
-        _upsert_daily_report(
+
+        def build_overall() -> dict | None:
+            if all(_is_empty_report(p["report"]) for p in per_channel_payloads):
+                return None
+            return _build_overall_report(
+                llm, report_date_kst=report_date_kst, per_channel_payloads=per_channel_payloads
+            )
+
+        _, source = _report_with_cache(
             db,
             report_date_kst=report_date_kst,
             channel_id=ALL_CHANNEL_SENTINEL,
-            payload=overall_payload,
+            content_hash=content_hash,
+            build=build_overall,
         )
+        sources[source] += 1
 
+    print(
+        f"[daily_report] reports llm={sources['llm']} cached={sources['cached']} "
+        f"empty={sources['empty']}"
+    )
     print(f"[daily_report] done date_kst={report_date_kst.isoformat()}")
 
 
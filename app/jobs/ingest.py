@@ -1,20 +1,111 @@
 from __future__ import annotations
 
+import argparse
+import asyncio
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
+from app.config import settings
 from app.db import get_session_factory, init_db
 from app.models import Channel
+from app.services.ingest_async_service import (
+    async_ingest_channel_history_roots,
+    async_ingest_channel_thread_replies,
+)
 from app.services.ingest_service import (
     ingest_channel_history_roots,
     ingest_channel_thread_replies,
 )
-from app.slack_client import SlackClient, SlackNotConfigured
+from app.slack_client import AsyncSlackClient, SlackClient, SlackNotConfigured
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
 log = logging.getLogger("ingest-job")
 
 
+def _parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser()
+    p.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Channels ingested in parallel (default: INGEST_WORKERS)",
+    )
+    p.add_argument(
+        "--engine",
+        choices=["threads", "async"],
+        default="threads",
+        help="threads: thread pool + SlackClient; async: asyncio + AsyncSlackClient",
+    )
+    return p.parse_args()
+
+
+def _ingest_one_channel(SessionLocal, slack: SlackClient, channel_id: str) -> bool:
+    # Each worker owns its session; the SlackClient (and its rate-limit state) is shared.
+    with SessionLocal() as db:
+        ch = db.get(Channel, channel_id)
+        if not ch:
+            return False
+        try:
+            result_a = ingest_channel_history_roots(db, slack, ch)
+            log.info("Ingest A OK: %s", result_a)
+
+            result_b = ingest_channel_thread_replies(db, slack, ch)
+            log.info("Ingest B OK: %s", result_b)
+            return True
+        except Exception as e:
+            db.rollback()
+            log.exception("Ingest failed for channel=%s: %s", channel_id, e)
+            return False
+
+
+async def _ingest_one_channel_async(
+    SessionLocal, slack: AsyncSlackClient, sem: asyncio.Semaphore, channel_id: str
+) -> bool:
+    async with sem:
+        with SessionLocal() as db:
+            ch = db.get(Channel, channel_id)
+            if not ch:
+                return False
+            try:
+                result_a = await async_ingest_channel_history_roots(db, slack, ch)
+                log.info("Ingest A OK: %s", result_a)
+
+                result_b = await async_ingest_channel_thread_replies(db, slack, ch)
+                log.info("Ingest B OK: %s", result_b)
+                return True
+            except Exception as e:
+                db.rollback()
+                log.exception("Ingest failed for channel=%s: %s", channel_id, e)
+                return False
+
+
+async def _run_async(SessionLocal, channel_ids: list[str], workers: int) -> tuple[int, dict]:
+    slack = AsyncSlackClient()
+    sem = asyncio.Semaphore(workers)
+    results = await asyncio.gather(
+        *(_ingest_one_channel_async(SessionLocal, slack, sem, cid) for cid in channel_ids)
+    )
+    return sum(1 for r in results if r), slack.rate_limit_stats()
+
+
+def _run_threads(
+    SessionLocal, slack: SlackClient, channel_ids: list[str], workers: int
+) -> tuple[int, dict]:
+    ok = 0
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ingest") as pool:
+        futures = [
+            pool.submit(_ingest_one_channel, SessionLocal, slack, channel_id)
+            for channel_id in channel_ids
+        ]
+        for fut in as_completed(futures):
+            if fut.result():
+                ok += 1
+    return ok, slack.rate_limit_stats()
+
+
 def main() -> int:
+    args = _parse_args()
     init_db()
 
     try:
@@ -28,35 +119,40 @@ def main() -> int:
         log.error("DATABASE_URL is not set; cannot run ingest job.")
         return 2
 
-    db = SessionLocal()
-    try:
-        channels = (
-            db.query(Channel)
+    with SessionLocal() as db:
+        channel_ids = [
+            row[0]
+            for row in db.query(Channel.channel_id)
             .filter(Channel.is_active.is_(True))
             .order_by(Channel.created_at.asc())
             .all()
-        )
-        if not channels:
-            log.info("No active channels. Nothing to ingest.")
-            return 0
-
-        log.info("Starting ingest for %d active channels", len(channels))
+        ]
+    if not channel_ids:
+        log.info("No active channels. Nothing to ingest.")
+        return 0
 
-        for ch in channels:
-            try:
-                result_a = ingest_channel_history_roots(db, slack, ch)
-                log.info("Ingest A OK: %s", result_a)
+    workers = max(1, min(args.workers or settings.ingest_workers, len(channel_ids)))
+    log.info(
+        "Starting ingest for %d active channels (engine=%s workers=%d)",
+        len(channel_ids),
+        args.engine,
+        workers,
+    )
 
-                result_b = ingest_channel_thread_replies(db, slack, ch)
-                log.info("Ingest B OK: %s", result_b)
-            except Exception as e:
-                log.exception("Ingest failed for channel=%s: %s", ch.channel_id, e)
-                continue
+    started = time.monotonic()
+    if args.engine == "async":
+        ok, rate_stats = asyncio.run(_run_async(SessionLocal, channel_ids, workers))
+    else:
+        ok, rate_stats = _run_threads(SessionLocal, slack, channel_ids, workers)
 
-        log.info("Ingest finished.")
-        return 0
-    finally:
-        db.close()
+    log.info(
+        "Ingest finished. ok=%d failed=%d elapsed=%.1fs",
+        ok,
+        len(channel_ids) - ok,
+        time.monotonic() - started,
+    )
+    log.info("Slack rate limit: %s", rate_stats)
+    return 0
 
 
 if __name__ == "__main__":
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import argparse
+import logging
+import time
+
+from app.db import get_session_factory, init_db
+from app.models import Channel
+from app.services.rollup_service import rebuild_channel_rollups
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+log = logging.getLogger("rebuild-rollups")
+
+
+def _parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser()
+    p.add_argument("--channel", type=str, default=None, help="Channel ID (default: all channels)")
+    p.add_argument(
+        "--pending-only",
+        action="store_true",
+        help="Only channels whose rollups are not ready yet (stats_rollup_ready = false)",
+    )
+    return p.parse_args()
+
+
+def main() -> int:
+    """
+    Rebuild channel_daily_* stats rollups from messages. Run once after
+    upgrading (existing channels read raw messages until then) and whenever the
+    rollups need repair; avoid running it while ingest writes the same channel.
+    """
+    args = _parse_args()
+    init_db()
+    SessionLocal = get_session_factory()
+    if SessionLocal is None:
+        log.error("DATABASE_URL is not set; cannot rebuild rollups.")
+        return 2
+
+    with SessionLocal() as db:
+        q = db.query(Channel.channel_id).order_by(Channel.created_at.asc())
+        if args.channel:
+            q = q.filter(Channel.channel_id == args.channel.strip().upper())
+        if args.pending_only:
+            q = q.filter(Channel.stats_rollup_ready.is_(False))
+        channel_ids = [row[0] for row in q.all()]
+
+    if not channel_ids:
+        log.info("No channels to rebuild.")
+        return 0
+
+    failed = 0
+    for channel_id in channel_ids:
+        started = time.monotonic()
+        with SessionLocal() as db:
+            try:
+                res = rebuild_channel_rollups(db, channel_id)
+            except Exception as e:
+                db.rollback()
+                failed += 1
+                log.exception("Rollup rebuild failed for channel=%s: %s", channel_id, e)
+                continue
+        log.info("Rollups rebuilt in %.1fs: %s", time.monotonic() - started, res)
+
+    log.info("Rollup rebuild finished. ok=%d failed=%d", len(channel_ids) - failed, failed)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
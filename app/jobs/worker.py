@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+from dotenv import find_dotenv, load_dotenv
+
+load_dotenv(find_dotenv(filename=".env", usecwd=True), override=False)
+
+import argparse
+import logging
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.config import settings
+from app.db import get_session_factory, init_db
+from app.llm_client import LLMClient
+from app.services.job_queue import (
+    claim_next_job,
+    complete_job,
+    fail_job,
+    requeue_stale_jobs,
+    run_job,
+)
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+log = logging.getLogger("worker")
+
+# How often (per process) running jobs are checked for a dead worker's lock.
+_STALE_CHECK_SECONDS = 60.0
+_stale_check_lock = threading.Lock()
+_next_stale_check = 0.0
+
+
+def _parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser()
+    p.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Jobs executed in parallel (default: LLM_CONCURRENCY)",
+    )
+    p.add_argument(
+        "--once",
+        action="store_true",
+        help="Exit once the queue is empty instead of polling forever",
+    )
+    return p.parse_args()
+
+
+def _requeue_stale_if_due(db) -> None:
+    """
+    Return jobs stuck in `running` (worker thread/process died mid-job) to the
+    queue, at most once per _STALE_CHECK_SECONDS across this process's loops.
+    Without this they would stay active forever and every enqueue for the same
+    target would dedupe onto them.
+    """
+    global _next_stale_check
+
+    with _stale_check_lock:
+        now = time.monotonic()
+        if now < _next_stale_check:
+            return
+        _next_stale_check = now + _STALE_CHECK_SECONDS
+    requeued = requeue_stale_jobs(db)
+    if requeued:
+        log.warning("Requeued %d stale running jobs", requeued)
+
+
+def _worker_loop(
+    SessionLocal, llm: LLMClient, worker_id: str, once: bool, stop: threading.Event
+) -> int:
+    done = 0
+    while not stop.is_set():
+        with SessionLocal() as db:
+            _requeue_stale_if_due(db)
+            job = claim_next_job(db, worker_id)
+            if job is None:
+                if once:
+                    return done
+                stop.wait(settings.worker_poll_interval_seconds)
+                continue
+
+            started = time.monotonic()
+            try:
+                result = run_job(db, llm, job)
+                complete_job(db, job, result)
+                log.info(
+                    "job %s %s %s|%s done in %.1fs",
+                    job.id,
+                    job.kind,
+                    job.channel_id,
+                    job.thread_ts,
+                    time.monotonic() - started,
+                )
+            except Exception as e:
+                db.rollback()
+                fail_job(db, job, str(e))
+                log.exception("job %s %s failed (attempt %s): %s", job.id, job.kind, job.attempts, e)
+            done += 1
+    return done
+
+
+def main() -> int:
+    args = _parse_args()
+
+    if not os.getenv("OPENAI_API_KEY"):
+        raise RuntimeError(
+            "OPENAI_API_KEY is missing. Add it to .env or set environment variable OPENAI_API_KEY."
+        )
+
+    init_db()
+    SessionLocal = get_session_factory()
+    if SessionLocal is None:
+        raise RuntimeError("DATABASE_URL is not set; cannot run worker.")
+
+    llm = LLMClient()
+    workers = max(1, args.workers or settings.llm_concurrency)
+    host = f"{socket.gethostname()}:{os.getpid()}"
+
+    log.info("Worker started (workers=%d once=%s)", workers, args.once)
+    stop = threading.Event()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job") as pool:
+        futures = [
+            pool.submit(_worker_loop, SessionLocal, llm, f"{host}/{i}", args.once, stop)
+            for i in range(workers)
+        ]
+        try:
+            total = sum(f.result() for f in futures)
+        except KeyboardInterrupt:
+            stop.set()
+            total = sum(f.result() for f in futures)
+
+    log.info("Worker finished. jobs=%d", total)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,9 +1,41 @@
 from __future__ import annotations
 
+import logging
+import threading
+
 from openai import OpenAI
 from pydantic import BaseModel
 
 from app.config import settings
+from app.rate_limit import TokenBucket
+from app.token_budget import estimate_tokens
+
+log = logging.getLogger(__name__)
+
+_budget_lock = threading.Lock()
+_request_bucket: TokenBucket | None = None
+_token_bucket: TokenBucket | None = None
+
+
+def _budgets() -> tuple[TokenBucket | None, TokenBucket | None]:
+    """Process-wide per-minute request/token budgets shared by every LLMClient."""
+    global _request_bucket, _token_bucket
+    with _budget_lock:
+        if _request_bucket is None and settings.llm_requests_per_minute > 0:
+            rpm = settings.llm_requests_per_minute
+            _request_bucket = TokenBucket(rate_per_sec=rpm / 60.0, capacity=rpm)
+        if _token_bucket is None and settings.llm_tokens_per_minute > 0:
+            tpm = settings.llm_tokens_per_minute
+            _token_bucket = TokenBucket(rate_per_sec=tpm / 60.0, capacity=tpm)
+        return _request_bucket, _token_bucket
+
+
+def rate_limit_stats() -> dict:
+    requests, tokens = _budgets()
+    return {
+        "requests": requests.stats() if requests else None,
+        "tokens": tokens.stats() if tokens else None,
+    }
 
 
 class LLMClient:
@@ -29,6 +61,13 @@ class LLMClient:
         max_output_tokens: int = 1200,
         temperature: float = 0.2,
     ) -> BaseModel:
+        tokens_in = estimate_tokens(instructions) + estimate_tokens(user_input)
+        requests, tokens = _budgets()
+        if requests is not None:
+            requests.acquire()
+        if tokens is not None:
+            tokens.acquire(tokens_in + max_output_tokens)
+
         resp = self.client.responses.parse(
             model=model,
             input=[
@@ -39,4 +78,13 @@ class LLMClient:
             max_output_tokens=max_output_tokens,
             temperature=temperature,
         )
+        usage = getattr(resp, "usage", None)
+        log.info(
+            "llm parse model=%s format=%s tokens_in_est=%d tokens_in=%s tokens_out=%s",
+            model,
+            text_format.__name__,
+            tokens_in,
+            getattr(usage, "input_tokens", None),
+            getattr(usage, "output_tokens", None),
+        )
         return resp.output_parsed
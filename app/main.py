@@ -9,10 +9,12 @@ from fastapi.staticfiles import StaticFiles
 from app.db import check_db, init_db
 from app.routers.api_channels import router as api_channels_router
 from app.routers.api_ingest import router as api_ingest_router
+from app.routers.api_jobs import router as api_jobs_router
 from app.routers.api_thread_reports import router as api_thread_reports_router
 from app.routers.api_stats import router as api_stats_router
 from app.routers.api_threads import router as api_threads_router
 from app.routers.pages import router as pages_router
+from app.routers.slack_events import router as slack_events_router
 
 
 def create_app() -> FastAPI:
@@ -28,6 +30,8 @@ def create_app() -> FastAPI:
     app.include_router(api_stats_router)
     app.include_router(api_thread_reports_router)
     app.include_router(api_ingest_router)
+    app.include_router(api_jobs_router)
+    app.include_router(slack_events_router)
 
     @app.on_event("startup")
     def _startup():
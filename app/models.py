@@ -14,6 +14,7 @@ from sqlalchemy import (
     Text,
     UniqueConstraint,
     func,
+    text,
 )
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
@@ -56,6 +57,12 @@ class Channel(Base, TimestampMixin):
     ingest_finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     ingest_error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
     ingest_last_result_json: Mapped[dict | None] = mapped_column(JSONB_TYPE, nullable=True)
+    # True once channel_daily_* rollups cover every stored message (new channels
+    # start covered; pre-rollup channels need `python -m app.jobs.rebuild_rollups`).
+    stats_rollup_ready: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
+    # Bumped whenever ingest/summaries/reports change what the channel's read
+    # APIs return; keys the response cache (app/response_cache.py).
+    data_version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
 
     messages = relationship("Message", back_populates="channel", lazy="noload")
     threads = relationship("Thread", back_populates="channel", lazy="noload")
@@ -108,8 +115,10 @@ class Thread(Base):
     __tablename__ = "threads"
     __table_args__ = (
         UniqueConstraint("channel_id", "thread_ts", name="uq_threads_channel_threadts"),
-        Index("ix_threads_channel_updated_at", "channel_id", "updated_at"),
+        # Keyset pagination of thread listings: (updated_at, thread_ts) DESC.
+        Index("ix_threads_channel_updated_at_thread_ts", "channel_id", "updated_at", "thread_ts"),
         Index("ix_threads_channel_thread_ts_epoch", "channel_id", "thread_ts_epoch"),
+        Index("ix_threads_channel_last_polled_at", "channel_id", "last_polled_at"),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -129,10 +138,22 @@ class Thread(Base):
     last_reply_ts: Mapped[str | None] = mapped_column(Text, nullable=True)
     last_reply_ts_epoch: Mapped[float | None] = mapped_column(Float, nullable=True)
 
+    # Change detection for replies polling: Slack's `latest_reply` on the root as last
+    # seen (history/replies), and the value it had when replies were last polled.
+    latest_reply_ts_epoch: Mapped[float | None] = mapped_column(Float, nullable=True)
+    polled_reply_ts_epoch: Mapped[float | None] = mapped_column(Float, nullable=True)
+    last_polled_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
     needs_summary: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
     last_summarized_ts: Mapped[str | None] = mapped_column(Text, nullable=True)
     last_summarized_ts_epoch: Mapped[float | None] = mapped_column(Float, nullable=True)
 
+    # Denormalized for thread listings, so they read only this table:
+    # thread_summaries.summary_json["one_line"] (set with each summary) and
+    # whether a thread_reports row exists.
+    one_line: Mapped[str | None] = mapped_column(Text, nullable=True)
+    has_report: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
     )
@@ -159,6 +180,11 @@ class ThreadSummary(Base, TimestampMixin):
     source_latest_ts: Mapped[str] = mapped_column(Text, nullable=False)
     source_latest_ts_epoch: Mapped[float] = mapped_column(Float, nullable=False)
 
+    # SHA-256 of model + instructions + serialized messages sent to the LLM.
+    input_hash: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Incremental (prior summary + new messages) updates since the last full summary.
+    incremental_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
 
 class ThreadReport(Base):
     __tablename__ = "thread_reports"
@@ -196,7 +222,94 @@ class DailyReport(Base):
 
     payload_json: Mapped[dict] = mapped_column(JSONB_TYPE, nullable=False)
     model: Mapped[str] = mapped_column(Text, nullable=False)
+    input_hash: Mapped[str | None] = mapped_column(Text, nullable=True)
 
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
+
+
+class ChannelDailyStat(Base):
+    """Messages per channel per local (TZ) day, maintained by IngestWriter."""
+
+    __tablename__ = "channel_daily_stats"
+    __table_args__ = (
+        UniqueConstraint("channel_id", "day", name="uq_channel_daily_stats_channel_day"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    channel_id: Mapped[str] = mapped_column(Text, nullable=False)
+    day: Mapped[date] = mapped_column(Date, nullable=False)
+    message_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class ChannelDailyUserStat(Base):
+    __tablename__ = "channel_daily_user_stats"
+    __table_args__ = (
+        UniqueConstraint(
+            "channel_id", "day", "user_id", name="uq_channel_daily_user_stats_channel_day_user"
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    channel_id: Mapped[str] = mapped_column(Text, nullable=False)
+    day: Mapped[date] = mapped_column(Date, nullable=False)
+    user_id: Mapped[str] = mapped_column(Text, nullable=False)
+    message_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class ChannelDailyThreadStat(Base):
+    """Threads with activity per day, for distinct-thread counts and top threads."""
+
+    __tablename__ = "channel_daily_thread_stats"
+    __table_args__ = (
+        UniqueConstraint(
+            "channel_id", "day", "thread_ts", name="uq_channel_daily_thread_stats_channel_day_thread"
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    channel_id: Mapped[str] = mapped_column(Text, nullable=False)
+    day: Mapped[date] = mapped_column(Date, nullable=False)
+    thread_ts: Mapped[str] = mapped_column(Text, nullable=False)
+    message_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class Job(Base, TimestampMixin):
+    """
+    Durable work queue for LLM work (thread summaries/reports) executed by
+    `python -m app.jobs.worker` instead of inside HTTP requests.
+    """
+
+    __tablename__ = "jobs"
+    __table_args__ = (
+        Index("ix_jobs_status_run_after", "status", "run_after"),
+        # At most one queued/running job per target, so refresh storms collapse.
+        Index(
+            "uq_jobs_active_target",
+            "kind",
+            "channel_id",
+            "thread_ts",
+            unique=True,
+            postgresql_where=text("status IN ('queued', 'running')"),
+            sqlite_where=text("status IN ('queued', 'running')"),
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+
+    kind: Mapped[str] = mapped_column(Text, nullable=False)
+    channel_id: Mapped[str] = mapped_column(Text, nullable=False)
+    thread_ts: Mapped[str] = mapped_column(Text, nullable=False)
+    params_json: Mapped[dict | None] = mapped_column(JSONB_TYPE, nullable=True)
+
+    # queued -> running -> done | error (failed attempts go back to queued until max)
+    status: Mapped[str] = mapped_column(Text, nullable=False, default="queued")
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    run_after: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    locked_by: Mapped[str | None] = mapped_column(Text, nullable=True)
+    locked_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    result_json: Mapped[dict | None] = mapped_column(JSONB_TYPE, nullable=True)
+    error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+
+
+def encode_cursor(*values: str) -> str:
+    """Opaque URL-safe cursor for a keyset position (clients pass it back as-is)."""
+    raw = json.dumps(list(values), separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list[str]:
+    """Inverse of encode_cursor; raises ValueError on anything it did not produce."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, json.JSONDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if (
+        not isinstance(values, list)
+        or len(values) != size
+        or not all(isinstance(v, str) for v in values)
+    ):
+        raise ValueError("Invalid cursor")
+    return values
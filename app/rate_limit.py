@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket. `acquire()` blocks until a token is available and
+    returns the seconds spent waiting. Waiters reserve their token up front so
+    concurrent callers are served in arrival order instead of racing on refill.
+    """
+
+    def __init__(self, *, rate_per_sec: float, capacity: float) -> None:
+        self.rate_per_sec = max(float(rate_per_sec), 1e-6)
+        self.capacity = max(float(capacity), 1.0)
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+        self.acquired = 0
+        self.throttled = 0
+        self.throttled_seconds = 0.0
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._last
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate_per_sec)
+            self._last = now
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Take `tokens` now (possibly going into debt) and return how long to wait."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= tokens
+            self.acquired += 1
+            wait_s = 0.0
+            if self._tokens < 0:
+                wait_s = -self._tokens / self.rate_per_sec
+                self.throttled += 1
+                self.throttled_seconds += wait_s
+            return wait_s
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        wait_s = self.reserve(tokens)
+        if wait_s > 0:
+            time.sleep(wait_s)
+        return wait_s
+
+    def drain(self, seconds: float) -> None:
+        """Push the bucket into debt so nobody is admitted for `seconds` (e.g. after a 429)."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, -seconds * self.rate_per_sec)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "rate_per_min": round(self.rate_per_sec * 60, 2),
+                "capacity": self.capacity,
+                "acquired": self.acquired,
+                "throttled": self.throttled,
+                "throttled_seconds": round(self.throttled_seconds, 3),
+            }
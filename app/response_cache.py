@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.config import settings
+
+log = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CachedBody:
+    version: int
+    etag: str
+    body: bytes
+    expires_at: float  # wall clock, so disk entries mean the same in every process
+    headers: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class Built:
+    """Return from a `build` callback to cache response headers with the body."""
+
+    content: Any
+    headers: dict[str, str] = field(default_factory=dict)
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU of serialized JSON responses keyed by a string, each entry
+    tagged with the channel data_version it was built from. A lookup only hits
+    when the caller's current version matches, so bumping the version is the
+    invalidation. With `disk_dir`, entries are also written there (one file
+    per key, atomic replace) and read back on an in-memory miss, which lets
+    uvicorn workers and restarts share warm entries.
+    """
+
+    def __init__(
+        self, *, max_entries: int, ttl_seconds: float, disk_dir: str | None = None
+    ) -> None:
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self.disk_dir = disk_dir
+        self._data: OrderedDict[str, CachedBody] = OrderedDict()
+        self._lock = threading.Lock()
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def get(self, key: str, version: int) -> CachedBody | None:
+        now = time.time()
+        with self._lock:
+            hit = self._data.get(key)
+            if hit is not None:
+                if hit.version == version and hit.expires_at > now:
+                    self._data.move_to_end(key)
+                    return hit
+                del self._data[key]
+
+        hit = self._disk_get(key)
+        if hit is None or hit.version != version or hit.expires_at <= now:
+            return None
+        self._remember(key, hit)
+        return hit
+
+    def put(
+        self, key: str, version: int, body: bytes, headers: dict[str, str] | None = None
+    ) -> CachedBody:
+        entry = CachedBody(
+            version=version,
+            etag=etag_for(body),
+            body=body,
+            expires_at=time.time() + self.ttl_seconds,
+            headers=dict(headers or {}),
+        )
+        self._remember(key, entry)
+        self._disk_put(key, entry)
+        return entry
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def _remember(self, key: str, entry: CachedBody) -> None:
+        with self._lock:
+            self._data[key] = entry
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def _path(self, key: str) -> str:
+        name = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.disk_dir or "", f"{name}.json")
+
+    def _disk_get(self, key: str) -> CachedBody | None:
+        if not self.disk_dir:
+            return None
+        try:
+            with open(self._path(key), "rb") as f:
+                header = json.loads(f.readline())
+                body = f.read()
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            log.warning("Unreadable response cache file for %s: %s", key, e)
+            return None
+        if header.get("key") != key:
+            return None
+        return CachedBody(
+            version=int(header["version"]),
+            etag=header["etag"],
+            body=body,
+            expires_at=float(header["expires_at"]),
+            headers=dict(header.get("headers") or {}),
+        )
+
+    def _disk_put(self, key: str, entry: CachedBody) -> None:
+        if not self.disk_dir:
+            return
+        header = json.dumps(
+            {
+                "key": key,
+                "version": entry.version,
+                "etag": entry.etag,
+                "expires_at": entry.expires_at,
+                "headers": entry.headers,
+            }
+        )
+        try:
+            fd, tmp = tempfile.mkstemp(dir=self.disk_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(header.encode("utf-8") + b"\n" + entry.body)
+            os.replace(tmp, self._path(key))
+        except Exception as e:
+            log.warning("Failed to write response cache file for %s: %s", key, e)
+
+
+def etag_for(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    # If-None-Match uses the weak comparison: W/"x" matches "x".
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+@lru_cache(maxsize=32)
+def _adapter(model: Any) -> TypeAdapter:
+    return TypeAdapter(model)
+
+
+def _render(content: Any, response_model: Any | None) -> bytes:
+    # Same bytes FastAPI would send: response_model validation + JSONResponse.
+    if response_model is not None:
+        adapter = _adapter(response_model)
+        content = adapter.dump_python(
+            adapter.validate_python(content, from_attributes=True), mode="json"
+        )
+    else:
+        content = jsonable_encoder(content)
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+_cache = ResponseCache(
+    max_entries=settings.response_cache_max_entries,
+    ttl_seconds=settings.response_cache_ttl_seconds,
+    disk_dir=settings.response_cache_dir,
+)
+
+
+def cached_json_response(
+    request: Request,
+    *,
+    key: tuple,
+    version: int,
+    build: Callable[[], Any],
+    response_model: Any | None = None,
+) -> Response:
+    """
+    Serve a channel read API from the response cache. `version` must be read
+    (channels.data_version) before `build` queries anything, so a body is never
+    stored under a newer version than the data it was built from. Answers 304
+    when If-None-Match carries the body's ETag; `no-cache` makes browsers
+    revalidate on every load instead of reusing a body a bump has outdated.
+    `build` may return a `Built` to attach headers (e.g. X-Next-Cursor).
+    """
+    cache_key = "|".join(str(part) for part in key)
+    entry = _cache.get(cache_key, version) if settings.response_cache_enabled else None
+    status = "HIT"
+    if entry is None:
+        status = "MISS"
+        built = build()
+        if not isinstance(built, Built):
+            built = Built(built)
+        body = _render(built.content, response_model)
+        if settings.response_cache_enabled:
+            entry = _cache.put(cache_key, version, body, built.headers)
+        else:
+            entry = CachedBody(
+                version=version,
+                etag=etag_for(body),
+                body=body,
+                expires_at=0.0,
+                headers=built.headers,
+            )
+
+    headers = {
+        **entry.headers,
+        "ETag": entry.etag,
+        "Cache-Control": "no-cache",
+        "X-Cache": status,
+    }
+    if _etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+def clear() -> None:
+    """Drop in-memory entries (disk entries still need a matching version to hit)."""
+    _cache.clear()
@@ -12,6 +12,7 @@ from app.config import settings
 from app.db import get_db
 from app.models import Channel
 from app.slack_client import SlackCallError, SlackClient, SlackNotConfigured
+from app.services.data_version import mark_channels_changed
 from app.services.user_service import upsert_user_cache
 
 router = APIRouter(prefix="/api", tags=["channels"])
@@ -95,6 +96,8 @@ def create_channel(payload: ChannelCreateIn, db: Session = Depends(get_db)):
     if existing:
         if name and existing.name != name:
             existing.name = name
+            # channel_name is part of the cached stats response.
+            mark_channels_changed(db, [channel_id])
             db.commit()
             db.refresh(existing)
 
@@ -102,7 +105,7 @@ def create_channel(payload: ChannelCreateIn, db: Session = Depends(get_db)):
         if creator:
             try:
                 user_obj = slack.get_user_info(creator)
-                _upsert_user_cache(db, user_obj)
+                upsert_user_cache(db, user_obj)
                 db.commit()
             except Exception:
                 db.rollback()
@@ -127,7 +130,7 @@ def create_channel(payload: ChannelCreateIn, db: Session = Depends(get_db)):
     if creator:
         try:
             user_obj = slack.get_user_info(creator)
-            _upsert_user_cache(db, user_obj)
+            upsert_user_cache(db, user_obj)
             db.commit()
         except Exception:
             db.rollback()
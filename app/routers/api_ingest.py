@@ -1,19 +1,24 @@
 from __future__ import annotations
 
+import asyncio
+import json
 import uuid
 from datetime import datetime, timezone, timedelta
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
 from app.db import get_db, get_session_factory, init_db
 from app.models import Channel
-from app.services.ingest_service import ingest_channel
-from app.slack_client import SlackClient, SlackNotConfigured
+from app.services.ingest_runs import active_run_for_channel, get_run, start_ingest_run
+from app.slack_client import AsyncSlackClient, SlackNotConfigured
 
 router = APIRouter(prefix="/api", tags=["ingest"])
 
+_SSE_POLL_SECONDS = 0.5
+
 
 class IngestRequest(BaseModel):
     backfill_days: int = Field(default=14, ge=1, le=90)
@@ -23,16 +28,21 @@ class IngestRequest(BaseModel):
 class IngestResponse(BaseModel):
     status: str
     channel_id: str
+    run_id: str | None = None
     counts: dict | None = None
     last_ts_epoch: float | None = None
 
 
-@router.post("/channels/{channel_id}/ingest", response_model=IngestResponse)
+@router.post("/channels/{channel_id}/ingest", response_model=IngestResponse, status_code=202)
 def trigger_ingest(
     channel_id: str,
     payload: IngestRequest,
     db: Session = Depends(get_db),
 ):
+    """
+    Start ingest on the background executor and return its run_id right away.
+    Follow progress via GET /api/ingest-runs/{run_id}/events (SSE).
+    """
     ch = db.get(Channel, channel_id)
     if not ch:
         raise HTTPException(status_code=404, detail="Channel not found")
@@ -40,52 +50,81 @@ def trigger_ingest(
         raise HTTPException(status_code=400, detail="Channel is not active")
 
     try:
-        slack = SlackClient()
+        slack = AsyncSlackClient()
     except SlackNotConfigured as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-    ch.ingest_status = "running"
-    ch.ingest_started_at = datetime.now(timezone.utc)
-    ch.ingest_finished_at = None
-    ch.ingest_error_message = None
-    db.commit()
-
-    try:
-        res = ingest_channel(
-            db,
-            slack,
-            channel=ch,
-            backfill_days=payload.backfill_days,
-            mode=payload.mode,
-        )
-        ch.ingest_status = "ok"
-        ch.ingest_finished_at = datetime.now(timezone.utc)
-        ch.ingest_last_result_json = res
-        ch.last_ingested_at = datetime.now(timezone.utc)
+    run = active_run_for_channel(channel_id)
+    if run is None:
+        # Mark running before dispatch so a fast run's final status is not overwritten.
+        ch.ingest_status = "running"
+        ch.ingest_started_at = datetime.now(timezone.utc)
+        ch.ingest_finished_at = None
+        ch.ingest_error_message = None
         db.commit()
-    except Exception as e:
-        db.rollback()
-        ch = db.get(Channel, channel_id)
-        if ch:
-            ch.ingest_status = "error"
-            ch.ingest_error_message = str(e)
-            ch.ingest_finished_at = datetime.now(timezone.utc)
-            db.commit()
-        raise HTTPException(status_code=500, detail=str(e))
-
-    counts = {}
-    try:
-        counts["history_messages"] = res.get("history", {}).get("saved_candidates")
-        counts["history_roots"] = res.get("history", {}).get("roots")
-        counts["replies_messages"] = res.get("replies", {}).get("saved_candidates")
-        counts["replies_threads_with_new"] = res.get("replies", {}).get("threads_with_new_replies")
-        last_ts_epoch = res.get("history", {}).get("max_ts_epoch") or ch.last_ts_epoch
-    except Exception:
-        last_ts_epoch = ch.last_ts_epoch
+        run, _ = start_ingest_run(
+            slack, channel_id, backfill_days=payload.backfill_days, mode=payload.mode
+        )
 
     return IngestResponse(
-        status="ok",
+        status="running" if not run.done else run.status,
         channel_id=channel_id,
-        counts=counts or None,
-        last_ts_epoch=last_ts_epoch,
+        run_id=run.run_id,
+        last_ts_epoch=ch.last_ts_epoch,
+    )
+
+
+@router.get("/ingest-runs/{run_id}")
+def get_ingest_run(run_id: str):
+    run = get_run(run_id)
+    if not run:
+        raise HTTPException(status_code=404, detail="Ingest run not found")
+    return run.snapshot()
+
+
+def _sse(event: str, data: dict, event_id: int | None = None) -> str:
+    head = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{head}event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+@router.get("/ingest-runs/{run_id}/events")
+async def stream_ingest_run(run_id: str, request: Request):
+    """
+    Server-Sent Events: one `progress` event per history page / polled thread
+    (event data: {seq, event, data, elapsed_s}), then a final `end` event with
+    the run snapshot. Honors Last-Event-ID for reconnects.
+    """
+    run = get_run(run_id)
+    if not run:
+        raise HTTPException(status_code=404, detail="Ingest run not found")
+
+    try:
+        cursor = int(request.headers.get("last-event-id") or 0)
+    except ValueError:
+        cursor = 0
+
+    async def gen():
+        nonlocal cursor
+        idle = 0.0
+        while True:
+            if await request.is_disconnected():
+                return
+            done = run.done
+            for ev in run.events_after(cursor):
+                cursor = ev["seq"]
+                idle = 0.0
+                yield _sse("progress", ev, ev["seq"])
+            if done:
+                yield _sse("end", run.snapshot())
+                return
+            await asyncio.sleep(_SSE_POLL_SECONDS)
+            idle += _SSE_POLL_SECONDS
+            if idle >= 15:
+                idle = 0.0
+                yield ": keep-alive\n\n"
+
+    return StreamingResponse(
+        gen(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
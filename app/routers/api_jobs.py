@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Response
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from app.db import get_db
+from app.models import Job, Thread
+from app.services.job_queue import enqueue_job
+
+router = APIRouter(prefix="/api/jobs", tags=["jobs"])
+
+
+class JobIn(BaseModel):
+    kind: Literal["summarize_thread", "thread_report"] = "thread_report"
+    channel_id: str
+    thread_ts: str
+    force: bool = False
+
+
+class JobOut(BaseModel):
+    id: int
+    kind: str
+    channel_id: str
+    thread_ts: str
+    status: str
+    attempts: int
+    result_json: dict | None = None
+    error_message: str | None = None
+    created_at: datetime
+    updated_at: datetime
+    finished_at: datetime | None = None
+
+    class Config:
+        from_attributes = True
+
+
+@router.post("", response_model=JobOut, status_code=202)
+def enqueue(payload: JobIn, response: Response, db: Session = Depends(get_db)):
+    """
+    Queue a summary/report refresh for `python -m app.jobs.worker` and return
+    immediately. A queued/running job for the same target is returned as-is (200).
+    """
+    thread = (
+        db.query(Thread)
+        .filter(Thread.channel_id == payload.channel_id)
+        .filter(Thread.thread_ts == payload.thread_ts)
+        .first()
+    )
+    if not thread:
+        raise HTTPException(status_code=404, detail="Thread not found")
+
+    job, created = enqueue_job(
+        db,
+        kind=payload.kind,
+        channel_id=payload.channel_id,
+        thread_ts=payload.thread_ts,
+        params={"force": payload.force},
+    )
+    if not created:
+        response.status_code = 200
+    return job
+
+
+@router.get("/{job_id}", response_model=JobOut)
+def get_job(job_id: int, db: Session = Depends(get_db)):
+    job = db.get(Job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
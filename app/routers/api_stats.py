@@ -1,9 +1,15 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
 
+from app.config import settings
 from app.db import get_db
+from app.models import Channel
+from app.response_cache import cached_json_response
 from app.services.stats_service import get_channel_stats
 
 router = APIRouter(prefix="/api", tags=["stats"])
@@ -11,12 +17,21 @@ router = APIRouter(prefix="/api", tags=["stats"])
 
 @router.get("/channels/{channel_id}/stats")
 def api_channel_stats(
+    request: Request,
     channel_id: str,
     days: int = Query(7, ge=1, le=60),
     top_n: int = Query(10, ge=1, le=50),
     db: Session = Depends(get_db),
 ):
-    try:
-        return get_channel_stats(db, channel_id, days=days, top_n=top_n)
-    except KeyError:
+    ch = db.get(Channel, channel_id)
+    if not ch:
         raise HTTPException(status_code=404, detail="Channel not found")
+
+    # The window slides at local midnight even when no data changed.
+    today = datetime.now(ZoneInfo(settings.tz)).date().isoformat()
+    return cached_json_response(
+        request,
+        key=("stats", channel_id, days, top_n, today),
+        version=ch.data_version,
+        build=lambda: get_channel_stats(db, channel_id, days=days, top_n=top_n),
+    )
@@ -2,17 +2,17 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from pydantic import BaseModel
-from sqlalchemy import desc, func
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from app.db import get_db
-from app.llm_client import LLMClient
-from app.models import Channel, Message, Thread, ThreadReport, ThreadSummary
-from app.config import settings
-from app.services.summary_service import summarize_thread
-from app.services.thread_report_service import ensure_thread_report, generate_thread_report
+from app.models import Channel, Thread, ThreadReport
+from app.response_cache import Built, cached_json_response
+from app.routers.api_jobs import JobOut
+from app.services.job_queue import enqueue_job
+from app.services.thread_service import page_threads
 
 router = APIRouter(prefix="/api/thread-reports", tags=["thread-reports"])
 
@@ -48,59 +48,53 @@ class ThreadListItem(BaseModel):
 
 @router.get("", response_model=list[ThreadListItem])
 def list_thread_reports(
+    request: Request,
     channel_id: str,
     limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = Query(None, max_length=512),
     db: Session = Depends(get_db),
 ):
     ch = db.get(Channel, channel_id)
     if not ch:
         raise HTTPException(status_code=404, detail="Channel not found")
 
-    root_subq = (
-        db.query(Message.thread_ts, Message.text.label("root_text"))
-        .filter(Message.channel_id == channel_id)
-        .filter(Message.thread_ts == Message.ts)
-        .subquery()
+    def build() -> Built:
+        try:
+            items, next_cursor = _thread_report_items(db, channel_id, limit, cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return Built(items, {"X-Next-Cursor": next_cursor} if next_cursor else {})
+
+    return cached_json_response(
+        request,
+        key=("thread_reports", channel_id, limit, cursor or ""),
+        version=ch.data_version,
+        build=build,
+        response_model=list[ThreadListItem],
     )
 
-    rows = (
-        db.query(
-            Thread.channel_id,
-            Thread.thread_ts,
-            Thread.reply_count,
-            Thread.updated_at,
-            root_subq.c.root_text,
-            ThreadSummary.summary_json,
-            ThreadReport.id.label("report_exists"),
-        )
-        .outerjoin(root_subq, Thread.thread_ts == root_subq.c.thread_ts)
-        .outerjoin(
-            ThreadSummary,
-            (ThreadSummary.channel_id == Thread.channel_id)
-            & (ThreadSummary.thread_ts == Thread.thread_ts),
-        )
-        .outerjoin(
-            ThreadReport,
-            (ThreadReport.channel_id == Thread.channel_id)
-            & (ThreadReport.thread_ts == Thread.thread_ts),
-        )
-        .filter(Thread.channel_id == channel_id)
-        .order_by(desc(Thread.updated_at))
-        .limit(limit)
-        .all()
-    )
+
+def _thread_report_items(
+    db: Session, channel_id: str, limit: int, cursor: str | None
+) -> tuple[list[ThreadListItem], str | None]:
+    # threads carries root_text plus the denormalized one_line/has_report, so
+    # the listing reads only that table.
+    query = db.query(
+        Thread.channel_id,
+        Thread.thread_ts,
+        Thread.reply_count,
+        Thread.updated_at,
+        Thread.root_text,
+        Thread.one_line,
+        Thread.has_report,
+    ).filter(Thread.channel_id == channel_id)
+    rows, next_cursor = page_threads(db, query, limit=limit, cursor=cursor)
 
     out: list[ThreadListItem] = []
     for r in rows:
         title = (r.root_text or "").strip() or None
         if title:
             title = title[:120]
-        one_line = None
-        if r.summary_json:
-            try:
-                one_line = (r.summary_json or {}).get("one_line")
-            except Exception:
-                one_line = None
         out.append(
             ThreadListItem(
                 channel_id=r.channel_id,
@@ -108,11 +102,11 @@ def list_thread_reports(
                 reply_count=int(r.reply_count or 0),
                 updated_at=r.updated_at,
                 title=title,
-                one_line=one_line,
-                has_report=bool(r.report_exists),
+                one_line=r.one_line,
+                has_report=bool(r.has_report),
             )
         )
-    return out
+    return out, next_cursor
 
 
 class ThreadReportDetail(BaseModel):
@@ -163,24 +157,19 @@ def get_thread_report(channel_id: str, thread_ts: str, db: Session = Depends(get
     )
 
 
-class RefreshResult(BaseModel):
-    thread_ts: str
-    status: str
-    source_latest_ts_epoch: float | None = None
-    report_json: dict | None = None
-    model: str | None = None
-    source_latest_ts: str | None = None
-    updated_at: datetime | None = None
-    meta: dict | None = None
-
-
-@router.post("/{channel_id}/{thread_ts}/refresh", response_model=RefreshResult)
+@router.post("/{channel_id}/{thread_ts}/refresh", response_model=JobOut, status_code=202)
 def refresh_thread_report(
     channel_id: str,
     thread_ts: str,
-    force: bool = False,
+    response: Response,
+    force: bool = True,
     db: Session = Depends(get_db),
 ):
+    """
+    Queue a thread_report job (summary refreshed along with it when stale) for
+    `python -m app.jobs.worker`; same contract as POST /api/jobs. The LLM calls
+    never run in the request.
+    """
     ch = db.get(Channel, channel_id)
     if not ch:
         raise HTTPException(status_code=404, detail="Channel not found")
@@ -194,71 +183,13 @@ def refresh_thread_report(
     if not thread:
         raise HTTPException(status_code=404, detail="Thread not found")
 
-    if not (settings.openai_api_key or None):
-        raise HTTPException(
-            status_code=400,
-            detail={
-                "status": "error",
-                "code": "OPENAI_API_KEY_MISSING",
-                "message": "Set OPENAI_API_KEY in .env or environment.",
-            },
-        )
-
-    try:
-        llm = LLMClient()
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e))
-
-    latest_epoch = float(thread.last_reply_ts_epoch or thread.thread_ts_epoch or 0)
-    summary_row = (
-        db.query(ThreadSummary)
-        .filter(ThreadSummary.channel_id == channel_id)
-        .filter(ThreadSummary.thread_ts == thread.thread_ts)
-        .first()
-    )
-    need_summary = (
-        thread.needs_summary
-        or (summary_row is None)
-        or float((summary_row.source_latest_ts_epoch or 0)) < latest_epoch
-    )
-    if need_summary:
-        try:
-            summarize_thread(db, llm, channel_id=channel_id, thread=thread)
-        except Exception:
-            db.rollback()
-
-    try:
-        res = generate_thread_report(
-            db, llm, channel_id=channel_id, thread=thread, force=True if not force else force
-        )
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-    row = (
-        db.query(ThreadReport)
-        .filter(ThreadReport.channel_id == channel_id)
-        .filter(ThreadReport.thread_ts == thread_ts)
-        .first()
-    )
-    if not row:
-        return RefreshResult(thread_ts=thread_ts, status="error", source_latest_ts_epoch=None)
-
-    latest_epoch = float(thread.last_reply_ts_epoch or thread.thread_ts_epoch or 0)
-    meta = {
-        "latest_epoch": latest_epoch,
-        "report_source_latest_ts_epoch": float(row.source_latest_ts_epoch or 0),
-        "is_stale": float(row.source_latest_ts_epoch or 0) < latest_epoch,
-    }
-
-    return RefreshResult(
+    job, created = enqueue_job(
+        db,
+        kind="thread_report",
+        channel_id=channel_id,
         thread_ts=thread_ts,
-        status="refreshed" if not res.get("skipped") else res["skipped"],
-        source_latest_ts_epoch=row.source_latest_ts_epoch,
-        report_json=row.report_json,
-        model=row.model,
-        source_latest_ts=row.source_latest_ts,
-        updated_at=row.updated_at,
-        meta=meta,
+        params={"force": force},
     )
+    if not created:
+        response.status_code = 200
+    return job
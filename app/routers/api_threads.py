@@ -2,11 +2,13 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
 from app.db import get_db
+from app.models import Channel
+from app.response_cache import Built, cached_json_response
 from app.services.thread_service import get_thread_messages_with_html, list_threads
 from app.text_render import render_slack_text_to_safe_html
 
@@ -39,16 +41,34 @@ class ThreadListItem(BaseModel):
 
 @router.get("/channels/{channel_id}/threads", response_model=list[ThreadListItem])
 def api_list_threads(
+    request: Request,
     channel_id: str,
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0, le=100000),
+    cursor: str | None = Query(None, max_length=512),
     db: Session = Depends(get_db),
 ):
-    try:
-        return list_threads(db, channel_id, limit=limit, offset=offset)
-    except KeyError:
+    ch = db.get(Channel, channel_id)
+    if not ch:
         raise HTTPException(status_code=404, detail="Channel not found")
 
+    def build() -> Built:
+        try:
+            rows, next_cursor = list_threads(
+                db, channel_id, limit=limit, offset=offset, cursor=cursor
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return Built(rows, {"X-Next-Cursor": next_cursor} if next_cursor else {})
+
+    return cached_json_response(
+        request,
+        key=("threads", channel_id, limit, offset, cursor or ""),
+        version=ch.data_version,
+        build=build,
+        response_model=list[ThreadListItem],
+    )
+
 
 class ThreadMessageOut(BaseModel):
     ts: str
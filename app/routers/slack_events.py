@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import json
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from slack_sdk.signature import SignatureVerifier
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db import get_db
+from app.services.slack_events_service import ingest_message_event
+
+router = APIRouter(prefix="/slack", tags=["slack-events"])
+
+
+def _ingest_event(db: Session, event: dict) -> dict:
+    # Blocking DB work (upsert, commit, rollback) runs in the threadpool,
+    # never on the event loop the async handler runs on.
+    try:
+        return ingest_message_event(db, event)
+    except Exception:
+        db.rollback()
+        raise
+
+
+@router.post("/events")
+async def slack_events(request: Request, db: Session = Depends(get_db)):
+    """
+    Slack Events API receiver (push ingest). Requests are verified with
+    SLACK_SIGNING_SECRET; `message` events are upserted immediately.
+    """
+    if not settings.slack_signing_secret:
+        raise HTTPException(status_code=503, detail="SLACK_SIGNING_SECRET is not configured")
+
+    body = await request.body()
+    verifier = SignatureVerifier(settings.slack_signing_secret)
+    if not verifier.is_valid(
+        body=body,
+        timestamp=request.headers.get("X-Slack-Request-Timestamp", ""),
+        signature=request.headers.get("X-Slack-Signature", ""),
+    ):
+        raise HTTPException(status_code=401, detail="Invalid Slack signature")
+
+    try:
+        payload = json.loads(body or b"{}")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid JSON body")
+
+    if payload.get("type") == "url_verification":
+        return {"challenge": payload.get("challenge")}
+
+    if payload.get("type") != "event_callback":
+        return {"ok": True, "ignored": payload.get("type")}
+
+    event = payload.get("event") or {}
+    if event.get("type") != "message":
+        return {"ok": True, "ignored": event.get("type")}
+
+    try:
+        result = await run_in_threadpool(_ingest_event, db, event)
+    except Exception as e:
+        # Non-2xx makes Slack retry; the upsert path is idempotent on (channel_id, ts).
+        raise HTTPException(status_code=500, detail=str(e))
+    return {"ok": True, **result}
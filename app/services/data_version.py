@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from typing import Iterable
+
+from sqlalchemy import event, inspect, update
+from sqlalchemy.orm import Session
+
+from app.models import Channel, Thread
+
+_INFO_KEY = "changed_channel_ids"
+
+# Poll bookkeeping that no read API returns; touching only these must not
+# invalidate the channel's cached responses on every replies poll (including
+# the slow sweep of old threads). updated_at is either left to onupdate or
+# pinned to itself for such poll-only writes.
+_UNVERSIONED_THREAD_ATTRS = frozenset(
+    {"last_polled_at", "polled_reply_ts_epoch", "latest_reply_ts_epoch", "updated_at"}
+)
+
+
+def mark_channels_changed(db: Session, channel_ids: Iterable[str]) -> None:
+    """
+    Record that the current transaction changes what these channels' read
+    APIs return. Their channels.data_version is bumped once, right before the
+    transaction commits, so cached responses stop matching exactly when the
+    change becomes visible; a rollback forgets the marks.
+    """
+    ids = {c for c in channel_ids if c}
+    if ids:
+        db.info.setdefault(_INFO_KEY, set()).update(ids)
+
+
+def _thread_changed(obj: Thread) -> bool:
+    for attr in inspect(obj).attrs:
+        if attr.key in _UNVERSIONED_THREAD_ATTRS:
+            continue
+        hist = attr.history
+        if hist.added and list(hist.added) != list(hist.deleted):
+            return True
+    return False
+
+
+@event.listens_for(Session, "before_flush")
+def _track_thread_changes(session: Session, flush_context, instances) -> None:
+    ids = {obj.channel_id for obj in session.new if isinstance(obj, Thread)}
+    ids.update(
+        obj.channel_id
+        for obj in session.dirty
+        if isinstance(obj, Thread) and _thread_changed(obj)
+    )
+    mark_channels_changed(session, ids)
+
+
+@event.listens_for(Session, "before_commit")
+def _bump_versions(session: Session) -> None:
+    session.flush()
+    ids = session.info.pop(_INFO_KEY, None)
+    if not ids:
+        return
+    # data_version = data_version + 1 in one UPDATE, so concurrent writers
+    # (web process, worker, events endpoint) never lose a bump. updated_at is
+    # pinned so the bump does not trigger the column's onupdate.
+    session.execute(
+        update(Channel)
+        .where(Channel.channel_id.in_(sorted(ids)))
+        .values(data_version=Channel.data_version + 1, updated_at=Channel.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_marks(session: Session) -> None:
+    session.info.pop(_INFO_KEY, None)
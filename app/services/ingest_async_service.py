@@ -0,0 +1,340 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import Channel, Thread
+from app.services.ingest_service import (
+    ProgressFn,
+    _ThreadRepliesFetch,
+    _add_replies_page,
+    _apply_replies_batch,
+    _empty_replies_result,
+    _finish_history,
+    _fold_replies_into_thread,
+    _history_oldest,
+    _history_page_rows,
+    _missing_user_ids,
+    _prepare_history_oldest,
+    _replies_progress,
+    _select_threads_to_poll,
+    _start_replies_fetch,
+    _summarize_replies_batch,
+)
+from app.services.ingest_writer import IngestWriter
+from app.services.user_service import (
+    _directory_lock,
+    directory_sync_due,
+    record_directory_sync,
+    record_directory_sync_failure,
+    user_cache_row,
+)
+from app.slack_client import AsyncSlackClient, SlackCallError
+
+log = logging.getLogger(__name__)
+
+# asyncio versions of the ingest service. Slack round-trips are awaited and may
+# overlap; DB work stays on the calling Session and only runs between awaits,
+# so a Session is never used by two coroutines at the same time.
+
+
+@contextlib.asynccontextmanager
+async def _holding_directory_lock():
+    """
+    Hold user_service's process-wide directory lock, which the sync path and
+    every other ingest run's event loop share. It is a threading.Lock, so wait
+    for it by polling instead of blocking this loop.
+    """
+    while not _directory_lock.acquire(blocking=False):
+        await asyncio.sleep(0.05)
+    try:
+        yield
+    finally:
+        _directory_lock.release()
+
+
+async def async_ingest_channel_history_roots(
+    db: Session,
+    slack: AsyncSlackClient,
+    channel: Channel,
+    *,
+    backfill_days: int = 14,
+    progress: ProgressFn | None = None,
+) -> dict:
+    _prepare_history_oldest(db, channel, backfill_days)
+
+    oldest = _history_oldest(channel)
+    cursor: str | None = None
+
+    fetched = 0
+    pages = 0
+    normal_candidates = 0
+    root_count = 0
+    max_ts_epoch = channel.last_ts_epoch or 0.0
+    max_ts_str = channel.last_ts or "0"
+    user_ids: set[str] = set()
+    writer = IngestWriter(db)
+
+    while True:
+        try:
+            msgs, next_cursor = await slack.conversations_history_page(
+                channel_id=channel.channel_id,
+                oldest=oldest,
+                cursor=cursor,
+                limit=200,
+                inclusive=True,
+            )
+        except SlackCallError as e:
+            if e.error_code != "not_in_channel":
+                raise
+            await slack.join_channel(channel.channel_id)
+            msgs, next_cursor = await slack.conversations_history_page(
+                channel_id=channel.channel_id,
+                oldest=oldest,
+                cursor=cursor,
+                limit=200,
+                inclusive=True,
+            )
+
+        fetched += len(msgs)
+
+        page = _history_page_rows(channel.channel_id, msgs)
+        normal_candidates += len(page.message_rows)
+        root_count += len(page.thread_rows)
+        user_ids |= page.user_ids
+        if page.max_ts_epoch > max_ts_epoch:
+            max_ts_epoch = page.max_ts_epoch
+            max_ts_str = page.max_ts_str
+
+        writer.add_messages(page.message_rows)
+        writer.add_thread_roots(page.thread_rows)
+        pages += 1
+        if progress:
+            progress(
+                "history_page",
+                {"pages": pages, "fetched": fetched, "rows": normal_candidates, "roots": root_count},
+            )
+
+        if not next_cursor:
+            break
+        cursor = next_cursor
+
+    if user_ids:
+        await _async_ensure_users_cached(writer, slack, user_ids)
+    writer.flush()
+    if progress:
+        progress("history_done", {"pages": pages, "fetched": fetched, "write": writer.stats()})
+
+    _finish_history(db, channel, max_ts_epoch, max_ts_str)
+
+    return {
+        "channel_id": channel.channel_id,
+        "fetched": fetched,
+        "saved_candidates": normal_candidates,
+        "roots": root_count,
+        "max_ts_epoch": max_ts_epoch,
+        "new_last_ts": channel.last_ts,
+        "write": writer.stats(),
+    }
+
+
+async def _async_ensure_users_cached(
+    writer: IngestWriter, slack: AsyncSlackClient, user_ids: set[str]
+) -> None:
+    to_fetch = _missing_user_ids(writer.db, user_ids)
+    if not to_fetch:
+        return
+
+    if len(to_fetch) >= settings.user_directory_sync_threshold:
+        # Same guard as user_service.maybe_sync_user_directory: callers wait for
+        # the sync in flight, then see it is not due. Rows are queued on the
+        # caller's writer; its session is never committed or rolled back here.
+        rows: list[dict] | None = None
+        async with _holding_directory_lock():
+            if directory_sync_due():
+                try:
+                    rows = await async_fetch_user_directory(slack)
+                except Exception as e:
+                    record_directory_sync_failure()
+                    log.warning("users.list directory sync failed: %s", e)
+                else:
+                    record_directory_sync(rows)
+        if rows:
+            writer.add_users(rows)
+        to_fetch = _missing_user_ids(writer.db, set(to_fetch))
+
+    sem = asyncio.Semaphore(max(1, settings.thread_poll_concurrency))
+
+    async def _one(uid: str) -> dict | None:
+        async with sem:
+            try:
+                return await slack.get_user_info(uid)
+            except Exception:
+                return None
+
+    rows: list[dict] = []
+    for user_obj in await asyncio.gather(*(_one(uid) for uid in to_fetch)):
+        row = user_cache_row(user_obj) if user_obj else None
+        if row:
+            rows.append(row)
+    writer.add_users(rows)
+
+
+async def async_fetch_user_directory(slack: AsyncSlackClient) -> list[dict]:
+    """Async counterpart of user_service.fetch_user_directory."""
+    cursor: str | None = None
+    rows: list[dict] = []
+
+    while True:
+        members, next_cursor = await slack.users_list_page(cursor=cursor, limit=200)
+        rows.extend(r for r in (user_cache_row(m) for m in members) if r)
+        if not next_cursor:
+            break
+        cursor = next_cursor
+    return rows
+
+
+async def _async_fetch_thread_replies(
+    slack: AsyncSlackClient, *, channel_id: str, thread: Thread
+) -> _ThreadRepliesFetch:
+    fetch, oldest = _start_replies_fetch(thread)
+    cursor: str | None = None
+
+    while True:
+        try:
+            msgs, next_cursor = await slack.conversations_replies_page(
+                channel_id=channel_id,
+                thread_ts=thread.thread_ts,
+                oldest=oldest,
+                cursor=cursor,
+                limit=200,
+                inclusive=True,
+            )
+        except SlackCallError as e:
+            if e.error_code != "not_in_channel":
+                raise
+            await slack.join_channel(channel_id)
+            msgs, next_cursor = await slack.conversations_replies_page(
+                channel_id=channel_id,
+                thread_ts=thread.thread_ts,
+                oldest=oldest,
+                cursor=cursor,
+                limit=200,
+                inclusive=True,
+            )
+
+        _add_replies_page(
+            fetch, channel_id=channel_id, thread_ts_epoch=thread.thread_ts_epoch, msgs=msgs
+        )
+
+        if not next_cursor:
+            break
+        cursor = next_cursor
+
+    return fetch
+
+
+async def async_ingest_single_thread_replies(
+    db: Session, slack: AsyncSlackClient, *, channel_id: str, thread: Thread
+) -> dict:
+    fetch = await _async_fetch_thread_replies(slack, channel_id=channel_id, thread=thread)
+
+    writer = IngestWriter(db)
+    writer.add_messages(fetch.message_rows)
+    result = _fold_replies_into_thread(thread, fetch)
+    if fetch.user_ids:
+        await _async_ensure_users_cached(writer, slack, fetch.user_ids)
+    writer.flush()
+
+    return result
+
+
+async def async_ingest_channel_thread_replies(
+    db: Session,
+    slack: AsyncSlackClient,
+    channel: Channel,
+    *,
+    concurrency: int | None = None,
+    progress: ProgressFn | None = None,
+) -> dict:
+    threads, changed_count = _select_threads_to_poll(db, channel)
+    if not threads:
+        result = _empty_replies_result(db, channel)
+        if progress:
+            progress("replies_done", result)
+        return result
+
+    sem = asyncio.Semaphore(max(1, concurrency or settings.thread_poll_concurrency))
+    tick = _replies_progress(progress, len(threads))
+
+    async def _poll(th: Thread) -> _ThreadRepliesFetch | None:
+        async with sem:
+            fetch = None
+            try:
+                fetch = await _async_fetch_thread_replies(
+                    slack, channel_id=channel.channel_id, thread=th
+                )
+                return fetch
+            except SlackCallError as e:
+                log.warning(
+                    "replies poll failed channel=%s thread_ts=%s: %s",
+                    channel.channel_id,
+                    th.thread_ts,
+                    e,
+                )
+                return None
+            except Exception:
+                log.exception(
+                    "replies poll crashed channel=%s thread_ts=%s", channel.channel_id, th.thread_ts
+                )
+                return None
+            finally:
+                tick(fetch)
+
+    fetches = await asyncio.gather(*(_poll(th) for th in threads))
+
+    polled = [(th, f) for th, f in zip(threads, fetches) if f is not None]
+    writer = IngestWriter(db)
+    results = _apply_replies_batch(writer, polled)
+
+    user_ids: set[str] = set()
+    for _, fetch in polled:
+        user_ids |= fetch.user_ids
+    if user_ids:
+        await _async_ensure_users_cached(writer, slack, user_ids)
+
+    result = _summarize_replies_batch(channel, writer, len(threads), changed_count, results)
+    if progress:
+        progress("replies_done", result)
+    return result
+
+
+async def async_ingest_channel(
+    db: Session,
+    slack: AsyncSlackClient,
+    *,
+    channel: Channel,
+    backfill_days: int = 14,
+    mode: str = "full",
+    progress: ProgressFn | None = None,
+) -> dict:
+    """
+    Async counterpart of ingest_service.ingest_channel.
+    mode: "full" (history + replies) or "threads_only" (replies polling only).
+    """
+    result = {}
+    if mode not in {"full", "threads_only"}:
+        mode = "full"
+
+    if mode == "full":
+        result["history"] = await async_ingest_channel_history_roots(
+            db, slack, channel, backfill_days=backfill_days, progress=progress
+        )
+    result["replies"] = await async_ingest_channel_thread_replies(
+        db, slack, channel, progress=progress
+    )
+    return result
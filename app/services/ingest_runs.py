@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+from app.config import settings
+from app.db import get_session_factory
+from app.models import Channel
+from app.services.ingest_async_service import async_ingest_channel
+from app.slack_client import AsyncSlackClient
+
+# In-process registry of background ingest runs started from the API. Runs live
+# in the web process, so progress is only visible from the process that started
+# them (run uvicorn with a single worker, or pin clients to it).
+
+_MAX_RUNS = 200
+_MAX_EVENTS_PER_RUN = 2000
+
+
+@dataclass
+class IngestRun:
+    run_id: str
+    channel_id: str
+    mode: str
+    backfill_days: int
+    status: str = "running"  # running -> ok | error
+    started_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    finished_at: datetime | None = None
+    progress: dict = field(default_factory=dict)
+    result: dict | None = None
+    error: str | None = None
+    events: list[dict] = field(default_factory=list)
+    seq: int = 0
+    _started_monotonic: float = field(default_factory=time.monotonic)
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    @property
+    def done(self) -> bool:
+        return self.status != "running"
+
+    def emit(self, event: str, data: dict) -> None:
+        """ProgressFn for the ingest service; safe to call from worker threads."""
+        with self._lock:
+            self.seq += 1
+            elapsed = time.monotonic() - self._started_monotonic
+            self.progress[event] = data
+            self.events.append(
+                {"seq": self.seq, "event": event, "data": data, "elapsed_s": round(elapsed, 3)}
+            )
+            if len(self.events) > _MAX_EVENTS_PER_RUN:
+                del self.events[: len(self.events) - _MAX_EVENTS_PER_RUN]
+
+    def events_after(self, seq: int) -> list[dict]:
+        with self._lock:
+            return [e for e in self.events if e["seq"] > seq]
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "run_id": self.run_id,
+                "channel_id": self.channel_id,
+                "mode": self.mode,
+                "status": self.status,
+                "started_at": self.started_at.isoformat(),
+                "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+                "elapsed_s": round(time.monotonic() - self._started_monotonic, 3),
+                "progress": dict(self.progress),
+                "result": self.result,
+                "error": self.error,
+                "last_seq": self.seq,
+            }
+
+    def _finish(self, status: str, *, result: dict | None = None, error: str | None = None):
+        with self._lock:
+            self.status = status
+            self.result = result
+            self.error = error
+            self.finished_at = datetime.now(timezone.utc)
+
+
+_registry_lock = threading.Lock()
+_runs: OrderedDict[str, IngestRun] = OrderedDict()
+_active_by_channel: dict[str, str] = {}
+_executor: ThreadPoolExecutor | None = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=max(1, settings.ingest_workers), thread_name_prefix="ingest-run"
+        )
+    return _executor
+
+
+def get_run(run_id: str) -> IngestRun | None:
+    with _registry_lock:
+        return _runs.get(run_id)
+
+
+def active_run_for_channel(channel_id: str) -> IngestRun | None:
+    with _registry_lock:
+        run = _runs.get(_active_by_channel.get(channel_id, ""))
+        return run if run and not run.done else None
+
+
+def start_ingest_run(
+    slack: AsyncSlackClient, channel_id: str, *, backfill_days: int = 14, mode: str = "full"
+) -> tuple[IngestRun, bool]:
+    """
+    Dispatch async_ingest_channel to the background executor. A channel that
+    already has a run in flight returns that run. Returns (run, created).
+    """
+    with _registry_lock:
+        active_id = _active_by_channel.get(channel_id)
+        if active_id and active_id in _runs and not _runs[active_id].done:
+            return _runs[active_id], False
+
+        run = IngestRun(
+            run_id=uuid.uuid4().hex,
+            channel_id=channel_id,
+            mode=mode,
+            backfill_days=backfill_days,
+        )
+        _runs[run.run_id] = run
+        _active_by_channel[channel_id] = run.run_id
+        while len(_runs) > _MAX_RUNS:
+            oldest_id, oldest = next(iter(_runs.items()))
+            if not oldest.done:
+                break
+            del _runs[oldest_id]
+
+    _get_executor().submit(_execute, slack, run)
+    return run, True
+
+
+def _execute(slack: AsyncSlackClient, run: IngestRun) -> None:
+    # Each run gets its own event loop on the executor thread, so replies polls
+    # fan out concurrently without ever running on the web server's loop.
+    SessionLocal = get_session_factory()
+    try:
+        with SessionLocal() as db:
+            ch = db.get(Channel, run.channel_id)
+            if not ch:
+                raise RuntimeError("Channel not found")
+            try:
+                res = asyncio.run(
+                    async_ingest_channel(
+                        db,
+                        slack,
+                        channel=ch,
+                        backfill_days=run.backfill_days,
+                        mode=run.mode,
+                        progress=run.emit,
+                    )
+                )
+            except Exception as e:
+                db.rollback()
+                ch = db.get(Channel, run.channel_id)
+                if ch:
+                    ch.ingest_status = "error"
+                    ch.ingest_error_message = str(e)
+                    ch.ingest_finished_at = datetime.now(timezone.utc)
+                    db.commit()
+                raise
+
+            ch.ingest_status = "ok"
+            ch.ingest_finished_at = datetime.now(timezone.utc)
+            ch.ingest_last_result_json = res
+            ch.last_ingested_at = datetime.now(timezone.utc)
+            db.commit()
+        run._finish("ok", result=res)
+    except Exception as e:
+        run._finish("error", error=str(e))
@@ -1,16 +1,27 @@
 from __future__ import annotations
 
+import logging
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from zoneinfo import ZoneInfo
 
 from sqlalchemy import func
-from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
 from app.config import settings
-from app.models import Channel, Message, Thread, UserCache
+from app.models import Channel, Thread
 from app.slack_client import SlackCallError, SlackClient
-from app.services.user_service import upsert_user_cache
+from app.services.ingest_writer import IngestWriter
+from app.services import name_service
+from app.services.user_service import maybe_sync_user_directory, user_cache_row
+
+log = logging.getLogger(__name__)
+
+# Optional progress(event, data) callback for live ingest progress (see ingest_runs).
+ProgressFn = Callable[[str, dict], None]
 
 def _now_kst() -> datetime:
     return datetime.now(tz=ZoneInfo(settings.tz))
@@ -32,9 +43,95 @@ def _is_normal_message(msg: dict) -> bool:
     return True
 
 
-def ingest_channel_history_roots(
-    db: Session, slack: SlackClient, channel: Channel, *, backfill_days: int = 14
-) -> dict:
+@dataclass
+class _HistoryPage:
+    message_rows: list[dict] = field(default_factory=list)
+    thread_rows: list[dict] = field(default_factory=list)
+    user_ids: set[str] = field(default_factory=set)
+    max_ts_epoch: float = 0.0
+    max_ts_str: str = "0"
+
+
+@dataclass
+class _ThreadRepliesFetch:
+    """Everything read from conversations.replies for one thread, before any DB write."""
+
+    thread_ts: str
+    fetched: int = 0
+    message_rows: list[dict] = field(default_factory=list)
+    user_ids: set[str] = field(default_factory=set)
+    max_ts_epoch: float = 0.0
+    max_ts_str: str = "0"
+    root_reply_count: int | None = None
+    root_text: str | None = None
+    root_latest_reply_epoch: float | None = None
+
+
+def _latest_reply_epoch(msg: dict) -> float | None:
+    latest_reply = msg.get("latest_reply")
+    if not latest_reply:
+        return None
+    try:
+        return _ts_to_epoch(latest_reply)
+    except (TypeError, ValueError):
+        return None
+
+
+def _history_page_rows(channel_id: str, msgs: list[dict]) -> _HistoryPage:
+    page = _HistoryPage()
+
+    for m in msgs:
+        if not _is_normal_message(m):
+            continue
+
+        ts = m.get("ts")
+        if not ts:
+            continue
+
+        ts_epoch = _ts_to_epoch(ts)
+        if ts_epoch > page.max_ts_epoch:
+            page.max_ts_epoch = ts_epoch
+            page.max_ts_str = ts
+
+        thread_ts = m.get("thread_ts") or ts
+        thread_ts_epoch = _ts_to_epoch(thread_ts)
+
+        page.message_rows.append(
+            {
+                "channel_id": channel_id,
+                "ts": ts,
+                "ts_epoch": ts_epoch,
+                "thread_ts": thread_ts,
+                "thread_ts_epoch": thread_ts_epoch,
+                "user_id": m.get("user"),
+                "text": m.get("text"),
+                "raw_json": m,
+            }
+        )
+        if m.get("user"):
+            page.user_ids.add(str(m.get("user")))
+
+        is_root = thread_ts == ts
+        if is_root:
+            page.thread_rows.append(
+                {
+                    "channel_id": channel_id,
+                    "thread_ts": ts,
+                    "thread_ts_epoch": ts_epoch,
+                    "root_ts": ts,
+                    "root_text": m.get("text"),
+                    "reply_count": int(m.get("reply_count") or 0),
+                    "last_reply_ts": ts,
+                    "last_reply_ts_epoch": ts_epoch,
+                    "latest_reply_ts_epoch": _latest_reply_epoch(m),
+                    "needs_summary": True,
+                }
+            )
+
+    return page
+
+
+def _prepare_history_oldest(db: Session, channel: Channel, backfill_days: int) -> None:
     if not channel.last_ts_epoch or not channel.last_ts:
         dt = _now_kst() - timedelta(days=backfill_days)
         ep = _epoch(dt)
@@ -43,15 +140,59 @@ def ingest_channel_history_roots(
         db.commit()
         db.refresh(channel)
 
-    oldest = channel.last_ts
+
+def _finish_history(db: Session, channel: Channel, max_ts_epoch: float, max_ts_str: str) -> None:
+    if max_ts_epoch > (channel.last_ts_epoch or 0.0):
+        channel.last_ts_epoch = max_ts_epoch
+        channel.last_ts = max_ts_str
+
+    channel.last_ingested_at = datetime.now(timezone.utc)
+
+    db.commit()
+    db.refresh(channel)
+
+
+def _lookback_cutoff_epoch() -> float | None:
+    """
+    Start of the HISTORY_LOOKBACK_DAYS window whose roots every history run
+    re-reads (None when disabled). Slack only reports a reply to an old thread
+    through the root's latest_reply/reply_count, so re-reading recent roots is
+    what makes such threads show up as changed.
+    """
+    if settings.history_lookback_days <= 0:
+        return None
+    return _epoch(_now_kst() - timedelta(days=settings.history_lookback_days))
+
+
+def _history_oldest(channel: Channel) -> str:
+    """`oldest` for conversations.history: last_ts, pulled back to the lookback window."""
+    cutoff = _lookback_cutoff_epoch()
+    if cutoff is not None and cutoff < (channel.last_ts_epoch or 0.0):
+        return f"{cutoff:.6f}"
+    return channel.last_ts
+
+
+def ingest_channel_history_roots(
+    db: Session,
+    slack: SlackClient,
+    channel: Channel,
+    *,
+    backfill_days: int = 14,
+    progress: ProgressFn | None = None,
+) -> dict:
+    _prepare_history_oldest(db, channel, backfill_days)
+
+    oldest = _history_oldest(channel)
     cursor: str | None = None
 
     fetched = 0
+    pages = 0
     normal_candidates = 0
     root_count = 0
     max_ts_epoch = channel.last_ts_epoch or 0.0
     max_ts_str = channel.last_ts or "0"
     user_ids: set[str] = set()
+    writer = IngestWriter(db)
 
     while True:
         try:
@@ -80,107 +221,34 @@ def ingest_channel_history_roots(
 
         fetched += len(msgs)
 
-        message_rows: list[dict] = []
-        thread_rows: list[dict] = []
-
-        for m in msgs:
-            if not _is_normal_message(m):
-                continue
-
-            ts = m.get("ts")
-            if not ts:
-                continue
-
-            ts_epoch = _ts_to_epoch(ts)
-            if ts_epoch > max_ts_epoch:
-                max_ts_epoch = ts_epoch
-                max_ts_str = ts
-
-            thread_ts = m.get("thread_ts") or ts
-            thread_ts_epoch = _ts_to_epoch(thread_ts)
-
-            message_rows.append(
-                {
-                    "channel_id": channel.channel_id,
-                    "ts": ts,
-                    "ts_epoch": ts_epoch,
-                    "thread_ts": thread_ts,
-                    "thread_ts_epoch": thread_ts_epoch,
-                    "user_id": m.get("user"),
-                    "text": m.get("text"),
-                    "raw_json": m,
-                }
-            )
-            normal_candidates += 1
-            if m.get("user"):
-                user_ids.add(str(m.get("user")))
-
-            is_root = thread_ts == ts
-            if is_root:
-                root_count += 1
-                thread_rows.append(
-                    {
-                        "channel_id": channel.channel_id,
-                        "thread_ts": ts,
-                        "thread_ts_epoch": ts_epoch,
-                        "root_ts": ts,
-                        "root_text": m.get("text"),
-                        "reply_count": int(m.get("reply_count") or 0),
-                        "last_reply_ts": ts,
-                        "last_reply_ts_epoch": ts_epoch,
-                        "needs_summary": True,
-                    }
-                )
-
-        if message_rows:
-            stmt = pg_insert(Message.__table__).values(message_rows)
-            stmt = stmt.on_conflict_do_nothing(index_elements=["channel_id", "ts"])
-            db.execute(stmt)
-
-        if thread_rows:
-            t = Thread.__table__
-            stmt = pg_insert(t).values(thread_rows)
-            excluded = stmt.excluded
-
-            update_where = (
-                (t.c.root_text.is_(None) & excluded.root_text.is_not(None))
-                | (t.c.reply_count != excluded.reply_count)
+        page = _history_page_rows(channel.channel_id, msgs)
+        normal_candidates += len(page.message_rows)
+        root_count += len(page.thread_rows)
+        user_ids |= page.user_ids
+        if page.max_ts_epoch > max_ts_epoch:
+            max_ts_epoch = page.max_ts_epoch
+            max_ts_str = page.max_ts_str
+
+        writer.add_messages(page.message_rows)
+        writer.add_thread_roots(page.thread_rows)
+        pages += 1
+        if progress:
+            progress(
+                "history_page",
+                {"pages": pages, "fetched": fetched, "rows": normal_candidates, "roots": root_count},
             )
 
-            stmt = stmt.on_conflict_do_update(
-                index_elements=["channel_id", "thread_ts"],
-                set_={
-                    "reply_count": excluded.reply_count,
-                    "root_text": func.coalesce(t.c.root_text, excluded.root_text),
-                    "last_reply_ts": func.coalesce(
-                        t.c.last_reply_ts, excluded.last_reply_ts
-                    ),
-                    "last_reply_ts_epoch": func.coalesce(
-                        t.c.last_reply_ts_epoch, excluded.last_reply_ts_epoch
-                    ),
-                    "updated_at": func.now(),
-                },
-                where=update_where,
-            )
-            db.execute(stmt)
-
-        db.commit()
-
         if not next_cursor:
             break
         cursor = next_cursor
 
     if user_ids:
-        _ensure_users_cached(db, slack, user_ids)
-
-    if max_ts_epoch > (channel.last_ts_epoch or 0.0):
-        channel.last_ts_epoch = max_ts_epoch
-        channel.last_ts = max_ts_str
-
-    channel.last_ingested_at = datetime.now(timezone.utc)
+        _ensure_users_cached(writer, slack, user_ids)
+    writer.flush()
+    if progress:
+        progress("history_done", {"pages": pages, "fetched": fetched, "write": writer.stats()})
 
-    db.commit()
-    db.refresh(channel)
+    _finish_history(db, channel, max_ts_epoch, max_ts_str)
 
     return {
         "channel_id": channel.channel_id,
@@ -189,125 +257,249 @@ def ingest_channel_history_roots(
         "roots": root_count,
         "max_ts_epoch": max_ts_epoch,
         "new_last_ts": channel.last_ts,
+        "write": writer.stats(),
     }
 
 
-def _ensure_users_cached(db: Session, slack: SlackClient, user_ids: set[str]) -> None:
+def _missing_user_ids(db: Session, user_ids: set[str]) -> list[str]:
     if not user_ids:
-        return
+        return []
+
+    known_ids = set(name_service.resolve(db, user_ids))
+
+    return [uid for uid in user_ids if uid and uid not in known_ids]
 
-    existing_rows = db.query(UserCache.user_id).filter(UserCache.user_id.in_(user_ids)).all()
-    known_ids = {row[0] for row in existing_rows if row and row[0]}
 
-    to_fetch = [uid for uid in user_ids if uid and uid not in known_ids]
+def _ensure_users_cached(writer: IngestWriter, slack: SlackClient, user_ids: set[str]) -> None:
+    to_fetch = _missing_user_ids(writer.db, user_ids)
     if not to_fetch:
         return
 
+    # Many unknown users (e.g. a fresh workspace): one users.list pass beats
+    # a users.info call per user. Whatever is still missing afterwards
+    # (external/deleted users) falls through to users.info.
+    if len(to_fetch) >= settings.user_directory_sync_threshold:
+        try:
+            maybe_sync_user_directory(writer, slack)
+        except Exception as e:
+            log.warning("users.list directory sync failed: %s", e)
+        # Also picks up names another caller's sync primed while we waited.
+        to_fetch = _missing_user_ids(writer.db, set(to_fetch))
+
+    rows: list[dict] = []
     for uid in to_fetch:
         try:
-            user_obj = slack.get_user_info(uid)
-            upsert_user_cache(db, user_obj)
-            db.commit()
+            row = user_cache_row(slack.get_user_info(uid))
         except SlackCallError:
-            db.rollback()
             continue
         except Exception:
-            db.rollback()
             continue
+        if row:
+            rows.append(row)
+    writer.add_users(rows)
 
 
-def ingest_channel_thread_replies(db: Session, slack: SlackClient, channel: Channel) -> dict:
-    q = (
-        db.query(Thread)
-        .filter(Thread.channel_id == channel.channel_id)
-        .order_by(Thread.updated_at.desc())
-    )
+def _select_threads_to_poll(db: Session, channel: Channel) -> tuple[list[Thread], int]:
+    """
+    Pick threads for replies polling, up to MAX_THREADS_POLL_PER_RUN:
+    first every thread whose Slack `latest_reply` advanced past what was last
+    polled, then a rotation of up to THREAD_SWEEP_PER_RUN least-recently-polled
+    threads among those history does not re-read (roots older than the
+    HISTORY_LOOKBACK_DAYS window), whose changes only polling can find.
+    Returns (threads, changed_count).
+    """
+    max_poll = settings.max_threads_poll_per_run
+    base = db.query(Thread).filter(Thread.channel_id == channel.channel_id)
 
-    total_threads = q.count()
-    if total_threads == 0:
-        channel.last_ingested_at = datetime.now(timezone.utc)
-        db.commit()
-        return {
-            "channel_id": channel.channel_id,
-            "threads_polled": 0,
-            "threads_with_new_replies": 0,
-            "fetched": 0,
-            "saved_candidates": 0,
-            "max_threads_poll_per_run": settings.max_threads_poll_per_run,
-        }
-
-    max_poll = min(settings.max_threads_poll_per_run, total_threads)
-    start_offset = 0
-    if total_threads > max_poll:
-        anchor = channel.last_ingested_at or datetime.now(timezone.utc)
-        start_offset = int(anchor.timestamp()) % total_threads
-
-    threads: list[Thread] = []
-    if start_offset < total_threads:
-        first = q.offset(start_offset).limit(max_poll).all()
-        threads.extend(first)
-        if len(threads) < max_poll:
-            second = q.offset(0).limit(max_poll - len(threads)).all()
-            threads.extend(second)
-    else:
-        threads = q.limit(max_poll).all()
-
-    # Deduplicate in case of wrap-around overlap
-    seen_ts: set[str] = set()
-    unique_threads: list[Thread] = []
-    for th in threads:
-        if th.thread_ts in seen_ts:
-            continue
-        seen_ts.add(th.thread_ts)
-        unique_threads.append(th)
+    polled_mark = func.coalesce(
+        Thread.polled_reply_ts_epoch, Thread.last_reply_ts_epoch, Thread.thread_ts_epoch
+    )
+    changed = (
+        base.filter(Thread.latest_reply_ts_epoch.is_not(None))
+        .filter(Thread.latest_reply_ts_epoch > polled_mark)
+        .order_by(Thread.latest_reply_ts_epoch.desc())
+        .limit(max_poll)
+        .all()
+    )
 
-    threads = unique_threads[:max_poll]
+    sweep_n = min(settings.thread_sweep_per_run, max_poll - len(changed))
+    sweep: list[Thread] = []
+    if sweep_n > 0:
+        q = base
+        cutoff = _lookback_cutoff_epoch()
+        if cutoff is not None:
+            q = q.filter(Thread.thread_ts_epoch < cutoff)
+        if changed:
+            q = q.filter(Thread.id.notin_([th.id for th in changed]))
+        sweep = (
+            q.order_by(
+                Thread.last_polled_at.is_(None).desc(),
+                Thread.last_polled_at.asc(),
+                Thread.updated_at.desc(),
+            )
+            .limit(sweep_n)
+            .all()
+        )
 
-    total_threads = len(threads)
-    threads_with_new = 0
-    fetched_total = 0
-    normal_candidates_total = 0
+    return changed + sweep, len(changed)
 
-    for th in threads:
-        try:
-            r = ingest_single_thread_replies(db, slack, channel_id=channel.channel_id, thread=th)
-            fetched_total += r["fetched"]
-            normal_candidates_total += r["saved_candidates"]
-            if r["new_reply"]:
-                threads_with_new += 1
-        except Exception:
-            db.rollback()
-            continue
 
+def _empty_replies_result(db: Session, channel: Channel) -> dict:
     channel.last_ingested_at = datetime.now(timezone.utc)
     db.commit()
-
     return {
         "channel_id": channel.channel_id,
-        "threads_polled": total_threads,
-        "threads_with_new_replies": threads_with_new,
-        "fetched": fetched_total,
-        "saved_candidates": normal_candidates_total,
+        "threads_polled": 0,
+        "threads_changed": 0,
+        "threads_with_new_replies": 0,
+        "fetched": 0,
+        "saved_candidates": 0,
         "max_threads_poll_per_run": settings.max_threads_poll_per_run,
     }
 
 
-def ingest_single_thread_replies(
-    db: Session, slack: SlackClient, *, channel_id: str, thread: Thread
+def ingest_channel_thread_replies(
+    db: Session,
+    slack: SlackClient,
+    channel: Channel,
+    *,
+    concurrency: int | None = None,
+    progress: ProgressFn | None = None,
 ) -> dict:
-    oldest = thread.last_reply_ts or thread.thread_ts
-    old_last_epoch = thread.last_reply_ts_epoch or thread.thread_ts_epoch
+    threads, changed_count = _select_threads_to_poll(db, channel)
+    if not threads:
+        result = _empty_replies_result(db, channel)
+        if progress:
+            progress("replies_done", result)
+        return result
+
+    workers = max(1, min(concurrency or settings.thread_poll_concurrency, len(threads)))
+    tick = _replies_progress(progress, len(threads))
+
+    # Slack fetches fan out over a bounded pool; only this thread touches `db`.
+    def _poll(th: Thread) -> _ThreadRepliesFetch | None:
+        fetch = None
+        try:
+            fetch = _fetch_thread_replies(slack, channel_id=channel.channel_id, thread=th)
+            return fetch
+        except SlackCallError as e:
+            log.warning(
+                "replies poll failed channel=%s thread_ts=%s: %s",
+                channel.channel_id,
+                th.thread_ts,
+                e,
+            )
+            return None
+        except Exception:
+            log.exception(
+                "replies poll crashed channel=%s thread_ts=%s", channel.channel_id, th.thread_ts
+            )
+            return None
+        finally:
+            tick(fetch)
 
-    cursor: str | None = None
-    fetched = 0
-    saved_candidates = 0
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="replies") as pool:
+        fetches = list(pool.map(_poll, threads))
 
-    max_ts_epoch = old_last_epoch
-    max_ts_str = thread.last_reply_ts or thread.thread_ts
+    polled = [(th, f) for th, f in zip(threads, fetches) if f is not None]
+    writer = IngestWriter(db)
+    results = _apply_replies_batch(writer, polled)
 
-    root_reply_count: int | None = None
-    root_text: str | None = None
     user_ids: set[str] = set()
+    for _, fetch in polled:
+        user_ids |= fetch.user_ids
+    if user_ids:
+        _ensure_users_cached(writer, slack, user_ids)
+
+    result = _summarize_replies_batch(channel, writer, len(threads), changed_count, results)
+    if progress:
+        progress("replies_done", result)
+    return result
+
+
+def _replies_progress(
+    progress: ProgressFn | None, total: int
+) -> Callable[[_ThreadRepliesFetch | None], None]:
+    """Thread-safe per-thread `replies_thread` progress ticker (no-op without a callback)."""
+    lock = threading.Lock()
+    state = {"threads_polled": 0, "threads_total": total, "fetched": 0, "failed": 0}
+
+    def tick(fetch: _ThreadRepliesFetch | None) -> None:
+        if not progress:
+            return
+        with lock:
+            state["threads_polled"] += 1
+            if fetch is None:
+                state["failed"] += 1
+            else:
+                state["fetched"] += fetch.fetched
+            snapshot = dict(state)
+        progress("replies_thread", snapshot)
+
+    return tick
+
+
+def _start_replies_fetch(thread: Thread) -> tuple[_ThreadRepliesFetch, str]:
+    """Initial fetch state and the `oldest` bound for a thread's replies poll."""
+    oldest = thread.last_reply_ts or thread.thread_ts
+    fetch = _ThreadRepliesFetch(
+        thread_ts=thread.thread_ts,
+        max_ts_epoch=thread.last_reply_ts_epoch or thread.thread_ts_epoch,
+        max_ts_str=thread.last_reply_ts or thread.thread_ts,
+    )
+    return fetch, oldest
+
+
+def _add_replies_page(
+    fetch: _ThreadRepliesFetch, *, channel_id: str, thread_ts_epoch: float, msgs: list[dict]
+) -> None:
+    fetch.fetched += len(msgs)
+
+    for m in msgs:
+        if m.get("ts") == fetch.thread_ts:
+            try:
+                fetch.root_reply_count = int(m.get("reply_count") or 0)
+            except Exception:
+                fetch.root_reply_count = 0
+            fetch.root_text = m.get("text") or fetch.root_text
+            fetch.root_latest_reply_epoch = _latest_reply_epoch(m)
+
+        if m.get("type") != "message":
+            continue
+        if m.get("subtype"):
+            continue
+
+        ts = m.get("ts")
+        if not ts:
+            continue
+
+        ts_epoch = float(ts)
+
+        if ts_epoch > fetch.max_ts_epoch:
+            fetch.max_ts_epoch = ts_epoch
+            fetch.max_ts_str = ts
+
+        fetch.message_rows.append(
+            {
+                "channel_id": channel_id,
+                "ts": ts,
+                "ts_epoch": ts_epoch,
+                "thread_ts": fetch.thread_ts,
+                "thread_ts_epoch": thread_ts_epoch,
+                "user_id": m.get("user"),
+                "text": m.get("text"),
+                "raw_json": m,
+            }
+        )
+        if m.get("user"):
+            fetch.user_ids.add(str(m.get("user")))
+
+
+def _fetch_thread_replies(
+    slack: SlackClient, *, channel_id: str, thread: Thread
+) -> _ThreadRepliesFetch:
+    fetch, oldest = _start_replies_fetch(thread)
+    cursor: str | None = None
 
     while True:
         try:
@@ -335,94 +527,112 @@ def ingest_single_thread_replies(
                     raise
             else:
                 raise
-        fetched += len(msgs)
 
-        message_rows: list[dict] = []
-
-        for m in msgs:
-            if m.get("ts") == thread.thread_ts:
-                try:
-                    root_reply_count = int(m.get("reply_count") or 0)
-                except Exception:
-                    root_reply_count = 0
-                root_text = m.get("text") or root_text
-
-            if m.get("type") != "message":
-                continue
-            if m.get("subtype"):
-                continue
-
-            ts = m.get("ts")
-            if not ts:
-                continue
-
-            ts_epoch = float(ts)
-
-            if ts_epoch > max_ts_epoch:
-                max_ts_epoch = ts_epoch
-                max_ts_str = ts
-
-            message_rows.append(
-                {
-                    "channel_id": channel_id,
-                    "ts": ts,
-                    "ts_epoch": ts_epoch,
-                    "thread_ts": thread.thread_ts,
-                    "thread_ts_epoch": thread.thread_ts_epoch,
-                    "user_id": m.get("user"),
-                    "text": m.get("text"),
-                    "raw_json": m,
-                }
-            )
-            saved_candidates += 1
-            if m.get("user"):
-                user_ids.add(str(m.get("user")))
-
-        if message_rows:
-            stmt = pg_insert(Message.__table__).values(message_rows)
-            stmt = stmt.on_conflict_do_nothing(index_elements=["channel_id", "ts"])
-            db.execute(stmt)
-
-        db.commit()
+        _add_replies_page(
+            fetch, channel_id=channel_id, thread_ts_epoch=thread.thread_ts_epoch, msgs=msgs
+        )
 
         if not next_cursor:
             break
         cursor = next_cursor
 
-    new_reply = max_ts_epoch > old_last_epoch
-    changed = False
+    return fetch
 
-    if user_ids:
-        _ensure_users_cached(db, slack, user_ids)
 
-    if root_reply_count is not None and root_reply_count != (thread.reply_count or 0):
-        thread.reply_count = root_reply_count
-        changed = True
+def _fold_replies_into_thread(thread: Thread, fetch: _ThreadRepliesFetch) -> dict:
+    old_last_epoch = thread.last_reply_ts_epoch or thread.thread_ts_epoch
+    new_reply = fetch.max_ts_epoch > old_last_epoch
+
+    # Whatever Slack reported as latest is now accounted for, even if the newest
+    # reply was a filtered subtype, so the thread stops looking "changed".
+    seen_latest = max(
+        thread.latest_reply_ts_epoch or 0.0,
+        fetch.root_latest_reply_epoch or 0.0,
+        fetch.max_ts_epoch,
+    )
+    thread.latest_reply_ts_epoch = seen_latest
+    thread.polled_reply_ts_epoch = seen_latest
+    thread.last_polled_at = datetime.now(timezone.utc)
+    visible_change = new_reply
+
+    if fetch.root_reply_count is not None and fetch.root_reply_count != (thread.reply_count or 0):
+        thread.reply_count = fetch.root_reply_count
+        visible_change = True
 
-    if root_text and not thread.root_text:
-        thread.root_text = root_text
-        changed = True
+    if fetch.root_text and not thread.root_text:
+        thread.root_text = fetch.root_text
+        visible_change = True
 
     if new_reply:
-        thread.last_reply_ts_epoch = max_ts_epoch
-        thread.last_reply_ts = max_ts_str
+        thread.last_reply_ts_epoch = fetch.max_ts_epoch
+        thread.last_reply_ts = fetch.max_ts_str
         thread.needs_summary = True
-        changed = True
 
-    if changed:
-        db.commit()
-    else:
-        db.rollback()
+    if not visible_change:
+        # Poll bookkeeping only: skip updated_at's onupdate so sweeps do not
+        # reorder listings (and keyset cursors) sorted by updated_at.
+        thread.updated_at = Thread.updated_at
 
     return {
         "thread_ts": thread.thread_ts,
-        "fetched": fetched,
-        "saved_candidates": saved_candidates,
+        "fetched": fetch.fetched,
+        "saved_candidates": len(fetch.message_rows),
         "new_reply": new_reply,
         "new_last_reply_ts": thread.last_reply_ts,
     }
 
 
+def _apply_replies_batch(
+    writer: IngestWriter, polled: list[tuple[Thread, _ThreadRepliesFetch]]
+) -> list[dict]:
+    """
+    Queue a whole poll rotation on the writer: reply rows go out as multi-row
+    inserts and the Thread updates ride the writer's next commit.
+    """
+    results = []
+    for th, fetch in polled:
+        writer.add_messages(fetch.message_rows)
+        results.append(_fold_replies_into_thread(th, fetch))
+    return results
+
+
+def _summarize_replies_batch(
+    channel: Channel,
+    writer: IngestWriter,
+    polled_count: int,
+    changed_count: int,
+    results: list[dict],
+) -> dict:
+    channel.last_ingested_at = datetime.now(timezone.utc)
+    writer.flush()
+
+    return {
+        "channel_id": channel.channel_id,
+        "threads_polled": polled_count,
+        "threads_changed": changed_count,
+        "threads_with_new_replies": sum(1 for r in results if r["new_reply"]),
+        "fetched": sum(r["fetched"] for r in results),
+        "saved_candidates": sum(r["saved_candidates"] for r in results),
+        "max_threads_poll_per_run": settings.max_threads_poll_per_run,
+        "write": writer.stats(),
+    }
+
+
+def ingest_single_thread_replies(
+    db: Session, slack: SlackClient, *, channel_id: str, thread: Thread
+) -> dict:
+    fetch = _fetch_thread_replies(slack, channel_id=channel_id, thread=thread)
+
+    writer = IngestWriter(db)
+    writer.add_messages(fetch.message_rows)
+    result = _fold_replies_into_thread(thread, fetch)
+    if fetch.user_ids:
+        _ensure_users_cached(writer, slack, fetch.user_ids)
+    writer.flush()
+
+    return result
+
+
 def ingest_channel(
     db: Session,
     slack: SlackClient,
@@ -430,10 +640,12 @@ def ingest_channel(
     channel: Channel,
     backfill_days: int = 14,
     mode: str = "full",
+    progress: ProgressFn | None = None,
 ) -> dict:
     """
     Ingest a single channel (history + replies).
     mode: "full" (history + replies) or "threads_only" (replies polling only).
+    progress: optional callback receiving per-page/per-thread progress events.
     """
     result = {}
     if mode not in {"full", "threads_only"}:
@@ -441,7 +653,7 @@ def ingest_channel(
 
     if mode == "full":
         result["history"] = ingest_channel_history_roots(
-            db, slack, channel, backfill_days=backfill_days
+            db, slack, channel, backfill_days=backfill_days, progress=progress
         )
-    result["replies"] = ingest_channel_thread_replies(db, slack, channel)
+    result["replies"] = ingest_channel_thread_replies(db, slack, channel, progress=progress)
     return result
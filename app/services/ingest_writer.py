@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import time
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db import dialect_insert
+from app.models import Message, Thread, UserCache
+from app.services import name_service
+from app.services.data_version import mark_channels_changed
+from app.services.rollup_service import apply_rollup_deltas, deltas_for_messages
+
+# SQLITE_MAX_VARIABLE_NUMBER since SQLite 3.32; a multi-row VALUES binds one
+# variable per column per row.
+_SQLITE_MAX_VARIABLES = 32766
+
+
+class IngestWriter:
+    """
+    Buffers ingest rows (messages, thread roots, users_cache) and writes them as
+    multi-row INSERT ... ON CONFLICT statements, committing once per flush.
+    Newly inserted messages are folded into the channel_daily_* rollups in the
+    same transaction, and channels whose messages or thread roots changed are
+    marked for a data_version bump (response cache invalidation).
+    ORM changes pending on the same Session (e.g. Thread fields updated by the
+    replies poller) ride along in that commit.
+    """
+
+    def __init__(self, db: Session, *, batch_size: int | None = None) -> None:
+        self.db = db
+        self.batch_size = max(1, batch_size or settings.ingest_write_batch_size)
+
+        self._messages: list[dict] = []
+        # Keyed so a batch never upserts the same row twice (Postgres rejects that).
+        self._thread_roots: dict[tuple[str, str], dict] = {}
+        self._users: dict[str, dict] = {}
+
+        self._sqlite = db.get_bind().dialect.name == "sqlite"
+
+        self.rows_written = 0
+        self.flushes = 0
+        self.write_seconds = 0.0
+
+    def _pending(self) -> int:
+        return len(self._messages) + len(self._thread_roots) + len(self._users)
+
+    def _maybe_flush(self) -> None:
+        if self._pending() >= self.batch_size:
+            self.flush()
+
+    def add_messages(self, rows: list[dict]) -> None:
+        self._messages.extend(rows)
+        self._maybe_flush()
+
+    def add_thread_roots(self, rows: list[dict]) -> None:
+        for r in rows:
+            self._thread_roots[(r["channel_id"], r["thread_ts"])] = r
+        self._maybe_flush()
+
+    def add_users(self, rows: list[dict]) -> None:
+        for r in rows:
+            self._users[r["user_id"]] = r
+        self._maybe_flush()
+
+    def flush(self) -> None:
+        started = time.perf_counter()
+
+        messages, self._messages = self._messages, []
+        thread_roots, self._thread_roots = list(self._thread_roots.values()), {}
+        users, self._users = list(self._users.values()), {}
+
+        inserted: list = []
+        for chunk in self._chunks(messages):
+            inserted.extend(self._insert_messages(chunk))
+        # Only rows that were actually new count toward the daily rollups.
+        if inserted:
+            apply_rollup_deltas(self.db, deltas_for_messages(inserted))
+        mark_channels_changed(self.db, (r[0] for r in inserted))
+        for chunk in self._chunks(thread_roots):
+            mark_channels_changed(self.db, self._upsert_thread_roots(chunk))
+        for chunk in self._chunks(users):
+            self._upsert_users(chunk)
+
+        self.db.commit()
+        if users:
+            name_service.invalidate(r["user_id"] for r in users)
+
+        self.rows_written += len(messages) + len(thread_roots) + len(users)
+        self.flushes += 1
+        self.write_seconds += time.perf_counter() - started
+
+    def _chunks(self, rows: list[dict]):
+        size = self.batch_size
+        if self._sqlite and rows:
+            size = min(size, max(1, _SQLITE_MAX_VARIABLES // len(rows[0])))
+        for i in range(0, len(rows), size):
+            yield rows[i : i + size]
+
+    def stats(self) -> dict:
+        rps = self.rows_written / self.write_seconds if self.write_seconds > 0 else 0.0
+        return {
+            "rows": self.rows_written,
+            "flushes": self.flushes,
+            "seconds": round(self.write_seconds, 3),
+            "rows_per_sec": round(rps, 1),
+        }
+
+    def _insert_messages(self, rows: list[dict]) -> list:
+        if not rows:
+            return []
+        t = Message.__table__
+        stmt = dialect_insert(self.db, t).values(rows)
+        stmt = stmt.on_conflict_do_nothing(index_elements=["channel_id", "ts"]).returning(
+            t.c.channel_id, t.c.ts_epoch, t.c.thread_ts, t.c.user_id
+        )
+        return self.db.execute(stmt).all()
+
+    def _upsert_thread_roots(self, rows: list[dict]) -> set[str]:
+        """Returns the channels whose thread rows were inserted or updated."""
+        if not rows:
+            return set()
+        t = Thread.__table__
+        stmt = dialect_insert(self.db, t).values(rows)
+        excluded = stmt.excluded
+
+        latest_advanced = excluded.latest_reply_ts_epoch.is_not(None) & (
+            t.c.latest_reply_ts_epoch.is_(None)
+            | (t.c.latest_reply_ts_epoch < excluded.latest_reply_ts_epoch)
+        )
+        update_where = (
+            (t.c.root_text.is_(None) & excluded.root_text.is_not(None))
+            | (t.c.reply_count != excluded.reply_count)
+            | latest_advanced
+        )
+
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["channel_id", "thread_ts"],
+            set_={
+                "reply_count": excluded.reply_count,
+                "root_text": func.coalesce(t.c.root_text, excluded.root_text),
+                "last_reply_ts": func.coalesce(t.c.last_reply_ts, excluded.last_reply_ts),
+                "last_reply_ts_epoch": func.coalesce(
+                    t.c.last_reply_ts_epoch, excluded.last_reply_ts_epoch
+                ),
+                "latest_reply_ts_epoch": func.coalesce(
+                    excluded.latest_reply_ts_epoch, t.c.latest_reply_ts_epoch
+                ),
+                "updated_at": func.now(),
+            },
+            where=update_where,
+        ).returning(t.c.channel_id)
+        return set(self.db.execute(stmt).scalars())
+
+    def _upsert_users(self, rows: list[dict]) -> None:
+        if not rows:
+            return
+        stmt = dialect_insert(self.db, UserCache.__table__).values(rows)
+        excluded = stmt.excluded
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id"],
+            set_={
+                "display_name": excluded.display_name,
+                "real_name": excluded.real_name,
+                "updated_at": func.now(),
+            },
+        )
+        self.db.execute(stmt)
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.llm_client import LLMClient
+from app.models import Job, Thread
+from app.services.summary_service import summarize_thread
+from app.services.thread_report_service import ensure_thread_report
+
+JOB_KINDS = ("summarize_thread", "thread_report")
+ACTIVE_STATUSES = ("queued", "running")
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _active_job(db: Session, *, kind: str, channel_id: str, thread_ts: str) -> Job | None:
+    return (
+        db.query(Job)
+        .filter(Job.kind == kind)
+        .filter(Job.channel_id == channel_id)
+        .filter(Job.thread_ts == thread_ts)
+        .filter(Job.status.in_(ACTIVE_STATUSES))
+        .first()
+    )
+
+
+def _merge_into_queued(db: Session, job: Job, params: dict | None) -> None:
+    """
+    Fold a duplicate request's params into a job that has not started yet, so
+    e.g. a force=True refresh is not lost behind a queued force=False one.
+    """
+    if job.status != "queued" or not params:
+        return
+    current = job.params_json or {}
+    merged = {**current, **params}
+    if "force" in current or "force" in params:
+        merged["force"] = bool(current.get("force")) or bool(params.get("force"))
+    if merged != current:
+        # Conditional, so a job a worker claimed meanwhile is left as it runs.
+        db.execute(
+            update(Job)
+            .where(Job.id == job.id)
+            .where(Job.status == "queued")
+            .values(params_json=merged)
+        )
+        db.commit()
+
+
+def enqueue_job(
+    db: Session, *, kind: str, channel_id: str, thread_ts: str, params: dict | None = None
+) -> tuple[Job, bool]:
+    """
+    Queue `kind` for a thread. If the same target already has a queued/running
+    job, that job is returned instead (a queued one takes on the new params,
+    with `force` OR-ed). Returns (job, created).
+    """
+    if kind not in JOB_KINDS:
+        raise ValueError(f"Unknown job kind: {kind}")
+
+    existing = _active_job(db, kind=kind, channel_id=channel_id, thread_ts=thread_ts)
+    if existing:
+        _merge_into_queued(db, existing, params)
+        return existing, False
+
+    job = Job(
+        kind=kind,
+        channel_id=channel_id,
+        thread_ts=thread_ts,
+        params_json=params or {},
+        status="queued",
+        attempts=0,
+        run_after=_now(),
+    )
+    db.add(job)
+    try:
+        db.commit()
+    except IntegrityError:
+        # Lost the race against a concurrent enqueue (uq_jobs_active_target).
+        db.rollback()
+        existing = _active_job(db, kind=kind, channel_id=channel_id, thread_ts=thread_ts)
+        if existing:
+            _merge_into_queued(db, existing, params)
+            return existing, False
+        raise
+    return job, True
+
+
+def claim_next_job(db: Session, worker_id: str) -> Job | None:
+    """
+    Atomically move the oldest runnable job to `running` for this worker.
+    Postgres uses SELECT ... FOR UPDATE SKIP LOCKED so concurrent workers never
+    block on each other; SQLite (single writer) uses a conditional UPDATE.
+    """
+    now = _now()
+    runnable = (
+        select(Job.id)
+        .where(Job.status == "queued")
+        .where(Job.run_after <= now)
+        .order_by(Job.run_after.asc(), Job.id.asc())
+        .limit(1)
+    )
+
+    if db.get_bind().dialect.name == "postgresql":
+        job_id = db.execute(runnable.with_for_update(skip_locked=True)).scalar()
+        if job_id is None:
+            db.rollback()
+            return None
+        db.execute(
+            update(Job)
+            .where(Job.id == job_id)
+            .values(
+                status="running", locked_by=worker_id, locked_at=now, attempts=Job.attempts + 1
+            )
+        )
+        db.commit()
+        return db.get(Job, job_id)
+
+    for _ in range(5):
+        job_id = db.execute(runnable).scalar()
+        if job_id is None:
+            db.rollback()
+            return None
+        res = db.execute(
+            update(Job)
+            .where(Job.id == job_id)
+            .where(Job.status == "queued")
+            .values(
+                status="running", locked_by=worker_id, locked_at=now, attempts=Job.attempts + 1
+            )
+        )
+        db.commit()
+        if res.rowcount == 1:
+            return db.get(Job, job_id)
+    return None
+
+
+def complete_job(db: Session, job: Job, result: dict) -> None:
+    job.status = "done"
+    job.result_json = result
+    job.error_message = None
+    job.finished_at = _now()
+    db.commit()
+
+
+def fail_job(db: Session, job: Job, error: str) -> None:
+    """Requeue with exponential backoff, or mark `error` after JOB_MAX_ATTEMPTS."""
+    job.error_message = error[:2000]
+    if (job.attempts or 0) < settings.job_max_attempts:
+        job.status = "queued"
+        job.run_after = _now() + timedelta(seconds=min(300, 5 * 2 ** (job.attempts or 0)))
+    else:
+        job.status = "error"
+        job.finished_at = _now()
+    job.locked_by = None
+    db.commit()
+
+
+def requeue_stale_jobs(db: Session) -> int:
+    """Return `running` jobs whose worker died (lock older than JOB_LOCK_TIMEOUT_SECONDS)."""
+    cutoff = _now() - timedelta(seconds=settings.job_lock_timeout_seconds)
+    res = db.execute(
+        update(Job)
+        .where(Job.status == "running")
+        .where(Job.locked_at < cutoff)
+        .values(status="queued", locked_by=None, run_after=_now())
+    )
+    db.commit()
+    return res.rowcount or 0
+
+
+def run_job(db: Session, llm: LLMClient, job: Job) -> dict:
+    thread = (
+        db.query(Thread)
+        .filter(Thread.channel_id == job.channel_id)
+        .filter(Thread.thread_ts == job.thread_ts)
+        .first()
+    )
+    if not thread:
+        return {"thread_ts": job.thread_ts, "skipped": "thread_not_found"}
+
+    params = job.params_json or {}
+    if job.kind == "summarize_thread":
+        return summarize_thread(db, llm, channel_id=job.channel_id, thread=thread)
+    if job.kind == "thread_report":
+        return ensure_thread_report(
+            db, llm, channel_id=job.channel_id, thread=thread, force=bool(params.get("force"))
+        )
+    raise ValueError(f"Unknown job kind: {job.kind}")
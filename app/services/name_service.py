@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import UserCache
+
+# Cached for IDs users_cache does not know (e.g. mentions of external users),
+# so they do not trigger a query on every request either.
+_UNKNOWN = ""
+
+_INFO_KEY = "invalidate_user_ids"
+
+
+class _NameCache:
+    """Thread-safe TTL + LRU map of user_id -> display name."""
+
+    def __init__(self, *, ttl_seconds: float, max_size: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max(1, max_size)
+        self._data: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, user_ids: Iterable[str]) -> tuple[dict[str, str], set[str]]:
+        """Returns (cached entries, ids that were not cached or had expired)."""
+        now = time.monotonic()
+        found: dict[str, str] = {}
+        missing: set[str] = set()
+        with self._lock:
+            for uid in user_ids:
+                hit = self._data.get(uid)
+                if hit is None or hit[0] < now:
+                    if hit is not None:
+                        del self._data[uid]
+                    missing.add(uid)
+                    continue
+                self._data.move_to_end(uid)
+                found[uid] = hit[1]
+        return found, missing
+
+    def put_many(self, names: dict[str, str]) -> None:
+        expires = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            for uid, name in names.items():
+                self._data[uid] = (expires, name)
+                self._data.move_to_end(uid)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def discard(self, user_ids: Iterable[str]) -> None:
+        with self._lock:
+            for uid in user_ids:
+                self._data.pop(uid, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+_cache = _NameCache(
+    ttl_seconds=settings.user_name_cache_ttl_seconds,
+    max_size=settings.user_name_cache_max_size,
+)
+
+
+def _display_name(row: UserCache) -> str:
+    return (row.display_name or row.real_name or row.user_id or "").strip()
+
+
+def resolve(db: Session, user_ids: Iterable[str]) -> dict[str, str]:
+    """
+    Bulk user_id -> display name. Served from the process-wide cache; only IDs
+    not cached yet go to users_cache, in a single IN (...) query. IDs without a
+    name are left out of the result.
+    """
+    ids = {uid for uid in user_ids if uid}
+    if not ids:
+        return {}
+
+    cached, missing = _cache.get_many(ids)
+    if missing:
+        rows = db.query(UserCache).filter(UserCache.user_id.in_(list(missing))).all()
+        loaded = {uid: _UNKNOWN for uid in missing}
+        for r in rows:
+            loaded[r.user_id] = _display_name(r)
+        _cache.put_many(loaded)
+        cached.update(loaded)
+
+    return {uid: name for uid, name in cached.items() if name}
+
+
+def prime(names: dict[str, str]) -> None:
+    """Seed the cache with names that were just written (e.g. a users.list sync)."""
+    _cache.put_many({uid: name for uid, name in names.items() if uid})
+
+
+def invalidate(user_ids: Iterable[str] | None = None) -> None:
+    """Drop cached names after users_cache writes; None clears everything."""
+    if user_ids is None:
+        _cache.clear()
+    else:
+        _cache.discard(user_ids)
+
+
+def invalidate_on_commit(db: Session, user_ids: Iterable[str]) -> None:
+    """
+    Drop these names once the current transaction commits. Invalidating before
+    the commit would let a concurrent resolve() re-cache the old row (or an
+    _UNKNOWN miss) for the full TTL; a rollback forgets the ids.
+    """
+    ids = {uid for uid in user_ids if uid}
+    if ids:
+        db.info.setdefault(_INFO_KEY, set()).update(ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session) -> None:
+    ids = session.info.pop(_INFO_KEY, None)
+    if ids:
+        _cache.discard(ids)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_pending(session: Session) -> None:
+    session.info.pop(_INFO_KEY, None)
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Iterable
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db import dialect_insert
+from app.models import (
+    Channel,
+    ChannelDailyStat,
+    ChannelDailyThreadStat,
+    ChannelDailyUserStat,
+    Message,
+)
+
+
+def local_day(ts_epoch: float) -> date:
+    return datetime.fromtimestamp(ts_epoch, tz=ZoneInfo(settings.tz)).date()
+
+
+@dataclass
+class RollupDeltas:
+    daily: Counter = field(default_factory=Counter)  # (channel_id, day)
+    users: Counter = field(default_factory=Counter)  # (channel_id, day, user_id)
+    threads: Counter = field(default_factory=Counter)  # (channel_id, day, thread_ts)
+
+    def add(self, channel_id: str, ts_epoch: float, thread_ts: str | None, user_id: str | None):
+        day = local_day(ts_epoch)
+        self.daily[(channel_id, day)] += 1
+        if user_id:
+            self.users[(channel_id, day, user_id)] += 1
+        if thread_ts:
+            self.threads[(channel_id, day, thread_ts)] += 1
+
+    def __bool__(self) -> bool:
+        return bool(self.daily)
+
+
+def deltas_for_messages(rows: Iterable) -> RollupDeltas:
+    """rows: (channel_id, ts_epoch, thread_ts, user_id) of newly stored messages."""
+    deltas = RollupDeltas()
+    for channel_id, ts_epoch, thread_ts, user_id in rows:
+        deltas.add(channel_id, ts_epoch, thread_ts, user_id)
+    return deltas
+
+
+def _increment(db: Session, table, key_cols: list[str], counter: Counter) -> None:
+    if not counter:
+        return
+    rows = [
+        {**dict(zip(key_cols, key)), "message_count": n} for key, n in counter.items()
+    ]
+    batch = max(1, settings.ingest_write_batch_size)
+    for i in range(0, len(rows), batch):
+        stmt = dialect_insert(db, table).values(rows[i : i + batch])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=key_cols,
+            set_={"message_count": table.c.message_count + stmt.excluded.message_count},
+        )
+        db.execute(stmt)
+
+
+def apply_rollup_deltas(db: Session, deltas: RollupDeltas) -> None:
+    """
+    Add message counts to the channel_daily_* rollups. Runs inside the caller's
+    transaction so the counts commit together with the messages they describe.
+    """
+    _increment(db, ChannelDailyStat.__table__, ["channel_id", "day"], deltas.daily)
+    _increment(
+        db, ChannelDailyUserStat.__table__, ["channel_id", "day", "user_id"], deltas.users
+    )
+    _increment(
+        db, ChannelDailyThreadStat.__table__, ["channel_id", "day", "thread_ts"], deltas.threads
+    )
+
+
+def rebuild_channel_rollups(db: Session, channel_id: str, *, chunk_size: int = 20000) -> dict:
+    """
+    Recompute a channel's rollups from messages and mark it ready. Meant for
+    the one-off backfill after upgrading (or a repair); run it while ingest for
+    the channel is idle, since concurrent inserts would be counted twice.
+    """
+    for model in (ChannelDailyStat, ChannelDailyUserStat, ChannelDailyThreadStat):
+        db.execute(delete(model).where(model.channel_id == channel_id))
+
+    deltas = RollupDeltas()
+    scanned = 0
+    rows = (
+        db.query(Message.channel_id, Message.ts_epoch, Message.thread_ts, Message.user_id)
+        .filter(Message.channel_id == channel_id)
+        .yield_per(chunk_size)
+    )
+    for channel, ts_epoch, thread_ts, user_id in rows:
+        deltas.add(channel, ts_epoch, thread_ts, user_id)
+        scanned += 1
+
+    apply_rollup_deltas(db, deltas)
+    ch = db.get(Channel, channel_id)
+    if ch:
+        ch.stats_rollup_ready = True
+    db.commit()
+
+    return {
+        "channel_id": channel_id,
+        "messages": scanned,
+        "days": len(deltas.daily),
+        "user_days": len(deltas.users),
+        "thread_days": len(deltas.threads),
+    }
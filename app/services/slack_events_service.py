@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from sqlalchemy.orm import Session
+
+from app.models import Channel, Message, Thread
+from app.services.ingest_service import _history_page_rows, _ts_to_epoch
+from app.services.ingest_writer import IngestWriter
+
+
+def ingest_message_event(db: Session, event: dict) -> dict:
+    """
+    Write one Events API `message` event through the same message/thread upsert
+    path as polling. Replies advance the thread and flag it for summarization.
+    channels.last_ts is left alone so the history poll still reconciles anything
+    the event stream missed.
+    """
+    channel_id = event.get("channel")
+    if not channel_id:
+        return {"ignored": "no_channel"}
+
+    ch = db.get(Channel, channel_id)
+    if not ch or not ch.is_active:
+        return {"ignored": "inactive_channel", "channel_id": channel_id}
+
+    page = _history_page_rows(channel_id, [event])
+    if not page.message_rows:
+        # Subtypes (edits, deletes, joins, bot messages) are left to polling.
+        return {"ignored": "subtype", "subtype": event.get("subtype")}
+
+    row = page.message_rows[0]
+    is_new = (
+        db.query(Message.id)
+        .filter(Message.channel_id == channel_id)
+        .filter(Message.ts == row["ts"])
+        .first()
+        is None
+    )
+
+    writer = IngestWriter(db)
+    writer.add_messages(page.message_rows)
+    if row["thread_ts"] != row["ts"]:
+        _apply_reply(db, channel_id, row, is_new)
+    else:
+        _apply_root(db, writer, channel_id, page.thread_rows)
+    writer.flush()
+
+    return {
+        "channel_id": channel_id,
+        "ts": row["ts"],
+        "thread_ts": row["thread_ts"],
+        "new": is_new,
+    }
+
+
+def _apply_root(db: Session, writer: IngestWriter, channel_id: str, rows: list[dict]) -> None:
+    thread = (
+        db.query(Thread)
+        .filter(Thread.channel_id == channel_id)
+        .filter(Thread.thread_ts == rows[0]["thread_ts"])
+        .first()
+    )
+    if thread is None:
+        writer.add_thread_roots(rows)
+        return
+    # Pushed roots carry no reply_count; a redelivery (or a root arriving after
+    # its replies) must not reset the counters the replies already advanced.
+    if thread.root_text is None:
+        thread.root_text = rows[0]["root_text"]
+
+
+def _apply_reply(db: Session, channel_id: str, row: dict, is_new: bool) -> None:
+    ts_epoch = row["ts_epoch"]
+    thread = (
+        db.query(Thread)
+        .filter(Thread.channel_id == channel_id)
+        .filter(Thread.thread_ts == row["thread_ts"])
+        .first()
+    )
+    if thread is None:
+        # Root not ingested yet; history/replies polling fills in root_text later.
+        thread = Thread(
+            channel_id=channel_id,
+            thread_ts=row["thread_ts"],
+            thread_ts_epoch=_ts_to_epoch(row["thread_ts"]),
+            root_ts=row["thread_ts"],
+            reply_count=0,
+        )
+        db.add(thread)
+
+    # If replies were fully polled up to Slack's latest_reply before this event,
+    # the pushed reply keeps the thread in sync and the next poll can skip it.
+    in_sync = (thread.polled_reply_ts_epoch or 0.0) >= (thread.latest_reply_ts_epoch or 0.0)
+
+    if ts_epoch > (thread.latest_reply_ts_epoch or 0.0):
+        thread.latest_reply_ts_epoch = ts_epoch
+        if in_sync and thread.polled_reply_ts_epoch is not None:
+            thread.polled_reply_ts_epoch = ts_epoch
+
+    if ts_epoch > (thread.last_reply_ts_epoch or thread.thread_ts_epoch or 0.0):
+        thread.last_reply_ts_epoch = ts_epoch
+        thread.last_reply_ts = row["ts"]
+
+    if is_new:
+        thread.reply_count = (thread.reply_count or 0) + 1
+        thread.needs_summary = True
@@ -1,14 +1,23 @@
 from __future__ import annotations
 
+from collections import Counter
 from dataclasses import dataclass
 from datetime import date, datetime, time, timedelta, timezone
 from zoneinfo import ZoneInfo
 
-from sqlalchemy import desc, func
+from sqlalchemy import Text, cast, func, literal, null, select, union, union_all
 from sqlalchemy.orm import Session
 
 from app.config import settings
-from app.models import Channel, Message, Thread, UserCache
+from app.models import (
+    Channel,
+    ChannelDailyStat,
+    ChannelDailyThreadStat,
+    ChannelDailyUserStat,
+    Message,
+    Thread,
+)
+from app.services import name_service
 
 
 @dataclass
@@ -17,6 +26,8 @@ class KstRange:
     end_date_kst_exclusive: date
     start_epoch_utc: float
     end_epoch_utc: float
+    today_kst: date
+    today_start_epoch_utc: float
 
 
 def _kst_range(days: int) -> KstRange:
@@ -27,6 +38,7 @@ def _kst_range(days: int) -> KstRange:
 
     start_dt_kst = datetime.combine(start_date, time.min, tzinfo=kst)
     end_dt_kst = datetime.combine(end_date_excl, time.min, tzinfo=kst)
+    today_dt_kst = datetime.combine(now_kst.date(), time.min, tzinfo=kst)
 
     start_epoch = start_dt_kst.astimezone(timezone.utc).timestamp()
     end_epoch = end_dt_kst.astimezone(timezone.utc).timestamp()
@@ -36,81 +48,146 @@ def _kst_range(days: int) -> KstRange:
         end_date_kst_exclusive=end_date_excl,
         start_epoch_utc=start_epoch,
         end_epoch_utc=end_epoch,
+        today_kst=now_kst.date(),
+        today_start_epoch_utc=today_dt_kst.astimezone(timezone.utc).timestamp(),
     )
 
 
-def get_channel_stats(db: Session, channel_id: str, *, days: int, top_n: int) -> dict:
-    ch = db.get(Channel, channel_id)
-    if not ch:
-        raise KeyError("Channel not found")
+def _local_day(db: Session, ts_epoch):
+    """Epoch column as a local (settings.tz) calendar date, per dialect."""
+    if db.get_bind().dialect.name == "sqlite":
+        # No tz database in SQLite: shift by the zone's current UTC offset
+        # (exact for fixed-offset zones such as Asia/Seoul).
+        offset = datetime.now(ZoneInfo(settings.tz)).utcoffset() or timedelta(0)
+        modifier = f"{int(offset.total_seconds()):+d} seconds"
+        return func.date(ts_epoch, "unixepoch", modifier)
+    return func.date(func.timezone(settings.tz, func.to_timestamp(ts_epoch)))
+
+
+def _stats_statement(
+    db: Session,
+    channel_id: str,
+    *,
+    rollup_from: date,
+    rollup_to: date,
+    raw_from_epoch: float,
+    raw_to_epoch: float,
+    top_n: int,
+):
+    """
+    One statement for the whole stats payload. Raw messages in
+    [raw_from_epoch, raw_to_epoch) are scanned once into a materialized CTE
+    over a narrow projection; closed days in [rollup_from, rollup_to) come from
+    the channel_daily_* rollups. Rows are (kind, key, n):
+    day/<iso day>/messages, user/<user_id>/messages, threads/-/distinct
+    active threads, top_thread/<thread_ts>/reply_count.
+    """
+    raw = (
+        select(Message.ts_epoch, Message.thread_ts, Message.user_id)
+        .where(Message.channel_id == channel_id)
+        .where(Message.ts_epoch >= raw_from_epoch)
+        .where(Message.ts_epoch < raw_to_epoch)
+        .cte("raw")
+        .prefix_with("MATERIALIZED")
+    )
 
-    r = _kst_range(days)
+    def rollup_window(model):
+        return (
+            (model.channel_id == channel_id)
+            & (model.day >= rollup_from)
+            & (model.day < rollup_to)
+        )
 
-    total_messages = (
-        db.query(func.count())
-        .select_from(Message)
-        .filter(Message.channel_id == channel_id)
-        .filter(Message.ts_epoch >= r.start_epoch_utc)
-        .filter(Message.ts_epoch < r.end_epoch_utc)
-        .scalar()
-        or 0
+    active = (
+        union(
+            select(raw.c.thread_ts).where(raw.c.thread_ts.is_not(None)),
+            select(ChannelDailyThreadStat.thread_ts).where(rollup_window(ChannelDailyThreadStat)),
+        )
+        .cte("active")
+        .prefix_with("MATERIALIZED")
     )
 
-    total_threads = (
-        db.query(func.count(func.distinct(Message.thread_ts)))
-        .filter(Message.channel_id == channel_id)
-        .filter(Message.ts_epoch >= r.start_epoch_utc)
-        .filter(Message.ts_epoch < r.end_epoch_utc)
-        .scalar()
-        or 0
+    raw_day = _local_day(db, raw.c.ts_epoch)
+    top_threads = (
+        select(Thread.thread_ts, Thread.reply_count)
+        .join(active, Thread.thread_ts == active.c.thread_ts)
+        .where(Thread.channel_id == channel_id)
+        .order_by(Thread.reply_count.desc(), Thread.updated_at.desc())
+        .limit(top_n)
+        .subquery()
     )
 
-    unique_users = (
-        db.query(func.count(func.distinct(Message.user_id)))
-        .filter(Message.channel_id == channel_id)
-        .filter(Message.ts_epoch >= r.start_epoch_utc)
-        .filter(Message.ts_epoch < r.end_epoch_utc)
-        .filter(Message.user_id.is_not(None))
-        .scalar()
-        or 0
+    def row(kind: str, key, n):
+        return (literal(kind).label("kind"), cast(key, Text).label("key"), n.label("n"))
+
+    return union_all(
+        select(*row("day", raw_day, func.count())).select_from(raw).group_by(raw_day),
+        select(
+            *row("day", ChannelDailyStat.day, ChannelDailyStat.message_count)
+        ).where(rollup_window(ChannelDailyStat)),
+        select(*row("user", raw.c.user_id, func.count()))
+        .where(raw.c.user_id.is_not(None))
+        .group_by(raw.c.user_id),
+        select(
+            *row(
+                "user",
+                ChannelDailyUserStat.user_id,
+                func.sum(ChannelDailyUserStat.message_count),
+            )
+        )
+        .where(rollup_window(ChannelDailyUserStat))
+        .group_by(ChannelDailyUserStat.user_id),
+        select(*row("threads", null(), func.count())).select_from(active),
+        select(*row("top_thread", top_threads.c.thread_ts, top_threads.c.reply_count)),
     )
 
-    kst_day = func.date(
-        func.timezone(settings.tz, func.to_timestamp(Message.ts_epoch))
-    ).label("kst_day")
-
-    daily_rows = (
-        db.query(kst_day, func.count().label("cnt"))
-        .filter(Message.channel_id == channel_id)
-        .filter(Message.ts_epoch >= r.start_epoch_utc)
-        .filter(Message.ts_epoch < r.end_epoch_utc)
-        .group_by(kst_day)
-        .all()
+
+def get_channel_stats(db: Session, channel_id: str, *, days: int, top_n: int) -> dict:
+    ch = db.get(Channel, channel_id)
+    if not ch:
+        raise KeyError("Channel not found")
+
+    r = _kst_range(days)
+
+    # Closed days come from the channel_daily_* rollups; raw messages are only
+    # scanned for today's partial bucket (or the whole range until the
+    # channel's rollups have been rebuilt).
+    if ch.stats_rollup_ready:
+        rollup_to, raw_from_epoch = r.today_kst, r.today_start_epoch_utc
+    else:
+        rollup_to, raw_from_epoch = r.start_date_kst, r.start_epoch_utc
+
+    stmt = _stats_statement(
+        db,
+        channel_id,
+        rollup_from=r.start_date_kst,
+        rollup_to=rollup_to,
+        raw_from_epoch=raw_from_epoch,
+        raw_to_epoch=r.end_epoch_utc,
+        top_n=top_n,
     )
 
-    daily_map = {row[0].isoformat(): int(row[1]) for row in daily_rows if row[0] is not None}
+    daily: Counter = Counter()
+    users: Counter = Counter()
+    total_threads = 0
+    top_thread_ts: list[str] = []
+    for kind, key, n in db.execute(stmt):
+        if kind == "day":
+            daily[key] += int(n)
+        elif kind == "user":
+            users[key] += int(n)
+        elif kind == "threads":
+            total_threads = int(n)
+        else:
+            top_thread_ts.append(key)
+
     day_list = [(r.start_date_kst + timedelta(days=i)).isoformat() for i in range(days)]
     daily_messages = [
-        {"date_kst": d, "message_count": daily_map.get(d, 0)} for d in day_list
+        {"date_kst": d, "message_count": daily.get(d, 0)} for d in day_list
     ]
 
-    user_counts = (
-        db.query(Message.user_id, func.count().label("cnt"))
-        .filter(Message.channel_id == channel_id)
-        .filter(Message.ts_epoch >= r.start_epoch_utc)
-        .filter(Message.ts_epoch < r.end_epoch_utc)
-        .filter(Message.user_id.is_not(None))
-        .group_by(Message.user_id)
-        .order_by(desc("cnt"))
-        .limit(top_n)
-        .all()
-    )
-    top_user_ids = [u for (u, _) in user_counts if u]
-    user_name_map = {}
-    if top_user_ids:
-        rows = db.query(UserCache).filter(UserCache.user_id.in_(top_user_ids)).all()
-        for u in rows:
-            user_name_map[u.user_id] = (u.display_name or u.real_name or u.user_id)
+    user_counts = sorted(users.items(), key=lambda kv: (-kv[1], kv[0]))[:top_n]
+    user_name_map = name_service.resolve(db, [u for (u, _) in user_counts if u])
 
     top_users = []
     for uid, cnt in user_counts:
@@ -122,24 +199,16 @@ def get_channel_stats(db: Session, channel_id: str, *, days: int, top_n: int) ->
             }
         )
 
-    active_threads_subq = (
-        db.query(Message.thread_ts.label("thread_ts"))
-        .filter(Message.channel_id == channel_id)
-        .filter(Message.ts_epoch >= r.start_epoch_utc)
-        .filter(Message.ts_epoch < r.end_epoch_utc)
-        .filter(Message.thread_ts.is_not(None))
-        .distinct()
-        .subquery()
-    )
-
-    top_threads_rows = (
-        db.query(Thread)
-        .join(active_threads_subq, (Thread.thread_ts == active_threads_subq.c.thread_ts))
-        .filter(Thread.channel_id == channel_id)
-        .order_by(Thread.reply_count.desc(), Thread.updated_at.desc())
-        .limit(top_n)
-        .all()
-    )
+    # UNION ALL does not keep the branch's ORDER BY; re-sort the top_n rows.
+    top_threads_rows = []
+    if top_thread_ts:
+        top_threads_rows = (
+            db.query(Thread)
+            .filter(Thread.channel_id == channel_id)
+            .filter(Thread.thread_ts.in_(top_thread_ts))
+            .order_by(Thread.reply_count.desc(), Thread.updated_at.desc())
+            .all()
+        )
 
     top_threads = []
     for t in top_threads_rows:
@@ -159,9 +228,9 @@ def get_channel_stats(db: Session, channel_id: str, *, days: int, top_n: int) ->
         "top_n": top_n,
         "start_date_kst": r.start_date_kst.isoformat(),
         "end_date_kst_exclusive": r.end_date_kst_exclusive.isoformat(),
-        "total_messages": int(total_messages),
-        "total_threads": int(total_threads),
-        "unique_users": int(unique_users),
+        "total_messages": int(sum(daily.values())),
+        "total_threads": total_threads,
+        "unique_users": len(users),
         "daily_messages": daily_messages,
         "top_threads": top_threads,
         "top_users": top_users,
@@ -1,18 +1,27 @@
 from __future__ import annotations
 
+import hashlib
 import json
+import logging
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from typing import Literal
 from zoneinfo import ZoneInfo
 
 from pydantic import BaseModel, Field
 from sqlalchemy import desc
-from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
 from app.config import settings
+from app.db import dialect_insert, get_session_factory
 from app.llm_client import LLMClient
-from app.models import Channel, Message, Thread, ThreadSummary, UserCache
+from app.models import Channel, Message, Thread, ThreadSummary
+from app.services import name_service
+from app.services.data_version import mark_channels_changed
+from app.token_budget import estimate_json_tokens, estimate_tokens, pack_items
+
+log = logging.getLogger(__name__)
 
 
 class ActionItem(BaseModel):
@@ -42,18 +51,6 @@ def _epoch_to_kst_str(epoch: float) -> str:
     )
 
 
-def _build_user_map(db: Session, user_ids: set[str]) -> dict[str, str]:
-    if not user_ids:
-        return {}
-    rows = db.query(UserCache).filter(UserCache.user_id.in_(list(user_ids))).all()
-    out: dict[str, str] = {}
-    for r in rows:
-        name = (r.display_name or r.real_name or r.user_id or "").strip()
-        if name:
-            out[r.user_id] = name
-    return out
-
-
 def _collect_user_ids(msgs: list[Message]) -> set[str]:
     ids: set[str] = set()
     for m in msgs:
@@ -79,21 +76,85 @@ def _slice_messages_for_summary(msgs: list[Message], thread_ts: str) -> list[Mes
     return tail
 
 
-def summarize_thread(db: Session, llm: LLMClient, *, channel_id: str, thread: Thread) -> dict:
+def input_hash(*, model: str, instructions: str, payload) -> str:
+    """Stable SHA-256 over everything that determines an LLM output."""
+    blob = json.dumps(
+        {"model": model, "instructions": instructions, "payload": payload},
+        ensure_ascii=False,
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def _mark_summarized(
+    db: Session, thread: Thread, source_latest_ts: str, source_latest_ts_epoch: float
+) -> None:
+    thread.needs_summary = False
+    thread.last_summarized_ts = source_latest_ts
+    thread.last_summarized_ts_epoch = source_latest_ts_epoch
+    thread.updated_at = datetime.now(timezone.utc)
+    mark_channels_changed(db, [thread.channel_id])
+
+    db.commit()
+
+
+def _summary_instructions() -> str:
+    return f"""
+너는 슬랙 스레드를 {settings.summary_language}로 요약하는 업무 비서다.
+- 출력은 반드시 주어진 스키마를 만족해야 한다(Structured Outputs).
+- 비어있는 항목은 빈 배열([])을 사용한다.
+- one_line은 짧고 명확하게(가능하면 80자 이내).
+- action_items는 가능하면 task 중심으로, owner_hint/due_hint는 추정 가능할 때만 채운다.
+""".strip()
+
+
+def _incremental_summary_instructions() -> str:
+    return f"""
+너는 슬랙 스레드 요약을 {settings.summary_language}로 갱신하는 업무 비서다.
+- previous_summary는 이전까지의 스레드 요약이고, new_messages는 그 이후 새로 달린 메시지다.
+- previous_summary에 new_messages를 반영한 스레드 전체의 최신 요약을 출력한다.
+- 해결된 blockers/questions는 제거하고, 완료된 action_items는 빼거나 갱신한다.
+- 출력은 반드시 주어진 스키마를 만족해야 한다(Structured Outputs).
+- 비어있는 항목은 빈 배열([])을 사용한다.
+- one_line은 짧고 명확하게(가능하면 80자 이내).
+""".strip()
+
+
+@dataclass
+class ThreadContext:
+    """All messages of one thread (ts_epoch ascending) and their author names."""
+
+    messages: list[Message]
+    user_map: dict[str, str]
+
+
+def load_thread_context(db: Session, *, channel_id: str, thread_ts: str) -> ThreadContext:
+    """Load a thread's messages and names once so summary and report prompts can share them."""
     msgs = (
         db.query(Message)
         .filter(Message.channel_id == channel_id)
-        .filter(Message.thread_ts == thread.thread_ts)
+        .filter(Message.thread_ts == thread_ts)
         .order_by(Message.ts_epoch.asc())
         .all()
     )
-    if not msgs:
-        return {"thread_ts": thread.thread_ts, "skipped": "no_messages"}
+    return ThreadContext(messages=msgs, user_map=name_service.resolve(db, _collect_user_ids(msgs)))
+
+
+def summary_is_stale(summary: ThreadSummary | None, thread: Thread) -> bool:
+    latest_epoch = thread.last_reply_ts_epoch or thread.thread_ts_epoch
+    return (
+        summary is None
+        or float(summary.source_latest_ts_epoch or 0) < float(latest_epoch or 0)
+        or thread.needs_summary is True
+    )
 
-    msgs = _slice_messages_for_summary(msgs, thread.thread_ts)
 
-    user_ids = _collect_user_ids(msgs)
-    user_map = _build_user_map(db, user_ids)
+def _message_items(
+    db: Session, msgs: list[Message], user_map: dict[str, str] | None = None
+) -> list[dict]:
+    if user_map is None:
+        user_map = name_service.resolve(db, _collect_user_ids(msgs))
 
     items = []
     for m in msgs:
@@ -107,32 +168,260 @@ def summarize_thread(db: Session, llm: LLMClient, *, channel_id: str, thread: Th
                 "text": (m.text or "")[:2000],
             }
         )
+    return items
 
-    source_latest_ts = thread.last_reply_ts or thread.thread_ts
-    source_latest_ts_epoch = thread.last_reply_ts_epoch or thread.thread_ts_epoch
 
-    instructions = f"""
-너는 슬랙 스레드를 {settings.summary_language}로 요약하는 업무 비서다.
-- 출력은 반드시 주어진 스키마를 만족해야 한다(Structured Outputs).
-- 비어있는 항목은 빈 배열([])을 사용한다.
-- one_line은 짧고 명확하게(가능하면 80자 이내).
-- action_items는 가능하면 task 중심으로, owner_hint/due_hint는 추정 가능할 때만 채운다.
-"""
+def _can_summarize_incrementally(existing: ThreadSummary | None, thread: Thread) -> bool:
+    every = settings.summary_full_refresh_every
+    return (
+        every > 0
+        and existing is not None
+        and bool(existing.summary_json)
+        and existing.model == settings.openai_model
+        and (existing.incremental_count or 0) < every
+        and thread.last_summarized_ts_epoch is not None
+    )
+
+
+def _upsert_summary(
+    db: Session,
+    *,
+    channel_id: str,
+    thread: Thread,
+    summary_dict: dict,
+    content_hash: str,
+    source_latest_ts: str,
+    source_latest_ts_epoch: float,
+    incremental_count: int,
+) -> None:
+    stmt = dialect_insert(db, ThreadSummary.__table__).values(
+        channel_id=channel_id,
+        thread_ts=thread.thread_ts,
+        summary_json=summary_dict,
+        model=settings.openai_model,
+        source_latest_ts=source_latest_ts,
+        source_latest_ts_epoch=source_latest_ts_epoch,
+        input_hash=content_hash,
+        incremental_count=incremental_count,
+        updated_at=datetime.now(timezone.utc),
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["channel_id", "thread_ts"],
+        set_=dict(
+            summary_json=summary_dict,
+            model=settings.openai_model,
+            source_latest_ts=source_latest_ts,
+            source_latest_ts_epoch=source_latest_ts_epoch,
+            input_hash=content_hash,
+            incremental_count=incremental_count,
+            updated_at=datetime.now(timezone.utc),
+        ),
+    )
+    db.execute(stmt)
+
+    # Denormalized copy for thread listings (threads.one_line).
+    one_line = summary_dict.get("one_line")
+    thread.one_line = str(one_line) if one_line else None
+    _mark_summarized(db, thread, source_latest_ts, source_latest_ts_epoch)
+
+
+def _summarize_incremental(
+    db: Session,
+    llm: LLMClient,
+    *,
+    channel_id: str,
+    thread: Thread,
+    existing: ThreadSummary,
+    new_msgs: list[Message],
+    user_map: dict[str, str] | None,
+    source_latest_ts: str,
+    source_latest_ts_epoch: float,
+) -> dict | None:
+    """
+    Fold new_msgs into the previous summary. Returns None, without calling the
+    LLM, when the delta cannot be sent whole (too many messages, or over
+    SUMMARY_INPUT_TOKEN_BUDGET next to the previous summary): the summary is
+    then stamped up to the latest reply, so any message left out would never
+    be summarized.
+    """
+    if len(new_msgs) > settings.max_messages_per_thread_for_summary:
+        return None
+    items = _message_items(db, new_msgs, user_map)
+    root_text = (thread.root_text or "")[:2000]
+
+    budget = settings.summary_input_token_budget
+    if budget > 0:
+        # The prior summary and root text are always sent; new messages get the rest.
+        fixed = estimate_json_tokens(existing.summary_json) + estimate_tokens(root_text)
+        packed, _ = pack_items(items, budget_tokens=max(budget - fixed, 1), keep_first=False)
+        if len(packed) < len(items):
+            return None
+
+    instructions = _incremental_summary_instructions()
+    payload = {
+        "channel_id": channel_id,
+        "thread_ts": thread.thread_ts,
+        "reply_count": int(thread.reply_count or 0),
+        "source_latest_ts": source_latest_ts,
+        "root_text": root_text,
+        "previous_summary": existing.summary_json,
+        "new_messages": items,
+    }
+    user_input = json.dumps(payload, ensure_ascii=False)
+
+    parsed: ThreadSummaryOut = llm.parse_structured(
+        model=settings.openai_model,
+        instructions=instructions,
+        user_input=user_input,
+        text_format=ThreadSummaryOut,
+        max_output_tokens=1200,
+        temperature=0.2,
+    )
+    summary_dict = parsed.model_dump() if hasattr(parsed, "model_dump") else parsed.dict()
 
+    _upsert_summary(
+        db,
+        channel_id=channel_id,
+        thread=thread,
+        summary_dict=summary_dict,
+        content_hash=input_hash(
+            model=settings.openai_model, instructions=instructions, payload=payload
+        ),
+        source_latest_ts=source_latest_ts,
+        source_latest_ts_epoch=source_latest_ts_epoch,
+        incremental_count=(existing.incremental_count or 0) + 1,
+    )
+    return {
+        "thread_ts": thread.thread_ts,
+        "summarized": True,
+        "incremental": True,
+        "new_messages": len(items),
+        "tokens_in": estimate_tokens(instructions) + estimate_tokens(user_input),
+    }
+
+
+def full_summary_request(
+    db: Session,
+    *,
+    channel_id: str,
+    thread: Thread,
+    msgs: list[Message],
+    user_map: dict[str, str] | None = None,
+) -> tuple[str, str, str]:
+    """
+    Build the full (non-incremental) summary prompt for `msgs`.
+    Returns (instructions, user_input, input_hash).
+    """
+    msgs = _slice_messages_for_summary(msgs, thread.thread_ts)
+    items, _ = pack_items(
+        _message_items(db, msgs, user_map),
+        budget_tokens=settings.summary_input_token_budget,
+        keep_first=msgs[0].ts == thread.thread_ts,
+    )
+    instructions = _summary_instructions()
+    content_hash = input_hash(
+        model=settings.openai_model, instructions=instructions, payload=items
+    )
     user_input = json.dumps(
         {
             "channel_id": channel_id,
             "thread_ts": thread.thread_ts,
             "reply_count": int(thread.reply_count or 0),
-            "source_latest_ts": source_latest_ts,
+            "source_latest_ts": thread.last_reply_ts or thread.thread_ts,
             "messages": items,
         },
         ensure_ascii=False,
     )
+    return instructions, user_input, content_hash
+
+
+def summarize_thread(
+    db: Session,
+    llm: LLMClient,
+    *,
+    channel_id: str,
+    thread: Thread,
+    context: ThreadContext | None = None,
+) -> dict:
+    """
+    Summarize a thread. When a summary from the same model exists, only messages
+    newer than last_summarized_ts_epoch are sent along with it (incremental mode);
+    every SUMMARY_FULL_REFRESH_EVERY incremental updates, the whole (sliced)
+    thread is re-summarized to stop drift from accumulating.
+    Pass `context` to reuse messages/names already loaded by the caller.
+    """
+    source_latest_ts = thread.last_reply_ts or thread.thread_ts
+    source_latest_ts_epoch = thread.last_reply_ts_epoch or thread.thread_ts_epoch
+
+    existing = (
+        db.query(ThreadSummary)
+        .filter(ThreadSummary.channel_id == channel_id)
+        .filter(ThreadSummary.thread_ts == thread.thread_ts)
+        .first()
+    )
+
+    user_map = context.user_map if context else None
+
+    if _can_summarize_incrementally(existing, thread):
+        if context:
+            new_msgs = [
+                m for m in context.messages if m.ts_epoch > thread.last_summarized_ts_epoch
+            ]
+        else:
+            new_msgs = (
+                db.query(Message)
+                .filter(Message.channel_id == channel_id)
+                .filter(Message.thread_ts == thread.thread_ts)
+                .filter(Message.ts_epoch > thread.last_summarized_ts_epoch)
+                .order_by(Message.ts_epoch.asc())
+                .all()
+            )
+        # No new messages (edits, re-flagged threads) falls through to the full
+        # path, whose input hash check usually avoids the LLM call entirely; so
+        # does a delta too large to send whole.
+        if new_msgs:
+            result = _summarize_incremental(
+                db,
+                llm,
+                channel_id=channel_id,
+                thread=thread,
+                existing=existing,
+                new_msgs=new_msgs,
+                user_map=user_map,
+                source_latest_ts=source_latest_ts,
+                source_latest_ts_epoch=source_latest_ts_epoch,
+            )
+            if result is not None:
+                return result
+
+    if context:
+        msgs = context.messages
+    else:
+        msgs = (
+            db.query(Message)
+            .filter(Message.channel_id == channel_id)
+            .filter(Message.thread_ts == thread.thread_ts)
+            .order_by(Message.ts_epoch.asc())
+            .all()
+        )
+    if not msgs:
+        return {"thread_ts": thread.thread_ts, "skipped": "no_messages"}
+
+    instructions, user_input, content_hash = full_summary_request(
+        db, channel_id=channel_id, thread=thread, msgs=msgs, user_map=user_map
+    )
+
+    # Edits, filtered subtypes or replies outside the slice can leave the model
+    # input byte-identical; reuse the stored summary instead of re-calling the LLM.
+    if existing and existing.input_hash == content_hash:
+        existing.source_latest_ts = source_latest_ts
+        existing.source_latest_ts_epoch = source_latest_ts_epoch
+        _mark_summarized(db, thread, source_latest_ts, source_latest_ts_epoch)
+        return {"thread_ts": thread.thread_ts, "summarized": True, "cache_hit": True}
 
     parsed: ThreadSummaryOut = llm.parse_structured(
         model=settings.openai_model,
-        instructions=instructions.strip(),
+        instructions=instructions,
         user_input=user_input,
         text_format=ThreadSummaryOut,
         max_output_tokens=1200,
@@ -141,44 +430,87 @@ def summarize_thread(db: Session, llm: LLMClient, *, channel_id: str, thread: Th
 
     summary_dict = parsed.model_dump() if hasattr(parsed, "model_dump") else parsed.dict()
 
-    stmt = pg_insert(ThreadSummary.__table__).values(
+    _upsert_summary(
+        db,
         channel_id=channel_id,
-        thread_ts=thread.thread_ts,
-        summary_json=summary_dict,
-        model=settings.openai_model,
+        thread=thread,
+        summary_dict=summary_dict,
+        content_hash=content_hash,
         source_latest_ts=source_latest_ts,
         source_latest_ts_epoch=source_latest_ts_epoch,
-        updated_at=datetime.now(timezone.utc),
-    )
-    stmt = stmt.on_conflict_do_update(
-        index_elements=["channel_id", "thread_ts"],
-        set_=dict(
-            summary_json=summary_dict,
-            model=settings.openai_model,
-            source_latest_ts=source_latest_ts,
-            source_latest_ts_epoch=source_latest_ts_epoch,
-            updated_at=datetime.now(timezone.utc),
-        ),
+        incremental_count=0,
     )
-    db.execute(stmt)
 
-    thread.needs_summary = False
-    thread.last_summarized_ts = source_latest_ts
-    thread.last_summarized_ts_epoch = source_latest_ts_epoch
-    thread.updated_at = datetime.now(timezone.utc)
+    return {
+        "thread_ts": thread.thread_ts,
+        "summarized": True,
+        "tokens_in": estimate_tokens(instructions) + estimate_tokens(user_input),
+    }
+
+
+def _summarize_in_own_session(
+    SessionLocal, llm: LLMClient, channel_id: str, thread_ts: str
+) -> bool:
+    with SessionLocal() as db:
+        t = (
+            db.query(Thread)
+            .filter(Thread.channel_id == channel_id)
+            .filter(Thread.thread_ts == thread_ts)
+            .first()
+        )
+        if not t:
+            return False
+        try:
+            summarize_thread(db, llm, channel_id=channel_id, thread=t)
+            return True
+        except Exception:
+            log.exception("Summary failed for channel=%s thread_ts=%s", channel_id, thread_ts)
+            db.rollback()
+            return False
+
+
+def summarize_threads_concurrently(
+    llm: LLMClient,
+    keys: list[tuple[str, str]],
+    *,
+    concurrency: int | None = None,
+    executor: Executor | None = None,
+) -> dict[tuple[str, str], bool]:
+    """
+    Summarize (channel_id, thread_ts) pairs on a worker pool, one DB session per
+    task. The LLM request/token budgets in LLMClient are shared by all workers.
+    Pass `executor` to share one pool across callers. Returns {key: succeeded}.
+    """
+    SessionLocal = get_session_factory()
+    if SessionLocal is None:
+        raise RuntimeError("DATABASE_URL is not set; DB session is unavailable")
+    if not keys:
+        return {}
 
-    db.commit()
+    if executor is not None:
+        futures = {
+            key: executor.submit(_summarize_in_own_session, SessionLocal, llm, key[0], key[1])
+            for key in keys
+        }
+        return {key: fut.result() for key, fut in futures.items()}
 
-    return {"thread_ts": thread.thread_ts, "summarized": True}
+    workers = max(1, min(concurrency or settings.llm_concurrency, len(keys)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="summarize") as pool:
+        return summarize_threads_concurrently(llm, keys, executor=pool)
 
 
 def summarize_pending_threads(
-    db: Session, llm: LLMClient, *, channel_id: str | None = None, limit: int = 50
+    db: Session,
+    llm: LLMClient,
+    *,
+    channel_id: str | None = None,
+    limit: int = 50,
+    concurrency: int | None = None,
 ) -> dict:
     cutoff = (datetime.now(timezone.utc) - timedelta(days=14)).timestamp()
 
     q = (
-        db.query(Thread)
+        db.query(Thread.channel_id, Thread.thread_ts)
         .join(Channel, Channel.channel_id == Thread.channel_id)
         .filter(Channel.is_active.is_(True))
         .filter(Thread.needs_summary.is_(True))
@@ -187,16 +519,9 @@ def summarize_pending_threads(
     if channel_id:
         q = q.filter(Thread.channel_id == channel_id)
 
-    threads = q.order_by(desc(Thread.updated_at)).limit(limit).all()
+    keys = [(r[0], r[1]) for r in q.order_by(desc(Thread.updated_at)).limit(limit).all()]
 
-    ok = 0
-    fail = 0
-    for t in threads:
-        try:
-            summarize_thread(db, llm, channel_id=t.channel_id, thread=t)
-            ok += 1
-        except Exception:
-            db.rollback()
-            fail += 1
+    results = summarize_threads_concurrently(llm, keys, concurrency=concurrency)
+    ok = sum(1 for v in results.values() if v)
 
-    return {"attempted": len(threads), "ok": ok, "fail": fail, "limit": limit}
+    return {"attempted": len(keys), "ok": ok, "fail": len(keys) - ok, "limit": limit}
@@ -6,13 +6,23 @@ from typing import Literal
 from zoneinfo import ZoneInfo
 
 from pydantic import BaseModel, Field
-from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
 from app.config import settings
+from app.db import dialect_insert
 from app.llm_client import LLMClient
-from app.models import Message, Thread, ThreadReport, ThreadSummary, UserCache
-from app.services.summary_service import summarize_thread
+from app.models import Thread, ThreadReport, ThreadSummary
+from app.services.data_version import mark_channels_changed
+from app.services.summary_service import (
+    ThreadContext,
+    ThreadSummaryOut,
+    _upsert_summary,
+    input_hash,
+    load_thread_context,
+    summarize_thread,
+    summary_is_stale,
+)
+from app.token_budget import estimate_tokens, pack_items
 
 
 class ParticipantRole(BaseModel):
@@ -34,16 +44,9 @@ class ThreadReportOut(BaseModel):
     timeline_daily: list[DailyProgress] = Field(default_factory=list)
 
 
-def _build_user_map(db: Session, user_ids: set[str]) -> dict[str, str]:
-    if not user_ids:
-        return {}
-    rows = db.query(UserCache).filter(UserCache.user_id.in_(list(user_ids))).all()
-    out: dict[str, str] = {}
-    for r in rows:
-        name = (r.display_name or r.real_name or r.user_id or "").strip()
-        if name:
-            out[r.user_id] = name
-    return out
+class ThreadSummaryAndReportOut(BaseModel):
+    summary: ThreadSummaryOut
+    report: ThreadReportOut
 
 
 def _epoch_to_kst_strings(epoch: float) -> tuple[str, str]:
@@ -53,25 +56,15 @@ def _epoch_to_kst_strings(epoch: float) -> tuple[str, str]:
 
 
 def _collect_messages_for_report(
-    db: Session, *, channel_id: str, thread_ts: str
+    db: Session, *, channel_id: str, thread_ts: str, context: ThreadContext | None = None
 ) -> tuple[list[dict], dict[str, str]]:
-    msgs = (
-        db.query(Message)
-        .filter(Message.channel_id == channel_id)
-        .filter(Message.thread_ts == thread_ts)
-        .order_by(Message.ts_epoch.asc())
-        .all()
-    )
+    if context is None:
+        context = load_thread_context(db, channel_id=channel_id, thread_ts=thread_ts)
+    msgs = context.messages
     if not msgs:
         return [], {}
 
-    # Collect user IDs
-    user_ids: set[str] = set()
-    for m in msgs:
-        if m.user_id:
-            user_ids.add(m.user_id)
-
-    user_map = _build_user_map(db, user_ids)
+    user_map = context.user_map
 
     max_n = settings.max_messages_per_thread_for_report
     if len(msgs) > max_n:
@@ -106,6 +99,11 @@ def _collect_messages_for_report(
             }
         )
 
+    items, _ = pack_items(
+        items,
+        budget_tokens=settings.report_input_token_budget,
+        keep_first=msgs[0].ts == thread_ts,
+    )
     return items, user_map
 
 
@@ -113,6 +111,133 @@ def _latest_epoch_for_thread(thread: Thread) -> float:
     return float(thread.last_reply_ts_epoch or thread.thread_ts_epoch or 0.0)
 
 
+def _report_instructions() -> str:
+    return f"""
+너는 슬랙 스레드 전체를 {settings.summary_language}로 분석해 구조화 리포트를 작성한다.
+- topic: 논의의 주제를 한 줄로 요약한다.
+- participants_roles: 대화에서 보인 행동/기여 기반으로 역할을 추정(예: 의사결정, 실행, 질문/검증, 조율, 리스크 제기 등)하고 evidence에 짧은 근거를 남긴다.
+- timeline_daily: date_kst 오름차순, 해당 날짜에 실제 발언이 있을 때만 생성한다. progress/decisions/open_questions를 사실 기반으로 채운다.
+- 과장 없이 보수적으로 작성하고, 근거가 없으면 비워둔다.
+- 모든 필드는 주어진 스키마(Structured Outputs)를 따른다. 비어있으면 빈 배열([])을 사용한다.
+""".strip()
+
+
+def _combined_instructions() -> str:
+    return f"""
+너는 슬랙 스레드 전체를 {settings.summary_language}로 분석해 요약(summary)과 구조화 리포트(report)를 한 번에 작성한다.
+[summary]
+- one_line은 짧고 명확하게(가능하면 80자 이내), summary는 3~6문장.
+- action_items는 가능하면 task 중심으로, owner_hint/due_hint는 추정 가능할 때만 채운다.
+[report]
+- topic: 논의의 주제를 한 줄로 요약한다.
+- participants_roles: 대화에서 보인 행동/기여 기반으로 역할을 추정(예: 의사결정, 실행, 질문/검증, 조율, 리스크 제기 등)하고 evidence에 짧은 근거를 남긴다.
+- timeline_daily: date_kst 오름차순, 해당 날짜에 실제 발언이 있을 때만 생성한다. progress/decisions/open_questions를 사실 기반으로 채운다.
+[공통]
+- 과장 없이 보수적으로 작성하고, 근거가 없으면 비워둔다.
+- 모든 필드는 주어진 스키마(Structured Outputs)를 따른다. 비어있으면 빈 배열([])을 사용한다.
+""".strip()
+
+
+def _upsert_thread_report(
+    db: Session,
+    *,
+    channel_id: str,
+    thread: Thread,
+    report_dict: dict,
+    latest_ts: str,
+    latest_epoch: float,
+) -> None:
+    stmt = dialect_insert(db, ThreadReport.__table__).values(
+        channel_id=channel_id,
+        thread_ts=thread.thread_ts,
+        report_json=report_dict,
+        model=settings.openai_model,
+        source_latest_ts=latest_ts,
+        source_latest_ts_epoch=latest_epoch,
+        updated_at=datetime.now(timezone.utc),
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["channel_id", "thread_ts"],
+        set_=dict(
+            report_json=report_dict,
+            model=settings.openai_model,
+            source_latest_ts=latest_ts,
+            source_latest_ts_epoch=latest_epoch,
+            updated_at=datetime.now(timezone.utc),
+        ),
+    )
+    db.execute(stmt)
+    thread.has_report = True
+    # has_report is part of the channel's thread-report listing.
+    mark_channels_changed(db, [channel_id])
+    db.commit()
+
+
+def _summarize_and_report(
+    db: Session,
+    llm: LLMClient,
+    *,
+    channel_id: str,
+    thread: Thread,
+    messages: list[dict],
+    latest_ts: str,
+    latest_epoch: float,
+) -> dict:
+    """One LLM call producing both the thread summary and the thread report."""
+    instructions = _combined_instructions()
+    user_input = json.dumps(
+        {
+            "channel_id": channel_id,
+            "thread_ts": thread.thread_ts,
+            "reply_count": int(thread.reply_count or 0),
+            "messages": messages,
+        },
+        ensure_ascii=False,
+    )
+
+    parsed: ThreadSummaryAndReportOut = llm.parse_structured(
+        model=settings.openai_model,
+        instructions=instructions,
+        user_input=user_input,
+        text_format=ThreadSummaryAndReportOut,
+        max_output_tokens=2600,
+        temperature=0.2,
+    )
+    out = parsed.model_dump() if hasattr(parsed, "model_dump") else parsed.dict()
+
+    # The hash covers the input this summary was actually produced from (the
+    # combined prompt), never the standalone summary prompt it did not see.
+    _upsert_summary(
+        db,
+        channel_id=channel_id,
+        thread=thread,
+        summary_dict=out["summary"],
+        content_hash=input_hash(
+            model=settings.openai_model, instructions=instructions, payload=user_input
+        ),
+        source_latest_ts=latest_ts,
+        source_latest_ts_epoch=latest_epoch,
+        incremental_count=0,
+    )
+    _upsert_thread_report(
+        db,
+        channel_id=channel_id,
+        thread=thread,
+        report_dict=out["report"],
+        latest_ts=latest_ts,
+        latest_epoch=latest_epoch,
+    )
+
+    return {
+        "thread_ts": thread.thread_ts,
+        "report_created": True,
+        "summarized": True,
+        "combined": True,
+        "source_latest_ts_epoch": latest_epoch,
+        "tokens_in": estimate_tokens(instructions) + estimate_tokens(user_input),
+    }
+
+
 def ensure_thread_report(
     db: Session,
     llm: LLMClient,
@@ -122,7 +247,9 @@ def ensure_thread_report(
     force: bool = False,
 ) -> dict:
     """
-    Generate or refresh thread report if stale.
+    Generate or refresh thread report if stale. Messages and names are loaded
+    once and shared with the summary step; when the summary is stale too and
+    THREAD_REPORT_COMBINED_CALL is on, both come from a single LLM call.
     """
     latest_epoch = _latest_epoch_for_thread(thread)
     latest_ts = thread.last_reply_ts or thread.thread_ts
@@ -140,11 +267,12 @@ def ensure_thread_report(
             "source_latest_ts_epoch": existing.source_latest_ts_epoch,
         }
 
-    # Ensure summary is fresh for additional context
-    try:
-        summarize_thread(db, llm, channel_id=channel_id, thread=thread)
-    except Exception:
-        db.rollback()
+    context = load_thread_context(db, channel_id=channel_id, thread_ts=thread.thread_ts)
+    messages, _ = _collect_messages_for_report(
+        db, channel_id=channel_id, thread_ts=thread.thread_ts, context=context
+    )
+    if not messages:
+        return {"thread_ts": thread.thread_ts, "skipped": "no_messages"}
 
     summary_row = (
         db.query(ThreadSummary)
@@ -152,14 +280,31 @@ def ensure_thread_report(
         .filter(ThreadSummary.thread_ts == thread.thread_ts)
         .first()
     )
+    if summary_is_stale(summary_row, thread):
+        if settings.thread_report_combined_call:
+            return _summarize_and_report(
+                db,
+                llm,
+                channel_id=channel_id,
+                thread=thread,
+                messages=messages,
+                latest_ts=latest_ts,
+                latest_epoch=latest_epoch,
+            )
+
+        # Ensure summary is fresh for additional context
+        try:
+            summarize_thread(db, llm, channel_id=channel_id, thread=thread, context=context)
+        except Exception:
+            db.rollback()
+        summary_row = (
+            db.query(ThreadSummary)
+            .filter(ThreadSummary.channel_id == channel_id)
+            .filter(ThreadSummary.thread_ts == thread.thread_ts)
+            .first()
+        )
     summary_payload = summary_row.summary_json if summary_row else {}
 
-    messages, _ = _collect_messages_for_report(
-        db, channel_id=channel_id, thread_ts=thread.thread_ts
-    )
-    if not messages:
-        return {"thread_ts": thread.thread_ts, "skipped": "no_messages"}
-
     user_input = json.dumps(
         {
             "channel_id": channel_id,
@@ -170,19 +315,11 @@ def ensure_thread_report(
         },
         ensure_ascii=False,
     )
-
-    instructions = f"""
-너는 슬랙 스레드 전체를 {settings.summary_language}로 분석해 구조화 리포트를 작성한다.
-- topic: 논의의 주제를 한 줄로 요약한다.
-- participants_roles: 대화에서 보인 행동/기여 기반으로 역할을 추정(예: 의사결정, 실행, 질문/검증, 조율, 리스크 제기 등)하고 evidence에 짧은 근거를 남긴다.
-- timeline_daily: date_kst 오름차순, 해당 날짜에 실제 발언이 있을 때만 생성한다. progress/decisions/open_questions를 사실 기반으로 채운다.
-- 과장 없이 보수적으로 작성하고, 근거가 없으면 비워둔다.
-- 모든 필드는 주어진 스키마(Structured Outputs)를 따른다. 비어있으면 빈 배열([])을 사용한다.
-"""
+    instructions = _report_instructions()
 
     parsed: ThreadReportOut = llm.parse_structured(
         model=settings.openai_model,
-        instructions=instructions.strip(),
+        instructions=instructions,
         user_input=user_input,
         text_format=ThreadReportOut,
         max_output_tokens=1400,
@@ -190,33 +327,20 @@ def ensure_thread_report(
     )
 
     report_dict = parsed.model_dump() if hasattr(parsed, "model_dump") else parsed.dict()
-
-    stmt = pg_insert(ThreadReport.__table__).values(
+    _upsert_thread_report(
+        db,
         channel_id=channel_id,
-        thread_ts=thread.thread_ts,
-        report_json=report_dict,
-        model=settings.openai_model,
-        source_latest_ts=latest_ts,
-        source_latest_ts_epoch=latest_epoch,
-        updated_at=datetime.now(timezone.utc),
-    )
-    stmt = stmt.on_conflict_do_update(
-        index_elements=["channel_id", "thread_ts"],
-        set_=dict(
-            report_json=report_dict,
-            model=settings.openai_model,
-            source_latest_ts=latest_ts,
-            source_latest_ts_epoch=latest_epoch,
-            updated_at=datetime.now(timezone.utc),
-        ),
+        thread=thread,
+        report_dict=report_dict,
+        latest_ts=latest_ts,
+        latest_epoch=latest_epoch,
     )
-    db.execute(stmt)
-    db.commit()
 
     return {
         "thread_ts": thread.thread_ts,
         "report_created": True,
         "source_latest_ts_epoch": latest_epoch,
+        "tokens_in": estimate_tokens(instructions) + estimate_tokens(user_input),
     }
 
 
@@ -1,45 +1,85 @@
 from __future__ import annotations
 
 import re
+from datetime import datetime
 
-from sqlalchemy.orm import Session
+from sqlalchemy import Text, tuple_, type_coerce
+from sqlalchemy.orm import Query, Session
 
-from app.models import Channel, Message, Thread, ThreadSummary, UserCache
+from app.models import Channel, Message, Thread
+from app.pagination import decode_cursor, encode_cursor
+from app.services import name_service
 from app.text_render import render_slack_text_to_safe_html
 
 _RE_MENTION = re.compile(r"<@([A-Z0-9]+)")
 
 
-def list_threads(db: Session, channel_id: str, *, limit: int = 50, offset: int = 0) -> list[dict]:
+def _updated_at_key(db: Session):
+    if db.get_bind().dialect.name == "sqlite":
+        # SQLite keeps DateTime as text in whichever format wrote it
+        # (CURRENT_TIMESTAMP has no fraction, Python values do); comparing the
+        # stored text keeps ties exact where a re-bound datetime would not.
+        return type_coerce(Thread.updated_at, Text)
+    return Thread.updated_at
+
+
+def page_threads(
+    db: Session,
+    query: Query,
+    *,
+    limit: int,
+    offset: int = 0,
+    cursor: str | None = None,
+) -> tuple[list, str | None]:
+    """
+    Newest-first page of a Thread query, ordered by (updated_at, thread_ts).
+    With `cursor`, seeks past the previous page's last row instead of
+    skipping `offset` rows, so deep pages cost the same as the first (served by
+    ix_threads_channel_updated_at_thread_ts). Rows gain two trailing columns
+    (page_key, page_ts). Returns (rows, next cursor or None on the last page);
+    raises ValueError for a malformed cursor.
+    """
+    key = _updated_at_key(db)
+    q = query.add_columns(key.label("page_key"), Thread.thread_ts.label("page_ts")).order_by(
+        Thread.updated_at.desc(), Thread.thread_ts.desc()
+    )
+    if cursor:
+        after_key, after_ts = decode_cursor(cursor, 2)
+        if db.get_bind().dialect.name != "sqlite":
+            after_key = datetime.fromisoformat(after_key)
+        q = q.filter(tuple_(key, Thread.thread_ts) < tuple_(after_key, after_ts))
+    elif offset:
+        q = q.offset(offset)
+
+    rows = q.limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    last_key = last.page_key if isinstance(last.page_key, str) else last.page_key.isoformat()
+    return rows, encode_cursor(last_key, last.page_ts)
+
+
+def list_threads(
+    db: Session,
+    channel_id: str,
+    *,
+    limit: int = 50,
+    offset: int = 0,
+    cursor: str | None = None,
+) -> tuple[list[dict], str | None]:
     ch = db.get(Channel, channel_id)
     if not ch:
         raise KeyError("Channel not found")
 
-    rows = (
-        db.query(Thread)
-        .filter(Thread.channel_id == channel_id)
-        .order_by(Thread.updated_at.desc())
-        .limit(limit)
-        .offset(offset)
-        .all()
+    page, next_cursor = page_threads(
+        db,
+        db.query(Thread).filter(Thread.channel_id == channel_id),
+        limit=limit,
+        offset=offset,
+        cursor=cursor,
     )
-
-    thread_ts_list = [t.thread_ts for t in rows]
-    one_line_map: dict[str, str] = {}
-    if thread_ts_list:
-        sums = (
-            db.query(ThreadSummary)
-            .filter(ThreadSummary.channel_id == channel_id)
-            .filter(ThreadSummary.thread_ts.in_(thread_ts_list))
-            .all()
-        )
-        for s in sums:
-            try:
-                ol = (s.summary_json or {}).get("one_line")
-                if ol:
-                    one_line_map[s.thread_ts] = str(ol)
-            except Exception:
-                continue
+    rows = [r[0] for r in page]
 
     out = []
     for t in rows:
@@ -50,10 +90,10 @@ def list_threads(db: Session, channel_id: str, *, limit: int = 50, offset: int =
                 "reply_count": t.reply_count,
                 "root_text": t.root_text,
                 "updated_at": t.updated_at,
-                "one_line": one_line_map.get(t.thread_ts),
+                "one_line": t.one_line,
             }
         )
-    return out
+    return out, next_cursor
 
 
 def _collect_user_ids(messages: list[Message]) -> set[str]:
@@ -67,18 +107,6 @@ def _collect_user_ids(messages: list[Message]) -> set[str]:
     return ids
 
 
-def _build_user_map(db: Session, user_ids: set[str]) -> dict[str, str]:
-    if not user_ids:
-        return {}
-    rows = db.query(UserCache).filter(UserCache.user_id.in_(list(user_ids))).all()
-    m: dict[str, str] = {}
-    for r in rows:
-        name = (r.display_name or r.real_name or r.user_id or "").strip()
-        if name:
-            m[r.user_id] = name
-    return m
-
-
 def get_thread_messages_with_html(db: Session, channel_id: str, thread_ts: str) -> dict:
     ch = db.get(Channel, channel_id)
     if not ch:
@@ -102,7 +130,7 @@ def get_thread_messages_with_html(db: Session, channel_id: str, thread_ts: str)
     )
 
     user_ids = _collect_user_ids(msgs)
-    user_map = _build_user_map(db, user_ids)
+    user_map = name_service.resolve(db, user_ids)
 
     items = []
     for m in msgs:
@@ -1,17 +1,24 @@
 from __future__ import annotations
 
+import threading
+import time
+
 from sqlalchemy.orm import Session
 
+from app.config import settings
 from app.models import UserCache
+from app.services import name_service
+from app.services.ingest_writer import IngestWriter
+from app.slack_client import SlackClient
 
 
-def upsert_user_cache(db: Session, user_obj: dict) -> None:
+def user_cache_row(user_obj: dict) -> dict | None:
     """
-    Store or update a user's display/real name in users_cache.
+    Map a Slack user object to a users_cache row (None if it has no id).
     """
     user_id = user_obj.get("id")
     if not user_id:
-        return
+        return None
 
     profile = user_obj.get("profile") or {}
     display_name = (profile.get("display_name") or "").strip()
@@ -20,14 +27,114 @@ def upsert_user_cache(db: Session, user_obj: dict) -> None:
 
     best_name = display_name or real_name or name_fallback or None
 
-    row = db.get(UserCache, user_id)
+    return {
+        "user_id": user_id,
+        "display_name": best_name,
+        "real_name": real_name or best_name,
+    }
+
+
+def upsert_user_cache(db: Session, user_obj: dict) -> None:
+    """
+    Store or update a user's display/real name in users_cache. The cached name
+    is dropped when the caller commits.
+    """
+    values = user_cache_row(user_obj)
+    if not values:
+        return
+
+    row = db.get(UserCache, values["user_id"])
     if row:
-        row.display_name = best_name
-        row.real_name = real_name or best_name
+        row.display_name = values["display_name"]
+        row.real_name = values["real_name"]
     else:
-        row = UserCache(
-            user_id=user_id,
-            display_name=best_name,
-            real_name=real_name or best_name,
-        )
-        db.add(row)
+        db.add(UserCache(**values))
+    name_service.invalidate_on_commit(db, [values["user_id"]])
+
+
+_directory_lock = threading.Lock()
+_directory_synced_at: float | None = None
+
+
+def fetch_user_directory(slack: SlackClient) -> list[dict]:
+    """
+    Page users.list into users_cache rows (one Slack call per 200 users instead
+    of one users.info call per user). Touches no DB session.
+    """
+    cursor: str | None = None
+    rows: list[dict] = []
+
+    while True:
+        members, next_cursor = slack.users_list_page(cursor=cursor, limit=200)
+        rows.extend(r for r in (user_cache_row(m) for m in members) if r)
+        if not next_cursor:
+            break
+        cursor = next_cursor
+    return rows
+
+
+def sync_user_directory(db: Session, slack: SlackClient) -> dict:
+    """Write the whole users.list directory to users_cache with bulk upserts."""
+    rows = fetch_user_directory(slack)
+    writer = IngestWriter(db)
+    writer.add_users(rows)
+    writer.flush()
+    record_directory_sync(rows)
+
+    return {"users": len(rows), "write": writer.stats()}
+
+
+def record_directory_sync(rows: list[dict]) -> None:
+    """Prime the name cache from a users.list pass and mark the directory fresh."""
+    global _directory_synced_at
+
+    name_service.prime(_row_names(rows))
+    _directory_synced_at = time.monotonic()
+
+
+def record_directory_sync_failure() -> None:
+    """
+    Back off for a full interval rather than retrying a failing users.list
+    (e.g. missing users:read scope) on every call.
+    """
+    global _directory_synced_at
+
+    _directory_synced_at = time.monotonic()
+
+
+def _row_names(rows: list[dict]) -> dict[str, str]:
+    out: dict[str, str] = {}
+    for r in rows:
+        name = (r["display_name"] or r["real_name"] or r["user_id"] or "").strip()
+        if name:
+            out[r["user_id"]] = name
+    return out
+
+
+def directory_sync_due() -> bool:
+    if _directory_synced_at is None:
+        return True
+    interval_s = settings.user_directory_sync_interval_minutes * 60
+    return time.monotonic() - _directory_synced_at >= interval_s
+
+
+def maybe_sync_user_directory(writer: IngestWriter, slack: SlackClient) -> bool:
+    """
+    Fetch users.list unless this process already did so within
+    USER_DIRECTORY_SYNC_INTERVAL_MINUTES, and queue the rows on the caller's
+    writer so they are committed with the rest of its batch; the caller's
+    session is never flushed, committed or rolled back here. Concurrent callers
+    wait for the one in flight instead of starting their own. Returns True if a
+    sync ran.
+    """
+    with _directory_lock:
+        if not directory_sync_due():
+            return False
+        try:
+            rows = fetch_user_directory(slack)
+        except Exception:
+            record_directory_sync_failure()
+            raise
+        record_directory_sync(rows)
+    writer.add_users(rows)
+    return True
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import asyncio
+import threading
 import time
 from dataclasses import dataclass
 from typing import Any, Callable
@@ -8,6 +10,76 @@ from slack_sdk import WebClient
 from slack_sdk.errors import SlackApiError
 
 from app.config import settings
+from app.rate_limit import TokenBucket
+
+# Slack Web API rate-limit tiers (requests per minute).
+# https://api.slack.com/apis/rate-limits
+_TIER_PER_MINUTE = {1: 1, 2: 20, 3: 50, 4: 100}
+
+_METHOD_TIERS = {
+    "conversations.history": 3,
+    "conversations.replies": 3,
+    "conversations.info": 3,
+    "conversations.join": 3,
+    "users.info": 4,
+    "users.list": 2,
+}
+
+# Process-wide so every SlackClient instance (and every worker thread) draws
+# from the same per-method budget.
+_buckets: dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def _bucket_for(method: str) -> TokenBucket:
+    with _buckets_lock:
+        bucket = _buckets.get(method)
+        if bucket is None:
+            tier = _METHOD_TIERS.get(method, 3)
+            per_minute = _TIER_PER_MINUTE[tier] * settings.slack_rate_limit_scale
+            bucket = TokenBucket(
+                rate_per_sec=per_minute / 60.0,
+                capacity=max(1.0, per_minute / 10.0),
+            )
+            _buckets[method] = bucket
+        return bucket
+
+
+def rate_limit_stats() -> dict:
+    with _buckets_lock:
+        return {method: b.stats() for method, b in sorted(_buckets.items())}
+
+
+def _classify_slack_error(e: SlackApiError) -> tuple[int | None, str | None, int | None]:
+    """
+    Returns (status_code, error_code, retry_after_seconds); retry_after is None
+    unless the error is a rate-limit response.
+    """
+    status = getattr(e.response, "status_code", None)
+    headers = getattr(e.response, "headers", {}) or {}
+    err_code = None
+
+    try:
+        err_code = e.response.get("error")
+    except Exception:
+        err_code = None
+
+    if status == 429 or err_code == "ratelimited":
+        retry_after = headers.get("Retry-After")
+        try:
+            wait_s = int(retry_after) if retry_after else 1
+        except Exception:
+            wait_s = 1
+        return status, err_code, wait_s
+
+    return status, err_code, None
+
+
+def _messages_and_cursor(resp: Any) -> tuple[list[dict], str | None]:
+    messages = resp.get("messages") or []
+    meta = resp.get("response_metadata") or {}
+    next_cursor = (meta.get("next_cursor") or "").strip() or None
+    return messages, next_cursor
 
 
 class SlackNotConfigured(RuntimeError):
@@ -29,39 +101,67 @@ class SlackCallError(RuntimeError):
         return base
 
 
+def _web_client_kwargs(token: str, base_url: str | None) -> dict:
+    # base_url points the client at another Web API host (e.g. the benchmark's
+    # fake Slack server); unset keeps slack_sdk's https://slack.com/api/.
+    kwargs: dict[str, Any] = {"token": token}
+    base_url = base_url or settings.slack_api_base_url
+    if base_url:
+        kwargs["base_url"] = base_url if base_url.endswith("/") else base_url + "/"
+    return kwargs
+
+
 class SlackClient:
-    def __init__(self, token: str | None = None):
+    def __init__(self, token: str | None = None, *, base_url: str | None = None):
         token = token or settings.slack_bot_token
         if not token:
             raise SlackNotConfigured("SLACK_BOT_TOKEN is not set")
-        self.client = WebClient(token=token)
+        self.client = WebClient(**_web_client_kwargs(token, base_url))
+        # Shared by every worker using this client: a 429 seen by one worker
+        # pauses all of them until Retry-After has elapsed.
+        self._pause_lock = threading.Lock()
+        self._pause_until = 0.0
+        self.ratelimited_responses = 0
+
+    def _wait_for_pause(self) -> None:
+        with self._pause_lock:
+            wait_s = self._pause_until - time.monotonic()
+        if wait_s > 0:
+            time.sleep(wait_s)
+
+    def _pause_all(self, wait_s: float) -> None:
+        with self._pause_lock:
+            self.ratelimited_responses += 1
+            self._pause_until = max(self._pause_until, time.monotonic() + wait_s)
+
+    def rate_limit_stats(self) -> dict:
+        return {"ratelimited_responses": self.ratelimited_responses, "methods": rate_limit_stats()}
 
     def _call_with_retry(
-        self, fn: Callable[..., Any], *, max_attempts: int = 5, **kwargs
+        self,
+        fn: Callable[..., Any],
+        *,
+        api_method: str,
+        max_attempts: int = 5,
+        **kwargs,
     ) -> Any:
         last_err: Exception | None = None
+        bucket = _bucket_for(api_method) if settings.slack_rate_limit_enabled else None
 
         for attempt in range(1, max_attempts + 1):
+            self._wait_for_pause()
+            if bucket is not None:
+                bucket.acquire()
             try:
                 return fn(**kwargs)
             except SlackApiError as e:
                 last_err = e
-                status = getattr(e.response, "status_code", None)
-                headers = getattr(e.response, "headers", {}) or {}
-                err_code = None
-
-                try:
-                    err_code = e.response.get("error")
-                except Exception:
-                    err_code = None
-
-                if status == 429 or err_code == "ratelimited":
-                    retry_after = headers.get("Retry-After")
-                    try:
-                        wait_s = int(retry_after) if retry_after else 1
-                    except Exception:
-                        wait_s = 1
-                    time.sleep(wait_s)
+                status, err_code, wait_s = _classify_slack_error(e)
+
+                if wait_s is not None:
+                    if bucket is not None:
+                        bucket.drain(wait_s)
+                    self._pause_all(wait_s)
                     continue
 
                 raise SlackCallError(
@@ -77,7 +177,9 @@ class SlackClient:
         raise SlackCallError(message="Slack API call failed after retries") from last_err
 
     def get_channel_info(self, channel_id: str) -> dict:
-        resp = self._call_with_retry(self.client.conversations_info, channel=channel_id)
+        resp = self._call_with_retry(
+            self.client.conversations_info, api_method="conversations.info", channel=channel_id
+        )
         ch = resp.get("channel")
         if not ch:
             raise SlackCallError("Slack conversations.info returned no channel object")
@@ -85,17 +187,34 @@ class SlackClient:
 
     def join_channel(self, channel_id: str) -> None:
         try:
-            self._call_with_retry(self.client.conversations_join, channel=channel_id)
+            self._call_with_retry(
+                self.client.conversations_join,
+                api_method="conversations.join",
+                channel=channel_id,
+            )
         except SlackCallError:
             return
 
     def get_user_info(self, user_id: str) -> dict:
-        resp = self._call_with_retry(self.client.users_info, user=user_id)
+        resp = self._call_with_retry(
+            self.client.users_info, api_method="users.info", user=user_id
+        )
         user = resp.get("user")
         if not user:
             raise SlackCallError("Slack users.info returned no user object")
         return user
 
+    def users_list_page(
+        self, *, cursor: str | None = None, limit: int = 200
+    ) -> tuple[list[dict], str | None]:
+        resp = self._call_with_retry(
+            self.client.users_list, api_method="users.list", cursor=cursor, limit=limit
+        )
+        members = resp.get("members") or []
+        meta = resp.get("response_metadata") or {}
+        next_cursor = (meta.get("next_cursor") or "").strip() or None
+        return members, next_cursor
+
     def conversations_history_page(
         self,
         *,
@@ -107,16 +226,14 @@ class SlackClient:
     ) -> tuple[list[dict], str | None]:
         resp = self._call_with_retry(
             self.client.conversations_history,
+            api_method="conversations.history",
             channel=channel_id,
             oldest=oldest,
             inclusive=inclusive,
             limit=limit,
             cursor=cursor,
         )
-        messages = resp.get("messages") or []
-        meta = resp.get("response_metadata") or {}
-        next_cursor = (meta.get("next_cursor") or "").strip() or None
-        return messages, next_cursor
+        return _messages_and_cursor(resp)
 
     def conversations_replies_page(
         self,
@@ -130,6 +247,7 @@ class SlackClient:
     ) -> tuple[list[dict], str | None]:
         resp = self._call_with_retry(
             self.client.conversations_replies,
+            api_method="conversations.replies",
             channel=channel_id,
             ts=thread_ts,
             oldest=oldest,
@@ -137,7 +255,150 @@ class SlackClient:
             limit=limit,
             cursor=cursor,
         )
-        messages = resp.get("messages") or []
+        return _messages_and_cursor(resp)
+
+
+class AsyncSlackClient:
+    """
+    asyncio counterpart of SlackClient with the same method surface. Backoff uses
+    asyncio.sleep and draws from the same process-wide rate-limit buckets.
+    """
+
+    def __init__(self, token: str | None = None, *, base_url: str | None = None):
+        token = token or settings.slack_bot_token
+        if not token:
+            raise SlackNotConfigured("SLACK_BOT_TOKEN is not set")
+        # Imported lazily: the async client needs aiohttp, which sync-only callers skip.
+        from slack_sdk.web.async_client import AsyncWebClient
+
+        self.client = AsyncWebClient(**_web_client_kwargs(token, base_url))
+        self._pause_until = 0.0
+        self.ratelimited_responses = 0
+
+    def rate_limit_stats(self) -> dict:
+        return {"ratelimited_responses": self.ratelimited_responses, "methods": rate_limit_stats()}
+
+    async def _call_with_retry(
+        self,
+        fn: Callable[..., Any],
+        *,
+        api_method: str,
+        max_attempts: int = 5,
+        **kwargs,
+    ) -> Any:
+        last_err: Exception | None = None
+        bucket = _bucket_for(api_method) if settings.slack_rate_limit_enabled else None
+
+        for attempt in range(1, max_attempts + 1):
+            pause_s = self._pause_until - time.monotonic()
+            if pause_s > 0:
+                await asyncio.sleep(pause_s)
+            if bucket is not None:
+                wait_s = bucket.reserve()
+                if wait_s > 0:
+                    await asyncio.sleep(wait_s)
+            try:
+                return await fn(**kwargs)
+            except SlackApiError as e:
+                last_err = e
+                status, err_code, wait_s = _classify_slack_error(e)
+
+                if wait_s is not None:
+                    self.ratelimited_responses += 1
+                    if bucket is not None:
+                        bucket.drain(wait_s)
+                    self._pause_until = max(self._pause_until, time.monotonic() + wait_s)
+                    continue
+
+                raise SlackCallError(
+                    message="Slack API call failed",
+                    error_code=err_code,
+                    status_code=status,
+                ) from e
+            except Exception as e:
+                last_err = e
+                await asyncio.sleep(min(2 ** (attempt - 1), 8))
+                continue
+
+        raise SlackCallError(message="Slack API call failed after retries") from last_err
+
+    async def get_channel_info(self, channel_id: str) -> dict:
+        resp = await self._call_with_retry(
+            self.client.conversations_info, api_method="conversations.info", channel=channel_id
+        )
+        ch = resp.get("channel")
+        if not ch:
+            raise SlackCallError("Slack conversations.info returned no channel object")
+        return ch
+
+    async def join_channel(self, channel_id: str) -> None:
+        try:
+            await self._call_with_retry(
+                self.client.conversations_join,
+                api_method="conversations.join",
+                channel=channel_id,
+            )
+        except SlackCallError:
+            return
+
+    async def get_user_info(self, user_id: str) -> dict:
+        resp = await self._call_with_retry(
+            self.client.users_info, api_method="users.info", user=user_id
+        )
+        user = resp.get("user")
+        if not user:
+            raise SlackCallError("Slack users.info returned no user object")
+        return user
+
+    async def users_list_page(
+        self, *, cursor: str | None = None, limit: int = 200
+    ) -> tuple[list[dict], str | None]:
+        resp = await self._call_with_retry(
+            self.client.users_list, api_method="users.list", cursor=cursor, limit=limit
+        )
+        members = resp.get("members") or []
         meta = resp.get("response_metadata") or {}
         next_cursor = (meta.get("next_cursor") or "").strip() or None
-        return messages, next_cursor
+        return members, next_cursor
+
+    async def conversations_history_page(
+        self,
+        *,
+        channel_id: str,
+        oldest: str,
+        cursor: str | None = None,
+        limit: int = 200,
+        inclusive: bool = True,
+    ) -> tuple[list[dict], str | None]:
+        resp = await self._call_with_retry(
+            self.client.conversations_history,
+            api_method="conversations.history",
+            channel=channel_id,
+            oldest=oldest,
+            inclusive=inclusive,
+            limit=limit,
+            cursor=cursor,
+        )
+        return _messages_and_cursor(resp)
+
+    async def conversations_replies_page(
+        self,
+        *,
+        channel_id: str,
+        thread_ts: str,
+        oldest: str,
+        cursor: str | None = None,
+        limit: int = 200,
+        inclusive: bool = True,
+    ) -> tuple[list[dict], str | None]:
+        resp = await self._call_with_retry(
+            self.client.conversations_replies,
+            api_method="conversations.replies",
+            channel=channel_id,
+            ts=thread_ts,
+            oldest=oldest,
+            inclusive=inclusive,
+            limit=limit,
+            cursor=cursor,
+        )
+        return _messages_and_cursor(resp)
@@ -126,6 +126,32 @@ async function loadChannels() {
   }
 }
 
+function ingestProgressLabel(ev) {
+  const d = ev.data || {};
+  if (ev.event === "history_page") return `history p${d.pages} · ${d.rows} msgs`;
+  if (ev.event === "history_done") return `history ${d.fetched} fetched`;
+  if (ev.event === "replies_thread") return `threads ${d.threads_polled}/${d.threads_total}`;
+  if (ev.event === "replies_done") return "finishing…";
+  return "Ingesting…";
+}
+
+function followIngestRun(runId, onProgress) {
+  // Server-Sent Events from the background ingest run; resolves with the final snapshot.
+  return new Promise((resolve, reject) => {
+    const es = new EventSource(`/api/ingest-runs/${encodeURIComponent(runId)}/events`);
+    es.addEventListener("progress", (msg) => onProgress(JSON.parse(msg.data)));
+    es.addEventListener("end", (msg) => {
+      es.close();
+      const run = JSON.parse(msg.data);
+      if (run.status === "ok") resolve(run);
+      else reject(new Error(run.error || "Ingest failed"));
+    });
+    es.onerror = () => {
+      if (es.readyState === EventSource.CLOSED) reject(new Error("Ingest progress stream closed"));
+    };
+  });
+}
+
 async function triggerIngest(channelId, btn) {
   clearError();
   btn.disabled = true;
@@ -135,6 +161,9 @@ async function triggerIngest(channelId, btn) {
       method: "POST",
       body: JSON.stringify({ backfill_days: 14, mode: "full" }),
     });
+    await followIngestRun(res.run_id, (ev) => {
+      btn.textContent = ingestProgressLabel(ev);
+    });
     btn.textContent = "Done";
     btn.disabled = false;
     showError("");
@@ -143,6 +172,7 @@ async function triggerIngest(channelId, btn) {
     btn.disabled = false;
     btn.textContent = "Ingest Now";
     showError(e.message);
+    await loadChannels();
   }
 }
 
@@ -27,6 +27,20 @@ async function apiJson(url, opts = {}) {
   return data;
 }
 
+async function apiPage(url) {
+  // Listing endpoints return the next page's opaque cursor in X-Next-Cursor.
+  const res = await fetch(url, { headers: { "Content-Type": "application/json" } });
+  const data = await res.json().catch(() => ({}));
+  if (!res.ok) throw new Error(data.detail || `Request failed: ${res.status}`);
+  return { rows: data, nextCursor: res.headers.get("X-Next-Cursor") };
+}
+
+function threadReportsUrl(channelId, cursor) {
+  const q = new URLSearchParams({ channel_id: channelId, limit: "200" });
+  if (cursor) q.set("cursor", cursor);
+  return `/api/thread-reports?${q}`;
+}
+
 function fmtKstFromIso(iso) {
   if (!iso) return "-";
   try {
@@ -58,7 +72,7 @@ async function loadChannels() {
   return rows;
 }
 
-function renderThreadList(rows, channelId) {
+function renderThreadList(rows, channelId, nextCursor) {
   const container = $("#trThreadList");
   container.classList.remove("muted");
   container.innerHTML = "";
@@ -68,6 +82,10 @@ function renderThreadList(rows, channelId) {
     return;
   }
 
+  appendThreadItems(container, rows, channelId, nextCursor);
+}
+
+function appendThreadItems(container, rows, channelId, nextCursor) {
   for (const r of rows) {
     const item = document.createElement("div");
     item.className = "thread-item";
@@ -95,6 +113,23 @@ function renderThreadList(rows, channelId) {
 
     container.appendChild(item);
   }
+
+  if (nextCursor) {
+    const more = document.createElement("button");
+    more.textContent = "더 보기";
+    more.addEventListener("click", async () => {
+      more.disabled = true;
+      try {
+        const page = await apiPage(threadReportsUrl(channelId, nextCursor));
+        more.remove();
+        appendThreadItems(container, page.rows, channelId, page.nextCursor);
+      } catch (e) {
+        more.disabled = false;
+        showError(e.message);
+      }
+    });
+    container.appendChild(more);
+  }
 }
 
 function renderReport(data) {
@@ -169,8 +204,8 @@ async function loadThreads(channelId, { autoSelect = true } = {}) {
   list.classList.add("muted");
   list.textContent = "Loading...";
   try {
-    const rows = await apiJson(`/api/thread-reports?channel_id=${encodeURIComponent(channelId)}&limit=200`);
-    renderThreadList(rows, channelId);
+    const { rows, nextCursor } = await apiPage(threadReportsUrl(channelId));
+    renderThreadList(rows, channelId, nextCursor);
     if (autoSelect) {
       const first = rows[0];
       if (first) {
@@ -217,37 +252,44 @@ function setRefreshButtonState({ hasReport, stale }) {
   badge.textContent = hasReport ? (stale ? "리포트 있음 · 구버전" : "리포트 있음 · 최신 추정") : "리포트 없음";
 }
 
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
+async function waitForJob(jobId, { intervalMs = 1500, timeoutMs = 180000 } = {}) {
+  const deadline = Date.now() + timeoutMs;
+  while (Date.now() < deadline) {
+    const job = await apiJson(`/api/jobs/${jobId}`);
+    if (job.status === "done") return job;
+    if (job.status === "error") throw new Error(job.error_message || "리포트 생성 실패");
+    await sleep(intervalMs);
+  }
+  throw new Error("리포트 생성 대기 시간 초과 (worker 실행 여부 확인)");
+}
+
 async function refreshReport() {
   if (!currentChannelId || !currentThreadTs) return;
-  const btn = $("#trRefreshBtn");
+  const channelId = currentChannelId;
+  const threadTs = currentThreadTs;
   refreshInFlight = true;
   setRefreshButtonState({ hasReport: true, stale: true });
   try {
-    const data = await apiJson(
-      `/api/thread-reports/${encodeURIComponent(currentChannelId)}/${encodeURIComponent(
-        currentThreadTs
-      )}/refresh?force=true`,
-      { method: "POST" }
-    );
-    // Render updated report immediately
-    renderReport({
-      channel_id: currentChannelId,
-      thread_ts: currentThreadTs,
-      report_json: data.report_json,
-      model: data.model,
-      source_latest_ts: data.source_latest_ts,
-      source_latest_ts_epoch: data.source_latest_ts_epoch,
-      updated_at: data.updated_at,
-      meta: data.meta,
+    // Queue the refresh for the worker (python -m app.jobs.worker) and poll its status.
+    const job = await apiJson("/api/jobs", {
+      method: "POST",
+      body: JSON.stringify({
+        kind: "thread_report",
+        channel_id: channelId,
+        thread_ts: threadTs,
+        force: true,
+      }),
     });
+    await waitForJob(job.id);
     // Reload list to sync has_report/updated_at
-    if (currentChannelId) {
-      await loadThreads(currentChannelId, { autoSelect: false });
-      // reselect current thread
-      const list = $("#trThreadList");
-      const target = list?.querySelector(`.thread-item[data-thread-ts="${currentThreadTs}"]`);
-      if (target) target.classList.add("active");
-    }
+    await loadThreads(channelId, { autoSelect: false });
+    // reselect current thread
+    const list = $("#trThreadList");
+    const target = list?.querySelector(`.thread-item[data-thread-ts="${threadTs}"]`);
+    if (target) target.classList.add("active");
+    if (currentThreadTs === threadTs) await loadReport(channelId, threadTs);
   } catch (e) {
     showError(e.message || "리포트 생성 실패");
   } finally {
@@ -23,6 +23,20 @@ async function apiJson(url, opts = {}) {
   return data;
 }
 
+async function apiPage(url) {
+  // Listing endpoints return the next page's opaque cursor in X-Next-Cursor.
+  const res = await fetch(url, { headers: { "Content-Type": "application/json" } });
+  const data = await res.json().catch(() => ({}));
+  if (!res.ok) throw new Error(data.detail || `Request failed: ${res.status}`);
+  return { rows: data, nextCursor: res.headers.get("X-Next-Cursor") };
+}
+
+function threadsUrl(channelId, cursor) {
+  const q = new URLSearchParams({ limit: "50" });
+  if (cursor) q.set("cursor", cursor);
+  return `/api/channels/${encodeURIComponent(channelId)}/threads?${q}`;
+}
+
 function fmtKstFromEpochSeconds(epochSec) {
   if (!epochSec) return "-";
   try {
@@ -69,7 +83,24 @@ async function loadChannelsIntoSelect() {
   return active;
 }
 
-function renderThreadsList(channelId, rows) {
+function followIngestRun(runId, onProgress) {
+  // Server-Sent Events from the background ingest run; resolves with the final snapshot.
+  return new Promise((resolve, reject) => {
+    const es = new EventSource(`/api/ingest-runs/${encodeURIComponent(runId)}/events`);
+    es.addEventListener("progress", (m) => onProgress(JSON.parse(m.data)));
+    es.addEventListener("end", (m) => {
+      es.close();
+      const run = JSON.parse(m.data);
+      if (run.status === "ok") resolve(run);
+      else reject(new Error(run.error || "Ingest failed"));
+    });
+    es.onerror = () => {
+      if (es.readyState === EventSource.CLOSED) reject(new Error("Ingest progress stream closed"));
+    };
+  });
+}
+
+function renderThreadsList(channelId, rows, nextCursor) {
   const container = $("#threadsList");
   container.classList.remove("muted");
   container.innerHTML = "";
@@ -81,14 +112,21 @@ function renderThreadsList(channelId, rows) {
     const btn = document.createElement("button");
     btn.textContent = "Ingest Now";
     btn.addEventListener("click", async () => {
+      btn.disabled = true;
       try {
-        await apiJson(`/api/channels/${encodeURIComponent(channelId)}/ingest`, {
+        const res = await apiJson(`/api/channels/${encodeURIComponent(channelId)}/ingest`, {
           method: "POST",
           body: JSON.stringify({ backfill_days: 14, mode: "full" }),
         });
-        // brief wait then reload threads
-        setTimeout(() => loadThreads(channelId), 2000);
+        await followIngestRun(res.run_id, (ev) => {
+          const d = ev.data || {};
+          if (ev.event === "history_page") msg.textContent = `수집 중… history ${d.pages}페이지 · ${d.rows}건`;
+          else if (ev.event === "replies_thread")
+            msg.textContent = `수집 중… 스레드 ${d.threads_polled}/${d.threads_total}`;
+        });
+        await loadThreads(channelId);
       } catch (e) {
+        btn.disabled = false;
         showError(e.message);
       }
     });
@@ -97,6 +135,10 @@ function renderThreadsList(channelId, rows) {
     return;
   }
 
+  appendThreadItems(container, channelId, rows, nextCursor);
+}
+
+function appendThreadItems(container, channelId, rows, nextCursor) {
   for (const t of rows) {
     const item = document.createElement("div");
     item.className = "thread-item";
@@ -124,6 +166,23 @@ function renderThreadsList(channelId, rows) {
 
     container.appendChild(item);
   }
+
+  if (nextCursor) {
+    const more = document.createElement("button");
+    more.textContent = "더 보기";
+    more.addEventListener("click", async () => {
+      more.disabled = true;
+      try {
+        const page = await apiPage(threadsUrl(channelId, nextCursor));
+        more.remove();
+        appendThreadItems(container, channelId, page.rows, page.nextCursor);
+      } catch (e) {
+        more.disabled = false;
+        showError(e.message);
+      }
+    });
+    container.appendChild(more);
+  }
 }
 
 function renderTimeline(detail) {
@@ -161,10 +220,8 @@ async function loadThreads(channelId) {
   const container = $("#threadsList");
   container.classList.add("muted");
   container.textContent = "Loading...";
-  const rows = await apiJson(
-    `/api/channels/${encodeURIComponent(channelId)}/threads?limit=50&offset=0`
-  );
-  renderThreadsList(channelId, rows);
+  const page = await apiPage(threadsUrl(channelId));
+  renderThreadsList(channelId, page.rows, page.nextCursor);
 
   const tl = $("#threadTimeline");
   tl.classList.add("muted");
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import json
+
+# Per-item JSON punctuation/separator overhead inside the serialized list.
+_ITEM_OVERHEAD_TOKENS = 4
+
+
+def estimate_tokens(text: str) -> int:
+    # Rough: ~4 chars/token for ASCII, ~1 token per non-ASCII char (Hangul etc.).
+    non_ascii = sum(1 for ch in text if ord(ch) > 127)
+    return (len(text) - non_ascii) // 4 + non_ascii
+
+
+def estimate_json_tokens(value) -> int:
+    return estimate_tokens(json.dumps(value, ensure_ascii=False))
+
+
+def pack_items(
+    items: list[dict], *, budget_tokens: int, keep_first: bool = True
+) -> tuple[list[dict], int]:
+    """
+    Fit chronologically ordered message items into `budget_tokens`: the first
+    item (thread root) when `keep_first`, then as many of the most recent items
+    as fit. Returns (packed items in original order, estimated tokens).
+    A budget <= 0 disables packing.
+    """
+    costs = [estimate_json_tokens(it) + _ITEM_OVERHEAD_TOKENS for it in items]
+    if budget_tokens <= 0 or sum(costs) <= budget_tokens:
+        return items, sum(costs)
+
+    used = 0
+    head: list[dict] = []
+    start = 0
+    if keep_first and items:
+        head = [items[0]]
+        used = costs[0]
+        start = 1
+
+    tail_from = len(items)
+    for i in range(len(items) - 1, start - 1, -1):
+        if used + costs[i] > budget_tokens:
+            break
+        used += costs[i]
+        tail_from = i
+
+    return head + items[tail_from:], used
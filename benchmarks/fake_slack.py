@@ -0,0 +1,313 @@
+from __future__ import annotations
+
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# Local stand-in for the Slack Web API methods ingest uses
+# (conversations.history/replies/info/join, users.info/list), serving a
+# generated workspace with configurable latency and 429 injection.
+
+CHANNEL_PREFIX = "CBENCH"
+USER_PREFIX = "UBENCH"
+
+
+@dataclass
+class FakeWorkspaceConfig:
+    channels: int = 2
+    roots_per_channel: int = 500
+    replies_per_thread: int = 10
+    # Fraction of roots that have replies at all.
+    thread_ratio: float = 0.3
+    users: int = 50
+    # Roots are spread over this many days back from now (inside the ingest backfill).
+    span_days: float = 7.0
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    # Every Nth request answers 429 with Retry-After (0 disables).
+    ratelimit_every: int = 0
+    retry_after_s: int = 1
+    seed: int = 42
+
+
+@dataclass
+class FakeSlackStats:
+    calls: dict[str, int] = field(default_factory=dict)
+    ratelimited: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def record(self, method: str) -> int:
+        with self._lock:
+            self.calls[method] = self.calls.get(method, 0) + 1
+            return sum(self.calls.values())
+
+    def record_ratelimited(self) -> None:
+        with self._lock:
+            self.ratelimited += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "calls": dict(sorted(self.calls.items())),
+                "total_calls": sum(self.calls.values()),
+                "ratelimited": self.ratelimited,
+            }
+
+
+def channel_ids(config: FakeWorkspaceConfig) -> list[str]:
+    return [f"{CHANNEL_PREFIX}{i:04d}" for i in range(config.channels)]
+
+
+def _ts(epoch: float) -> str:
+    return f"{epoch:.6f}"
+
+
+class FakeWorkspace:
+    """
+    Deterministic message set per channel. History is newest-first with roots
+    only (replies carry thread_ts/latest_reply like Slack's root objects);
+    replies return the root followed by its replies in ascending ts.
+    """
+
+    def __init__(self, config: FakeWorkspaceConfig):
+        self.config = config
+        rng = random.Random(config.seed)
+        now = time.time()
+        start = now - config.span_days * 86400
+
+        self.user_ids = [f"{USER_PREFIX}{i:05d}" for i in range(max(1, config.users))]
+        self.history: dict[str, list[dict]] = {}
+        self.replies: dict[tuple[str, str], list[dict]] = {}
+
+        step = (now - 3600 - start) / max(1, config.roots_per_channel)
+        # Replies stay well inside the gap before the next root.
+        reply_gap = min(7.0, step / (2 * (config.replies_per_thread + 1)))
+        for cid in channel_ids(config):
+            roots: list[dict] = []
+            for i in range(config.roots_per_channel):
+                root_epoch = start + i * step + rng.random() * 0.5
+                root_ts = _ts(root_epoch)
+                root = {
+                    "type": "message",
+                    "user": rng.choice(self.user_ids),
+                    "text": f"benchmark root {i} in {cid}",
+                    "ts": root_ts,
+                }
+                if config.replies_per_thread > 0 and rng.random() < config.thread_ratio:
+                    replies = []
+                    for j in range(config.replies_per_thread):
+                        reply_epoch = root_epoch + (j + 1) * reply_gap
+                        replies.append(
+                            {
+                                "type": "message",
+                                "user": rng.choice(self.user_ids),
+                                "text": f"reply {j} to root {i}",
+                                "ts": _ts(reply_epoch),
+                                "thread_ts": root_ts,
+                            }
+                        )
+                    root.update(
+                        thread_ts=root_ts,
+                        reply_count=len(replies),
+                        latest_reply=replies[-1]["ts"],
+                    )
+                    self.replies[(cid, root_ts)] = [root, *replies]
+                roots.append(root)
+            self.history[cid] = list(reversed(roots))
+
+    @property
+    def total_messages(self) -> int:
+        roots = sum(len(v) for v in self.history.values())
+        replies = sum(len(v) - 1 for v in self.replies.values())
+        return roots + replies
+
+    def history_page(self, channel: str, oldest: str, cursor: str, limit: int):
+        msgs = [m for m in self.history.get(channel, []) if float(m["ts"]) >= float(oldest or 0)]
+        return _paginate(msgs, cursor, limit)
+
+    def replies_page(self, channel: str, ts: str, oldest: str, cursor: str, limit: int):
+        thread = self.replies.get((channel, ts))
+        if thread is None:
+            root = next((m for m in self.history.get(channel, []) if m["ts"] == ts), None)
+            thread = [root] if root else []
+        floor = float(oldest or 0)
+        msgs = [thread[0], *[m for m in thread[1:] if float(m["ts"]) >= floor]] if thread else []
+        return _paginate(msgs, cursor, limit)
+
+    def user(self, user_id: str) -> dict:
+        return {
+            "id": user_id,
+            "name": user_id.lower(),
+            "real_name": f"Bench {user_id[-5:]}",
+            "profile": {"display_name": f"bench-{user_id[-5:]}"},
+        }
+
+
+def _paginate(items: list[dict], cursor: str, limit: int) -> tuple[list[dict], str]:
+    offset = int(cursor) if cursor else 0
+    limit = max(1, min(limit or 100, 1000))
+    page = items[offset : offset + limit]
+    next_cursor = str(offset + limit) if offset + limit < len(items) else ""
+    return page, next_cursor
+
+
+def _handler_class(workspace: FakeWorkspace, stats: FakeSlackStats):
+    config = workspace.config
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):  # noqa: A002 - quiet by default
+            return
+
+        def do_GET(self):
+            self._dispatch()
+
+        def do_POST(self):
+            self._dispatch()
+
+        def _params(self) -> dict[str, str]:
+            url = urlparse(self.path)
+            params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            length = int(self.headers.get("Content-Length") or 0)
+            if length:
+                body = self.rfile.read(length).decode("utf-8")
+                if "json" in (self.headers.get("Content-Type") or ""):
+                    params.update({k: str(v) for k, v in json.loads(body or "{}").items()})
+                else:
+                    params.update({k: v[-1] for k, v in parse_qs(body).items()})
+            return params
+
+        def _send(self, status: int, payload: dict, headers: dict | None = None) -> None:
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _dispatch(self) -> None:
+            method = urlparse(self.path).path.rsplit("/", 1)[-1]
+            params = self._params()
+            n = stats.record(method)
+
+            if config.latency_ms or config.jitter_ms:
+                time.sleep((config.latency_ms + random.random() * config.jitter_ms) / 1000.0)
+
+            if config.ratelimit_every and n % config.ratelimit_every == 0:
+                stats.record_ratelimited()
+                self._send(
+                    429,
+                    {"ok": False, "error": "ratelimited"},
+                    {"Retry-After": str(config.retry_after_s)},
+                )
+                return
+
+            channel = params.get("channel", "")
+            limit = int(params.get("limit") or 100)
+            cursor = params.get("cursor") or ""
+
+            if method == "conversations.history":
+                if channel not in workspace.history:
+                    self._send(200, {"ok": False, "error": "channel_not_found"})
+                    return
+                msgs, next_cursor = workspace.history_page(
+                    channel, params.get("oldest", "0"), cursor, limit
+                )
+                self._send(
+                    200,
+                    {
+                        "ok": True,
+                        "messages": msgs,
+                        "has_more": bool(next_cursor),
+                        "response_metadata": {"next_cursor": next_cursor},
+                    },
+                )
+            elif method == "conversations.replies":
+                msgs, next_cursor = workspace.replies_page(
+                    channel, params.get("ts", ""), params.get("oldest", "0"), cursor, limit
+                )
+                if not msgs:
+                    self._send(200, {"ok": False, "error": "thread_not_found"})
+                    return
+                self._send(
+                    200,
+                    {
+                        "ok": True,
+                        "messages": msgs,
+                        "has_more": bool(next_cursor),
+                        "response_metadata": {"next_cursor": next_cursor},
+                    },
+                )
+            elif method == "conversations.info":
+                if channel not in workspace.history:
+                    self._send(200, {"ok": False, "error": "channel_not_found"})
+                    return
+                self._send(200, {"ok": True, "channel": {"id": channel, "name": channel.lower()}})
+            elif method == "conversations.join":
+                self._send(200, {"ok": True, "channel": {"id": channel}})
+            elif method == "users.info":
+                self._send(200, {"ok": True, "user": workspace.user(params.get("user", ""))})
+            elif method == "users.list":
+                members, next_cursor = _paginate(
+                    [workspace.user(uid) for uid in workspace.user_ids], cursor, limit
+                )
+                self._send(
+                    200,
+                    {
+                        "ok": True,
+                        "members": members,
+                        "response_metadata": {"next_cursor": next_cursor},
+                    },
+                )
+            else:
+                self._send(200, {"ok": False, "error": "unknown_method"})
+
+    return Handler
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # The stdlib default backlog (5) refuses bursts from the replies pool.
+    request_queue_size = 256
+
+
+class FakeSlackServer:
+    """
+    Threaded HTTP server on 127.0.0.1 (ephemeral port by default). Use as a
+    context manager and hand `base_url` to SlackClient(base_url=...).
+    """
+
+    def __init__(self, config: FakeWorkspaceConfig, *, port: int = 0):
+        self.workspace = FakeWorkspace(config)
+        self.stats = FakeSlackStats()
+        self._server = _Server(("127.0.0.1", port), _handler_class(self.workspace, self.stats))
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api/"
+
+    def start(self) -> "FakeSlackServer":
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="fake-slack", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def __enter__(self) -> "FakeSlackServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
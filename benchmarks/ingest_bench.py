@@ -0,0 +1,279 @@
+"""
+Ingest throughput benchmark against a local fake Slack Web API.
+
+    python -m benchmarks.ingest_bench --channels 2 --roots 2000 --replies 10
+    python -m benchmarks.ingest_bench --latency-ms 30 --ratelimit-every 200 --json out.json
+
+Runs ingest_channel_history_roots + ingest_channel_thread_replies per channel
+against DATABASE_URL (bench channels/users are purged first) and reports
+messages/sec, Slack calls/sec, DB rows/sec and p50/p99 page latency per phase.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import threading
+import time
+from dataclasses import asdict
+
+from sqlalchemy import delete
+
+from app.config import settings
+from app.db import get_session_factory, init_db
+from app.models import (
+    Channel,
+    ChannelDailyStat,
+    ChannelDailyThreadStat,
+    ChannelDailyUserStat,
+    Message,
+    Thread,
+    UserCache,
+)
+from app.services import name_service
+from app.services.ingest_service import (
+    ingest_channel_history_roots,
+    ingest_channel_thread_replies,
+)
+from app.slack_client import SlackClient
+from benchmarks.fake_slack import (
+    CHANNEL_PREFIX,
+    USER_PREFIX,
+    FakeSlackServer,
+    FakeWorkspaceConfig,
+    channel_ids,
+)
+
+
+def _parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser()
+    p.add_argument("--channels", type=int, default=2)
+    p.add_argument("--roots", type=int, default=500, help="Root messages per channel")
+    p.add_argument("--replies", type=int, default=10, help="Replies per threaded root")
+    p.add_argument("--thread-ratio", type=float, default=0.3, help="Fraction of roots with replies")
+    p.add_argument("--users", type=int, default=50)
+    p.add_argument("--latency-ms", type=float, default=0.0, help="Fake server latency per call")
+    p.add_argument("--jitter-ms", type=float, default=0.0)
+    p.add_argument("--ratelimit-every", type=int, default=0, help="Answer every Nth call with 429")
+    p.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds on 429")
+    p.add_argument(
+        "--max-threads-poll",
+        type=int,
+        default=None,
+        help="Override MAX_THREADS_POLL_PER_RUN (default: enough to poll every thread)",
+    )
+    p.add_argument("--concurrency", type=int, default=None, help="THREAD_POLL_CONCURRENCY")
+    p.add_argument(
+        "--client-rate-limit",
+        action="store_true",
+        help="Keep SlackClient's tier token buckets (off by default so the fake server is the limit)",
+    )
+    p.add_argument("--json", dest="json_path", default=None, help="Also write the report here")
+    return p.parse_args()
+
+
+class _TimedSlackClient(SlackClient):
+    """Records wall time per history/replies page, retries and 429 pauses included."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._timings_lock = threading.Lock()
+        self.page_seconds: dict[str, list[float]] = {"history": [], "replies": []}
+
+    def _timed(self, phase: str, fn, **kwargs):
+        started = time.perf_counter()
+        try:
+            return fn(**kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._timings_lock:
+                self.page_seconds[phase].append(elapsed)
+
+    def conversations_history_page(self, **kwargs):
+        return self._timed("history", super().conversations_history_page, **kwargs)
+
+    def conversations_replies_page(self, **kwargs):
+        return self._timed("replies", super().conversations_replies_page, **kwargs)
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def _purge_bench_data(SessionLocal) -> None:
+    with SessionLocal() as db:
+        like_ch = f"{CHANNEL_PREFIX}%"
+        for model in (
+            Message,
+            Thread,
+            ChannelDailyStat,
+            ChannelDailyUserStat,
+            ChannelDailyThreadStat,
+            Channel,
+        ):
+            db.execute(delete(model).where(model.channel_id.like(like_ch)))
+        db.execute(delete(UserCache).where(UserCache.user_id.like(f"{USER_PREFIX}%")))
+        db.commit()
+    name_service.invalidate()
+
+
+def _seed_channels(SessionLocal, ids: list[str]) -> None:
+    with SessionLocal() as db:
+        for cid in ids:
+            db.add(Channel(channel_id=cid, name=cid.lower(), is_active=True))
+        db.commit()
+
+
+def _phase_report(
+    *, seconds: float, messages: int, calls: int, rows: int, pages: list[float]
+) -> dict:
+    def per_sec(n: int) -> float:
+        return round(n / seconds, 1) if seconds > 0 else 0.0
+
+    return {
+        "seconds": round(seconds, 3),
+        "messages": messages,
+        "messages_per_sec": per_sec(messages),
+        "slack_calls": calls,
+        "slack_calls_per_sec": per_sec(calls),
+        "db_rows": rows,
+        "db_rows_per_sec": per_sec(rows),
+        "pages": len(pages),
+        "page_p50_ms": round(_percentile(pages, 50) * 1000, 2),
+        "page_p99_ms": round(_percentile(pages, 99) * 1000, 2),
+    }
+
+
+def _run(args: argparse.Namespace, server: FakeSlackServer, SessionLocal) -> dict:
+    slack = _TimedSlackClient(token="xoxb-benchmark", base_url=server.base_url)
+    ids = channel_ids(server.workspace.config)
+
+    totals = {
+        "history": {"seconds": 0.0, "messages": 0, "calls": 0, "rows": 0},
+        "replies": {"seconds": 0.0, "messages": 0, "calls": 0, "rows": 0},
+    }
+    per_channel = []
+    for cid in ids:
+        with SessionLocal() as db:
+            ch = db.get(Channel, cid)
+
+            calls_before = server.stats.snapshot()["total_calls"]
+            started = time.perf_counter()
+            history = ingest_channel_history_roots(db, slack, ch, backfill_days=30)
+            history_s = time.perf_counter() - started
+            calls_mid = server.stats.snapshot()["total_calls"]
+
+            started = time.perf_counter()
+            replies = ingest_channel_thread_replies(db, slack, ch, concurrency=args.concurrency)
+            replies_s = time.perf_counter() - started
+            calls_after = server.stats.snapshot()["total_calls"]
+
+        measured = {
+            "history": (history_s, history, calls_mid - calls_before),
+            "replies": (replies_s, replies, calls_after - calls_mid),
+        }
+        for phase, (seconds, result, calls) in measured.items():
+            t = totals[phase]
+            t["seconds"] += seconds
+            t["messages"] += result["saved_candidates"]
+            t["calls"] += calls
+            t["rows"] += result.get("write", {}).get("rows", 0)
+        per_channel.append(
+            {
+                "channel_id": cid,
+                "history_s": round(history_s, 3),
+                "replies_s": round(replies_s, 3),
+                "threads_polled": replies["threads_polled"],
+            }
+        )
+
+    phases = {
+        phase: _phase_report(
+            seconds=t["seconds"],
+            messages=t["messages"],
+            calls=t["calls"],
+            rows=t["rows"],
+            pages=slack.page_seconds[phase],
+        )
+        for phase, t in totals.items()
+    }
+    return {
+        "config": asdict(server.workspace.config),
+        "workspace_messages": server.workspace.total_messages,
+        "phases": phases,
+        "per_channel": per_channel,
+        "fake_slack": server.stats.snapshot(),
+        "client_ratelimited_responses": slack.ratelimited_responses,
+    }
+
+
+def _print_report(report: dict) -> None:
+    print(
+        f"workspace: {report['workspace_messages']} messages, "
+        f"{report['config']['channels']} channels, "
+        f"latency={report['config']['latency_ms']}ms, "
+        f"429 every={report['config']['ratelimit_every'] or '-'}"
+    )
+    header = (
+        f"{'phase':<8} {'sec':>8} {'msgs/s':>10} {'calls/s':>9} {'rows/s':>10} "
+        f"{'pages':>6} {'p50 ms':>8} {'p99 ms':>8}"
+    )
+    print(header)
+    for phase, r in report["phases"].items():
+        print(
+            f"{phase:<8} {r['seconds']:>8.2f} {r['messages_per_sec']:>10.1f} "
+            f"{r['slack_calls_per_sec']:>9.1f} {r['db_rows_per_sec']:>10.1f} "
+            f"{r['pages']:>6} {r['page_p50_ms']:>8.2f} {r['page_p99_ms']:>8.2f}"
+        )
+    fake = report["fake_slack"]
+    print(
+        f"slack calls: {fake['total_calls']} {fake['calls']} "
+        f"429s: {fake['ratelimited']} (client saw {report['client_ratelimited_responses']})"
+    )
+
+
+def main() -> int:
+    args = _parse_args()
+    init_db()
+    SessionLocal = get_session_factory()
+    if SessionLocal is None:
+        raise RuntimeError("DATABASE_URL is not set; the benchmark writes to a real database.")
+
+    config = FakeWorkspaceConfig(
+        channels=args.channels,
+        roots_per_channel=args.roots,
+        replies_per_thread=args.replies,
+        thread_ratio=args.thread_ratio,
+        users=args.users,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        ratelimit_every=args.ratelimit_every,
+        retry_after_s=args.retry_after,
+    )
+
+    settings.slack_rate_limit_enabled = args.client_rate_limit
+    settings.max_threads_poll_per_run = args.max_threads_poll or max(
+        settings.max_threads_poll_per_run, args.roots
+    )
+
+    _purge_bench_data(SessionLocal)
+    _seed_channels(SessionLocal, channel_ids(config))
+
+    with FakeSlackServer(config) as server:
+        report = _run(args, server, SessionLocal)
+
+    _purge_bench_data(SessionLocal)
+
+    _print_report(report)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,272 @@
+"""
+Channel stats benchmark: the previous six-query implementation vs the
+single-pass scan vs the rollup path, on one large generated channel.
+
+    python -m benchmarks.stats_bench --messages 1000000 --days 60
+    python -m benchmarks.stats_bench --messages 200000 --repeat 5 --keep
+
+Seeds CBENCHSTATS in DATABASE_URL (purged before and, unless --keep, after).
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import delete, desc, func, insert
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db import get_session_factory, init_db
+from app.models import (
+    Channel,
+    ChannelDailyStat,
+    ChannelDailyThreadStat,
+    ChannelDailyUserStat,
+    Message,
+    Thread,
+)
+from app.services.rollup_service import rebuild_channel_rollups
+from app.services.stats_service import _kst_range, get_channel_stats
+
+CHANNEL_ID = "CBENCHSTATS"
+
+
+def _parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser()
+    p.add_argument("--messages", type=int, default=1_000_000)
+    p.add_argument("--days", type=int, default=60, help="Stats window; messages span it")
+    p.add_argument("--users", type=int, default=300)
+    p.add_argument("--thread-size", type=int, default=8, help="Average messages per thread")
+    p.add_argument("--top-n", type=int, default=10)
+    p.add_argument("--repeat", type=int, default=3)
+    p.add_argument("--keep", action="store_true", help="Keep the seeded channel afterwards")
+    return p.parse_args()
+
+
+# --- previous implementation (six aggregate queries over raw messages) ------
+
+
+def _local_day(db: Session):
+    if db.get_bind().dialect.name == "sqlite":
+        offset = datetime.now(ZoneInfo(settings.tz)).utcoffset() or timedelta(0)
+        return func.date(Message.ts_epoch, "unixepoch", f"{int(offset.total_seconds()):+d} seconds")
+    return func.date(func.timezone(settings.tz, func.to_timestamp(Message.ts_epoch)))
+
+
+def _multi_query_stats(db: Session, channel_id: str, *, days: int, top_n: int) -> dict:
+    r = _kst_range(days)
+
+    def window(q):
+        return (
+            q.filter(Message.channel_id == channel_id)
+            .filter(Message.ts_epoch >= r.start_epoch_utc)
+            .filter(Message.ts_epoch < r.end_epoch_utc)
+        )
+
+    total_messages = window(db.query(func.count()).select_from(Message)).scalar() or 0
+    total_threads = window(db.query(func.count(func.distinct(Message.thread_ts)))).scalar() or 0
+    unique_users = (
+        window(db.query(func.count(func.distinct(Message.user_id))))
+        .filter(Message.user_id.is_not(None))
+        .scalar()
+        or 0
+    )
+
+    kst_day = _local_day(db).label("kst_day")
+    daily_rows = window(db.query(kst_day, func.count().label("cnt"))).group_by(kst_day).all()
+    daily_map = {
+        (d if isinstance(d, str) else d.isoformat()): int(c) for d, c in daily_rows if d
+    }
+    day_list = [(r.start_date_kst + timedelta(days=i)).isoformat() for i in range(days)]
+
+    user_counts = (
+        window(db.query(Message.user_id, func.count().label("cnt")))
+        .filter(Message.user_id.is_not(None))
+        .group_by(Message.user_id)
+        .order_by(desc("cnt"))
+        .limit(top_n)
+        .all()
+    )
+
+    active = (
+        window(db.query(Message.thread_ts.label("thread_ts")))
+        .filter(Message.thread_ts.is_not(None))
+        .distinct()
+        .subquery()
+    )
+    top_threads = (
+        db.query(Thread)
+        .join(active, Thread.thread_ts == active.c.thread_ts)
+        .filter(Thread.channel_id == channel_id)
+        .order_by(Thread.reply_count.desc(), Thread.updated_at.desc())
+        .limit(top_n)
+        .all()
+    )
+
+    return {
+        "total_messages": int(total_messages),
+        "total_threads": int(total_threads),
+        "unique_users": int(unique_users),
+        "daily_messages": [
+            {"date_kst": d, "message_count": daily_map.get(d, 0)} for d in day_list
+        ],
+        "top_users": [{"user_id": u, "message_count": int(c)} for u, c in user_counts],
+        "top_threads": [{"thread_ts": t.thread_ts, "reply_count": t.reply_count} for t in top_threads],
+    }
+
+
+# --- seeding -----------------------------------------------------------------
+
+
+def _purge(SessionLocal) -> None:
+    with SessionLocal() as db:
+        for model in (
+            Message,
+            Thread,
+            ChannelDailyStat,
+            ChannelDailyUserStat,
+            ChannelDailyThreadStat,
+            Channel,
+        ):
+            db.execute(delete(model).where(model.channel_id == CHANNEL_ID))
+        db.commit()
+
+
+def _seed(SessionLocal, args: argparse.Namespace) -> None:
+    rng = random.Random(7)
+    r = _kst_range(args.days)
+    span = (time.time() - 60) - r.start_epoch_utc
+    step = span / max(1, args.messages)
+    user_ids = [f"UBENCH{i:05d}" for i in range(args.users)]
+
+    with SessionLocal() as db:
+        db.add(Channel(channel_id=CHANNEL_ID, name="bench-stats", is_active=True))
+        db.commit()
+
+        messages: list[dict] = []
+        threads: list[dict] = []
+        root_ts, root_epoch, left = None, 0.0, 0
+        for i in range(args.messages):
+            epoch = r.start_epoch_utc + i * step
+            ts = f"{epoch:.6f}"
+            if left <= 0:
+                root_ts, root_epoch = ts, epoch
+                left = rng.randint(1, max(1, 2 * args.thread_size - 1))
+                threads.append(
+                    {
+                        "channel_id": CHANNEL_ID,
+                        "thread_ts": ts,
+                        "thread_ts_epoch": epoch,
+                        "root_ts": ts,
+                        "root_text": f"root {i}",
+                        "reply_count": left - 1,
+                        "last_reply_ts": ts,
+                        "last_reply_ts_epoch": epoch,
+                        "needs_summary": False,
+                    }
+                )
+            left -= 1
+            messages.append(
+                {
+                    "channel_id": CHANNEL_ID,
+                    "ts": ts,
+                    "ts_epoch": epoch,
+                    "thread_ts": root_ts,
+                    "thread_ts_epoch": root_epoch,
+                    "user_id": rng.choice(user_ids) if rng.random() > 0.02 else None,
+                    "text": "x",
+                    "raw_json": {},
+                }
+            )
+            if len(messages) >= 20000:
+                db.execute(insert(Message.__table__), messages)
+                messages = []
+        if messages:
+            db.execute(insert(Message.__table__), messages)
+        for i in range(0, len(threads), 20000):
+            db.execute(insert(Thread.__table__), threads[i : i + 20000])
+
+        # Seeded rows bypass IngestWriter, so the raw path is the truth until rebuilt.
+        db.get(Channel, CHANNEL_ID).stats_rollup_ready = False
+        db.commit()
+
+
+# --- measurement ---------------------------------------------------------------
+
+
+def _time(fn, repeat: int) -> tuple[list[float], dict]:
+    timings, result = [], {}
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - started)
+    return timings, result
+
+
+def _comparable(stats: dict) -> dict:
+    # Tie order among equal counts is not specified; compare the counts.
+    return {
+        "total_messages": stats["total_messages"],
+        "total_threads": stats["total_threads"],
+        "unique_users": stats["unique_users"],
+        "daily_messages": stats["daily_messages"],
+        "top_user_counts": [u["message_count"] for u in stats["top_users"]],
+        "top_thread_replies": [t["reply_count"] for t in stats["top_threads"]],
+    }
+
+
+def main() -> int:
+    args = _parse_args()
+    init_db()
+    SessionLocal = get_session_factory()
+    if SessionLocal is None:
+        raise RuntimeError("DATABASE_URL is not set; the benchmark writes to a real database.")
+
+    _purge(SessionLocal)
+    started = time.perf_counter()
+    _seed(SessionLocal, args)
+    print(f"seeded {args.messages} messages in {time.perf_counter() - started:.1f}s")
+
+    results: dict[str, tuple[list[float], dict]] = {}
+    with SessionLocal() as db:
+        results["multi_query"] = _time(
+            lambda: _multi_query_stats(db, CHANNEL_ID, days=args.days, top_n=args.top_n),
+            args.repeat,
+        )
+        results["single_pass"] = _time(
+            lambda: get_channel_stats(db, CHANNEL_ID, days=args.days, top_n=args.top_n),
+            args.repeat,
+        )
+
+        started = time.perf_counter()
+        rebuild_channel_rollups(db, CHANNEL_ID)
+        print(f"rollups rebuilt in {time.perf_counter() - started:.1f}s")
+        db.expire_all()
+
+        results["rollups"] = _time(
+            lambda: get_channel_stats(db, CHANNEL_ID, days=args.days, top_n=args.top_n),
+            args.repeat,
+        )
+
+    if not args.keep:
+        _purge(SessionLocal)
+
+    baseline = _comparable(results["multi_query"][1])
+    print(f"{'variant':<12} {'min ms':>10} {'median ms':>10} {'vs multi':>9} {'same':>5}")
+    base_ms = min(results["multi_query"][0]) * 1000
+    for name, (timings, stats) in results.items():
+        best = min(timings) * 1000
+        print(
+            f"{name:<12} {best:>10.1f} {statistics.median(timings) * 1000:>10.1f} "
+            f"{base_ms / best if best else 0.0:>8.2f}x {str(_comparable(stats) == baseline):>5}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,78 @@
+"""
+Replay Slack Events API payloads against /slack/events, signed with
+SLACK_SIGNING_SECRET exactly like Slack does (v0 HMAC-SHA256).
+
+    python scripts/replay_slack_events.py --channel C0750UMQAD6
+    python scripts/replay_slack_events.py --url http://127.0.0.1:8000/slack/events \
+        --fixture scripts/fixtures/slack_events.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import hmac
+import json
+import os
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+from dotenv import find_dotenv, load_dotenv
+
+DEFAULT_FIXTURE = Path(__file__).parent / "fixtures" / "slack_events.json"
+
+
+def _parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser()
+    p.add_argument("--url", default="http://127.0.0.1:8000/slack/events")
+    p.add_argument("--fixture", default=str(DEFAULT_FIXTURE))
+    p.add_argument("--channel", default=None, help="Override event.channel (an active channel)")
+    return p.parse_args()
+
+
+def _sign(secret: str, timestamp: str, body: bytes) -> str:
+    base = b"v0:" + timestamp.encode() + b":" + body
+    return "v0=" + hmac.new(secret.encode(), base, hashlib.sha256).hexdigest()
+
+
+def main() -> int:
+    load_dotenv(find_dotenv(filename=".env", usecwd=True), override=False)
+    args = _parse_args()
+
+    secret = os.getenv("SLACK_SIGNING_SECRET")
+    if not secret:
+        raise RuntimeError("SLACK_SIGNING_SECRET is missing (set env var or .env).")
+
+    payloads = json.loads(Path(args.fixture).read_text(encoding="utf-8"))
+    for payload in payloads:
+        event = payload.get("event")
+        if args.channel and isinstance(event, dict) and "channel" in event:
+            event["channel"] = args.channel
+
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        timestamp = str(int(time.time()))
+        req = urllib.request.Request(
+            args.url,
+            data=body,
+            method="POST",
+            headers={
+                "Content-Type": "application/json",
+                "X-Slack-Request-Timestamp": timestamp,
+                "X-Slack-Signature": _sign(secret, timestamp, body),
+            },
+        )
+        label = payload.get("type")
+        if isinstance(event, dict):
+            label = f"{label}/{event.get('type')}/{event.get('subtype') or '-'}"
+        try:
+            with urllib.request.urlopen(req, timeout=10) as resp:
+                print(f"{resp.status} {label} {resp.read().decode('utf-8')}")
+        except urllib.error.HTTPError as e:
+            print(f"{e.code} {label} {e.read().decode('utf-8')}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
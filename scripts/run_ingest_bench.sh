@@ -0,0 +1,4 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+exec python -m benchmarks.ingest_bench "$@"
@@ -0,0 +1,4 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+exec python -m app.jobs.rebuild_rollups "$@"